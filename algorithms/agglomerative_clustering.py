@@ -1,35 +1,77 @@
+import math
 import timeit
 from typing import List
 
-import matplotlib.pyplot as plot
+import numpy as np
 
-from helpers.measurements import distance, get_dist_calculator
+from algorithms.cf_tree import CFTree
+from algorithms.centroid_linkage import CentroidLinkage
+from algorithms.dendrogram import Dendrogram
+from helpers.consts import PLOT_PATH
+from helpers.evaluation import calculate_centers, success_rate, inertia
+from helpers.measurements import squared_distance, squared_distances, distance_blocks, get_dist_calculator, \
+    nearest_centers, as_points
+from helpers.plotting import plot_clusters
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result import ClusteringResult
 
 
 class AgglomerativeClustering:
+    """
+    class that implements agglomerative clustering with centroid linkage, points are kept in one (n, d) int32 or
+    float32 array, clusters of python engine are lists of point indexes and result is label of every point. Clusters
+    are merged until one cluster remains and every merge is recorded in dendrogram, wanted k clusters are cut from it
+    and any other number of clusters can be cut later without clustering again. With cf threshold points are first
+    streamed into cf-tree and clusters are merged from its leaf subclusters, so memory and time depend on number of
+    subclusters, every point gets label of the subcluster with the closest centroid
+    """
+    points: np.ndarray
+    clusters: List[List[int]]
+    cluster_ids: List[int]
+    merges: List[tuple[int, int, float, int]]
+    labels: np.ndarray or None
+    subcluster_labels: np.ndarray or None
+    dendrogram: Dendrogram or None
     heap: List
     start_time: float
     stop_time: float
+    iterations: int
+    distances_computed: int
+    final_cluster_success_rate: float
+    profiler: Profiler
+    result: ClusteringResult or None
 
-    def __init__(self, clusters: List[List[int]], k_wanted_clusters: int, center_calculator: str) -> None:
-        self.start_time = timeit.default_timer()
-        self.clusters = self._prepare_clusters(clusters)
+    def __init__(self, clusters: List[List[int]] or np.ndarray, k_wanted_clusters: int, center_calculator: str,
+                 engine: str = "python", spatial_index: bool = False, profiler: Profiler = NULL_PROFILER,
+                 cf_threshold: float or None = None) -> None:
+        self.points = as_points(clusters)
+        self.cf_threshold = cf_threshold
+        self.clusters = self._prepare_clusters(len(self.points)) if engine == "python" and cf_threshold is None else []
+        self.cluster_ids = list(range(len(self.clusters)))
+        self.merges = []
+        self.labels = None
+        self.subcluster_labels = None
+        self.dendrogram = None
         self.k = k_wanted_clusters
+        self.center_char = center_calculator
         self.center_calculator = get_dist_calculator(center_calculator)
-        self.cluster_id = len(self.clusters)
+        self.cluster_id = len(self.points)
         self.cluster_centers_by_index = {}
+        self.engine = engine
+        self.spatial_index = spatial_index
+        self.profiler = profiler
+        self.iterations = 0
+        self.distances_computed = 0
+        self.result = None
 
     @staticmethod
-    def _prepare_clusters(created_clusters: List[List[int]]) -> List[List[List[int]]]:
+    def _prepare_clusters(num_of_points: int) -> List[List[int]]:
         """
         method that prepares clusters to be processed, meaning every created points will now be a standalone cluster
-        :param created_clusters: generated points
-        :return: points as a single cluster
+        :param num_of_points: number of generated points
+        :return: index of every point as a single cluster
         """
-        init_clusters = []
-        for cluster in created_clusters:
-            init_clusters.append([cluster])
-        return init_clusters
+        return [[index] for index in range(num_of_points)]
 
     def _find_closest_clusters(self) -> tuple[int, int]:
         """
@@ -50,20 +92,19 @@ class AgglomerativeClustering:
 
     def _create_distance_heap(self) -> None:
         """
-        method that creates distance heap from init clusters, distance heap stores all distances from cluster centers to
-        all other cluster centers
+        method that creates distance heap from init clusters, distance heap stores all squared distances from cluster
+        centers to all other cluster centers, they are calculated by blocks of rows within memory budget
         """
         distance_list = []
+        points = self.points.tolist()
 
         for i in range(len(self.clusters)):
-            self.cluster_centers_by_index[i] = self.clusters[i][0]
-            cluster_list = []
-            for j in range(len(self.clusters)):
-                if i == j:
-                    cluster_list.append(float("inf"))
-                    continue
-                cluster_list.append(distance(self.clusters[i][0], self.clusters[j][0]))
-            distance_list.append(cluster_list)
+            self.cluster_centers_by_index[i] = points[i]
+        for block in distance_blocks(len(self.points), len(self.points)):
+            rows = squared_distances(self.points[block], self.points)
+            rows[np.arange(len(rows)), np.arange(block.start, block.stop)] = np.inf
+            distance_list.extend(rows.tolist())
+        self.distances_computed += len(self.clusters) * (len(self.clusters) - 1)
         self.heap = distance_list
 
     def _remove_points_from_heap_and_dict(self, a, b) -> None:
@@ -93,32 +134,34 @@ class AgglomerativeClustering:
 
     def _merge_closest_clusters(self, index: tuple[int, int]) -> None:
         """
-        method that merges clusters by index and handles heap logic
+        method that merges clusters by index, records merge with distance of clusters (heap stores squared distances)
+        and handles heap logic, merged cluster gets next free cluster id
         :param index: 2 indexes of closest clusters
         """
-        cluster1 = self.clusters[index[0]]
-        cluster2 = self.clusters[index[1]]
-        new_cluster = []
-        for cluster in cluster1:
-            new_cluster.append(cluster)
-        for cluster in cluster2:
-            new_cluster.append(cluster)
-        center_point = self.center_calculator(new_cluster)
+        new_cluster = self.clusters[index[0]] + self.clusters[index[1]]
+        center_point = self.center_calculator(self.points[new_cluster].tolist())
+        self.merges.append((self.cluster_ids[index[0]], self.cluster_ids[index[1]],
+                            math.sqrt(self.heap[index[0]][index[1]]), len(new_cluster)))
+        for position in sorted(index, reverse=True):
+            del self.cluster_ids[position]
+        self.cluster_ids.append(self.cluster_id)
+        self.cluster_id += 1
         self._remove_points_from_heap_and_dict(index[0], index[1])
         self._recalculate_distances_in_heap(center_point)
         self.cluster_centers_by_index[len(self.clusters)] = center_point
         self.clusters.append(new_cluster)
 
-    def _recalculate_distances_in_heap(self, new_center: List[int]) -> None:
+    def _recalculate_distances_in_heap(self, new_center: tuple) -> None:
         """
-        method that recalculates distances from newly created cluster center and adds them to distance heap
+        method that recalculates squared distances from newly created cluster center and adds them to distance heap
         :param new_center: newly created cluster center
         """
         add_to_heap = []
         i = 0
         new_center_dict = {}
+        self.distances_computed += len(self.cluster_centers_by_index)
         for center in self.cluster_centers_by_index.values():
-            center_distances = distance(center, new_center)
+            center_distances = squared_distance(center, new_center)
             self.heap[i].append(center_distances)
             add_to_heap.append(center_distances)
             new_center_dict[i] = center
@@ -128,40 +171,122 @@ class AgglomerativeClustering:
         self.cluster_centers_by_index = new_center_dict
         self.cluster_centers_by_index[len(self.clusters)] = new_center
 
-    def _statistics(self) -> None:
+    def _run_vectorized(self) -> None:
+        """
+        method that merges clusters with centroid linkage engine, which keeps distances in condensed array (or finds
+        nearest clusters in grid with spatial index) and finds closest clusters from heap instead of scanning whole
+        distance heap
+        """
+        linkage = CentroidLinkage(self.points, self.spatial_index, self.profiler)
+        self.dendrogram = linkage.run()
+        self.iterations = linkage.iterations
+        self.distances_computed = linkage.distances_computed
+
+    def _run_cf_tree(self) -> None:
+        """
+        method that streams points into cf-tree, merges its leaf subclusters with centroid linkage engine (subclusters
+        are weighted by their number of points) and assigns every point to subcluster with the closest centroid by
+        blocked distances
+        """
+        with self.profiler.phase("cf_tree"):
+            tree = CFTree(self.cf_threshold, dimensions=self.points.shape[1])
+            tree.insert_points(self.points)
+        counts, sums, _ = tree.leaf_entries()
+        centroids = sums / counts[:, np.newaxis]
+        linkage = CentroidLinkage(centroids, self.spatial_index, self.profiler, counts)
+        self.dendrogram = linkage.run()
+        with self.profiler.phase("assignment"):
+            self.subcluster_labels = nearest_centers(self.points, centroids)[0]
+        self.iterations = linkage.iterations
+        self.distances_computed = tree.distances_computed + linkage.distances_computed + len(self.points) * len(counts)
+
+    def _point_labels(self, labels: np.ndarray) -> np.ndarray:
+        """
+        method that turns labels of dendrogram leaves into labels of points, with cf-tree clusters are numbered again in
+        order of their first point and clusters left without points are dropped
+        :param labels: cluster index for every leaf of dendrogram
+        :return: cluster index for every point
+        """
+        if self.subcluster_labels is None:
+            return labels
+        labels = labels[self.subcluster_labels]
+        _, first_points, labels = np.unique(labels, return_index=True, return_inverse=True)
+        order = np.empty(len(first_points), dtype=np.int64)
+        order[np.argsort(first_points)] = np.arange(len(first_points))
+        return order[labels]
+
+    def cut(self, k: int) -> ClusteringResult:
+        """
+        method that cuts dendrogram built by fit at k clusters and calculates success rate of them, nothing is
+        clustered again, so many values of k can be compared after one fit. Success rate is calculated by % and if
+        cluster has an average distance from middle under 500 points it's classified as a successful cluster
+        :param k: number of clusters (1 <= k <= number of points, with cf-tree number of subclusters)
+        :return: labels, centers, inertia and success rate of k clusters, time of cut and no iterations
+        """
+        start_time = timeit.default_timer()
+        labels = self._point_labels(self.dendrogram.cut(k))
+        k = int(labels.max()) + 1
+        centers = calculate_centers(self.points, labels, k, self.center_char)
+        return ClusteringResult(labels, centers, inertia(self.points, labels, centers),
+                                success_rate(self.points, labels, centers), timeit.default_timer() - start_time, 0, 0)
+
+    def _console_print(self) -> None:
         """
         method that outputs statistics for generated outcome, how much time it took to generate clusters and
-        Also outputs selected clusters success rate. Success rate is calculated by % and if cluster
-        has an average distance from middle under 500 points it's classified as a successful cluster
-        :return:
-        """
-        good_clusters = 0
-        for cluster in self.clusters:
-            center = self.center_calculator(cluster)
-            sum_of_distances = 0
-            for points in cluster:
-                sum_of_distances += distance(points, center)
-            if sum_of_distances / len(cluster) <= 500:
-                good_clusters += 1
-        cluster_success_rate = good_clusters / len(self.clusters) * 100
+        selected clusters success rate
+        """
         print(f"Agglomerative clustering with {self.k} clusters")
         print("Center calculation: centroid")
         print(f"Time to calculate clusters : {self.stop_time - self.start_time} seconds")
-        print(f"Cluster success rate {cluster_success_rate} %")
+        print(f"Cluster success rate {self.final_cluster_success_rate} %")
 
-    def run(self) -> None:
+    def fit(self) -> ClusteringResult:
         """
-        main method that runs agglomerative algorithm and outputs graphic plot for generated clusters
+        method that runs agglomerative algorithm without console output and plot, clusters are merged until dendrogram
+        is complete and k clusters are cut from it. Time is measured from start of this method so setup of object is not
+        included
+        :return: labels, centers, inertia, success rate, time and counters of clustering
         """
-        self._create_distance_heap()
-        while len(self.clusters) != self.k:
-            index = self._find_closest_clusters()
-            self._merge_closest_clusters(index)
+        self.start_time = timeit.default_timer()
+        if self.cf_threshold is not None:
+            self._run_cf_tree()
+        elif self.engine == "numpy":
+            self._run_vectorized()
+        else:
+            with self.profiler.phase("distance_matrix"):
+                self._create_distance_heap()
+            while len(self.clusters) > 1:
+                with self.profiler.phase("search"):
+                    index = self._find_closest_clusters()
+                with self.profiler.phase("update"):
+                    self._merge_closest_clusters(index)
+                self.iterations += 1
+                self.profiler.iteration(algorithm="agglomerative", iteration=self.iterations,
+                                        clusters=len(self.clusters))
+            self.dendrogram = Dendrogram(np.array(self.merges))
 
         self.stop_time = timeit.default_timer()
-        self._statistics()
-
-        for values in self.clusters:
-            plot.scatter([x[0] for x in values], [x[1] for x in values])
+        self.profiler.count("iterations", self.iterations)
+        self.profiler.count("distances", self.distances_computed)
+        self.profiler.count("center_updates", self.iterations)
+        with self.profiler.phase("evaluation"):
+            result = self.cut(self.k)
+        self.labels = result.labels
+        self.final_cluster_success_rate = result.success_rate
+        self.result = ClusteringResult(self.labels, result.centers, result.inertia, self.final_cluster_success_rate,
+                                       self.stop_time - self.start_time, self.iterations, self.distances_computed)
+        return self.result
 
-        plot.show()
+    def run(self, plot_mode: str = "show", plot_path: str = PLOT_PATH) -> ClusteringResult:
+        """
+        main method that runs agglomerative algorithm, prints statistics and outputs graphic plot for generated
+        clusters
+        :param plot_mode: show, save or off
+        :param plot_path: png file used when plot is saved
+        :return: result of fit
+        """
+        result = self.fit()
+        self._console_print()
+        with self.profiler.phase("plotting"):
+            plot_clusters(self.points, result.labels, plot_mode, plot_path)
+        return result
@@ -0,0 +1,237 @@
+import heapq
+from typing import List
+
+import numpy as np
+
+from algorithms.dendrogram import Dendrogram
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.spatial_index import GridIndex
+
+
+class CentroidLinkage:
+    """
+    class that implements centroid linkage engine for agglomerative clustering. Distances between clusters are stored in
+    condensed float array (upper triangle of distance matrix without diagonal), every active cluster remembers its
+    nearest neighbour and closest pair is taken from heap of these nearest neighbours. Merged clusters are not deleted,
+    new cluster reuses slot of the first merged cluster and the second one is only marked as inactive. With spatial
+    index condensed array is not created at all, nearest neighbours are searched in grid of cluster centers and they are
+    repaired lazily, only when their heap entry is popped and turns out to be outdated. Every merge is recorded in
+    linkage array, so clusters can be cut at any k afterwards
+    """
+    heap: List[tuple[float, int, int]]
+    linkage: np.ndarray
+    grid: GridIndex or None
+    distances_computed: int
+    iterations: int
+
+    def __init__(self, points: np.ndarray, spatial_index: bool = False, profiler: Profiler = NULL_PROFILER,
+                 sizes: np.ndarray or None = None) -> None:
+        """
+        every point starts as standalone cluster, its slot in all arrays is its index in points
+        :param points: (n, d) array of point coordinates
+        :param spatial_index: whether nearest neighbours are searched in grid instead of condensed distance array, grid
+        is 2-d so it needs 2-d points
+        :param profiler: profiler that gets phase times and callback for every merge
+        :param sizes: (n,) number of points summarized by every point (for example subclusters of cf-tree), points
+        are weighted by them when centers are merged, None means single points
+        """
+        if spatial_index and points.shape[1] != 2:
+            raise ValueError("spatial index can be used only with 2-d points")
+        self.n = len(points)
+        self.centers = np.array(np.transpose(points), dtype=np.float64)
+        self.sizes = np.ones(self.n, dtype=np.int64) if sizes is None else np.array(sizes, dtype=np.int64)
+        self.active = np.ones(self.n, dtype=bool)
+        self.ids = np.arange(self.n)
+        self.linkage = np.empty((max(self.n - 1, 0), 4))
+        self.spatial_index = spatial_index
+        self.profiler = profiler
+        self.grid = None
+        if not spatial_index:
+            self.distances = np.empty(self.n * (self.n - 1) // 2, dtype=np.float32)
+            slots = np.arange(self.n, dtype=np.int64)
+            self.row_starts = self.n * slots - slots * (slots + 1) // 2 - slots - 1
+        self.nearest = np.full(self.n, -1, dtype=np.int64)
+        self.nearest_distances = np.full(self.n, np.inf, dtype=np.float32)
+        self.num_of_clusters = self.n
+        self.distances_computed = 0
+        self.iterations = 0
+        self.heap = []
+
+    def _condensed_indexes(self, slot: int, others: np.ndarray) -> np.ndarray:
+        """
+        method that returns positions of distances between slot and other slots in condensed distance array, distance
+        between slots i < j is stored at row_starts[i] + j
+        :param slot: slot of cluster
+        :param others: sorted slots of other clusters, slot itself must not be included
+        :return: indexes into condensed distance array
+        """
+        split = np.searchsorted(others, slot)
+        return np.concatenate([self.row_starts[others[:split]] + slot, self.row_starts[slot] + others[split:]])
+
+    def _center_distances(self, slot: int, others: np.ndarray or slice or int) -> np.ndarray:
+        """
+        method that calculates distances from center of given slot to centers of other slots, centers are kept as
+        (d, n) array so every axis is one contiguous row and squared differences are summed axis by axis
+        :param slot: slot of cluster
+        :param others: slots of other clusters
+        :return: distances stored with the same precision as condensed distance array
+        """
+        differences = self.centers[0, others] - self.centers[0, slot]
+        squared = differences * differences
+        for axis in range(1, len(self.centers)):
+            differences = self.centers[axis, others] - self.centers[axis, slot]
+            squared += differences * differences
+        self.distances_computed += np.size(squared)
+        return np.sqrt(squared).astype(np.float32)
+
+    def _create_distance_array(self) -> None:
+        """
+        method that fills condensed distance array row by row and finds nearest neighbour of every cluster on the way
+        """
+        start = 0
+        for i in range(self.n - 1):
+            row = self._center_distances(i, slice(i + 1, self.n))
+            self.distances[start:start + len(row)] = row
+            start += len(row)
+
+            closest = np.argmin(row)
+            if row[closest] < self.nearest_distances[i]:
+                self.nearest[i] = i + 1 + closest
+                self.nearest_distances[i] = row[closest]
+            closer = row < self.nearest_distances[i + 1:]
+            self.nearest[i + 1:][closer] = i
+            self.nearest_distances[i + 1:][closer] = row[closer]
+
+        for slot in range(self.n):
+            if self.nearest[slot] != -1:
+                self.heap.append((float(self.nearest_distances[slot]), slot, int(self.nearest[slot])))
+        heapq.heapify(self.heap)
+
+    def _create_grid(self) -> None:
+        """
+        method that inserts all clusters into grid index and finds nearest neighbour of every cluster in it
+        """
+        self.grid = GridIndex(self.centers[0], self.centers[1], np.arange(self.n))
+        for slot in range(self.n):
+            self.nearest[slot], self.nearest_distances[slot] = self.grid.nearest(slot)
+            if self.nearest[slot] != -1:
+                self.heap.append((float(self.nearest_distances[slot]), slot, int(self.nearest[slot])))
+        heapq.heapify(self.heap)
+
+    def _push_nearest(self, slot: int) -> None:
+        """
+        method that adds current nearest neighbour of slot to the heap
+        :param slot: slot of cluster
+        """
+        heapq.heappush(self.heap, (float(self.nearest_distances[slot]), slot, int(self.nearest[slot])))
+
+    def _recalculate_nearest(self, slot: int, active_slots: np.ndarray or None = None) -> None:
+        """
+        method that finds nearest neighbour of slot again from its row in condensed distance array or from grid
+        :param slot: slot of cluster
+        :param active_slots: slots of all active clusters, grid does not need them
+        """
+        if self.grid is not None:
+            self.nearest[slot], self.nearest_distances[slot] = self.grid.nearest(slot)
+        else:
+            others = active_slots[active_slots != slot]
+            row = self.distances[self._condensed_indexes(slot, others)]
+            closest = np.argmin(row)
+            self.nearest[slot] = others[closest]
+            self.nearest_distances[slot] = row[closest]
+        self._push_nearest(slot)
+
+    def _pop_closest_clusters(self) -> tuple[int, int, float]:
+        """
+        method that pops entries from heap until it finds one that is still valid, entries become invalid when one of
+        the clusters was merged or when nearest neighbour of cluster changed. With grid latest entry of cluster whose
+        neighbour was merged or moved is repaired here, its distance was not larger than distance of closest pair, so
+        closest pair can not be popped before it
+        :return: slots of the closest clusters and distance between them
+        """
+        while True:
+            distance, slot, neighbour = heapq.heappop(self.heap)
+            if not self.active[slot]:
+                continue
+            if self.nearest[slot] != neighbour or float(self.nearest_distances[slot]) != distance:
+                continue
+            if self.grid is None:
+                if self.active[neighbour]:
+                    return slot, neighbour, distance
+            elif self.active[neighbour] and float(self._center_distances(slot, neighbour)) == distance:
+                return slot, neighbour, distance
+            else:
+                self._recalculate_nearest(slot)
+
+    def _merge_clusters(self, a: int, b: int, distance: float) -> None:
+        """
+        method that merges cluster b into slot of cluster a, records merge in linkage array, updates row of slot a in
+        condensed distance array and repairs nearest neighbours that were affected by the merge, with grid only merged
+        cluster is moved in grid and gets its nearest neighbour
+        :param a: slot of first cluster, merged cluster will be stored here
+        :param b: slot of second cluster, it becomes inactive
+        :param distance: distance between centers of clusters
+        """
+        if a > b:
+            a, b = b, a
+        size = self.sizes[a] + self.sizes[b]
+        self.linkage[self.iterations] = (self.ids[a], self.ids[b], distance, size)
+        self.ids[a] = self.n + self.iterations
+        if self.grid is not None:
+            self.grid.remove(a)
+            self.grid.remove(b)
+        self.centers[:, a] = (self.centers[:, a] * self.sizes[a] + self.centers[:, b] * self.sizes[b]) / size
+        self.sizes[a] = size
+        self.active[b] = False
+        self.num_of_clusters -= 1
+        if self.num_of_clusters == 1:
+            return
+
+        if self.grid is not None:
+            if self.num_of_clusters * 2 < self.grid.size:
+                self.grid.build(np.flatnonzero(self.active))
+            else:
+                self.grid.insert(a)
+            self._recalculate_nearest(a)
+            return
+
+        active_slots = np.flatnonzero(self.active)
+        others = active_slots[active_slots != a]
+        row = self._center_distances(a, others)
+        self.distances[self._condensed_indexes(a, others)] = row
+
+        closest = np.argmin(row)
+        self.nearest[a] = others[closest]
+        self.nearest_distances[a] = row[closest]
+        self._push_nearest(a)
+
+        lost_neighbour = (self.nearest[others] == a) | (self.nearest[others] == b)
+        closer = ~lost_neighbour & (row < self.nearest_distances[others])
+        self.nearest[others[closer]] = a
+        self.nearest_distances[others[closer]] = row[closer]
+        for slot in others[closer]:
+            self._push_nearest(int(slot))
+        for slot in others[lost_neighbour]:
+            self._recalculate_nearest(int(slot), active_slots)
+
+    def run(self) -> Dendrogram:
+        """
+        main method of centroid linkage engine, it merges closest clusters until one cluster remains, so whole merge
+        tree is built and it can be cut at any number of clusters
+        :return: merge tree
+        """
+        with self.profiler.phase("distance_matrix"):
+            if self.spatial_index:
+                self._create_grid()
+            else:
+                self._create_distance_array()
+        while self.num_of_clusters > 1:
+            with self.profiler.phase("search"):
+                a, b, distance = self._pop_closest_clusters()
+            with self.profiler.phase("update"):
+                self._merge_clusters(a, b, distance)
+            self.iterations += 1
+            self.profiler.iteration(algorithm="agglomerative", iteration=self.iterations, clusters=self.num_of_clusters)
+        if self.grid is not None:
+            self.distances_computed += self.grid.distances_computed
+        return Dendrogram(self.linkage)
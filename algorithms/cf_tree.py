@@ -0,0 +1,207 @@
+from typing import List
+
+import numpy as np
+
+from helpers.consts import CF_THRESHOLD, CF_BRANCHING, GENERATOR_BATCH_SIZE
+from helpers.measurements import squared_distances
+
+
+class CFNode:
+    """
+    class that holds one node of clustering feature tree, every entry is clustering feature (number of points, sums of
+    coordinates, sum of squared coordinates). Entry of leaf is subcluster of points and entry of inner node is summary
+    of its child node. Features are kept in arrays with room for branching + 1 entries, so closest entry is found by
+    one vectorized calculation over all entries and coordinates
+    """
+    counts: np.ndarray
+    sums: np.ndarray
+    squares: np.ndarray
+    children: List["CFNode"]
+    size: int
+
+    def __init__(self, leaf: bool, dimensions: int, capacity: int) -> None:
+        """
+        :param leaf: whether entries of node are subclusters of points
+        :param dimensions: number of coordinates of points
+        :param capacity: maximal number of entries, overflowed node has branching + 1 entries before it is split
+        """
+        self.leaf = leaf
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.sums = np.zeros((capacity, dimensions), dtype=np.float64)
+        self.squares = np.zeros(capacity, dtype=np.float64)
+        self.children = []
+        self.size = 0
+
+    def summary(self) -> tuple[int, np.ndarray, float]:
+        """
+        method that sums clustering features of all entries, clustering features are additive
+        :return: clustering feature of whole node
+        """
+        return int(self.counts[:self.size].sum()), self.sums[:self.size].sum(axis=0), \
+            float(self.squares[:self.size].sum())
+
+    def append(self, feature: tuple[int, np.ndarray, float], child: "CFNode" or None = None) -> None:
+        """
+        method that adds new entry to node
+        :param feature: clustering feature of entry
+        :param child: node summarized by entry, None in leaf
+        """
+        self.counts[self.size], self.sums[self.size], self.squares[self.size] = feature
+        self.size += 1
+        if child is not None:
+            self.children.append(child)
+
+    def remove(self, index: int) -> None:
+        """
+        method that removes entry from node, later entries move one position back
+        :param index: index of entry
+        """
+        for features in (self.counts, self.sums, self.squares):
+            features[index:self.size - 1] = features[index + 1:self.size]
+        self.size -= 1
+        if self.children:
+            del self.children[index]
+
+
+class CFTree:
+    """
+    class that implements BIRCH clustering feature tree. Points are streamed into it one by one, every point descends
+    to the closest entry (by centroid) of every node and in leaf it is absorbed by the closest subcluster when radius
+    of subcluster stays within threshold, otherwise it starts new subcluster. Node with more than branching entries is
+    split around its two farthest entries. Only clustering features are stored, so memory depends on number of
+    subclusters and not on number of points
+    """
+    root: CFNode
+    num_of_points: int
+    distances_computed: int
+
+    def __init__(self, threshold: float = CF_THRESHOLD, branching: int = CF_BRANCHING, dimensions: int = 2) -> None:
+        """
+        :param threshold: maximal radius (root mean squared distance of points to centroid) of leaf subcluster
+        :param branching: maximal number of entries of node
+        :param dimensions: number of coordinates of points
+        """
+        self.threshold = threshold
+        self.branching = branching
+        self.dimensions = dimensions
+        self.root = self._new_node(leaf=True)
+        self.num_of_points = 0
+        self.distances_computed = 0
+
+    def _new_node(self, leaf: bool) -> CFNode:
+        """
+        helper method that creates empty node with room for overflow entry
+        :param leaf: whether entries of node are subclusters of points
+        :return: new node
+        """
+        return CFNode(leaf, self.dimensions, self.branching + 1)
+
+    def insert_points(self, points: np.ndarray, batch_size: int = GENERATOR_BATCH_SIZE) -> None:
+        """
+        method that streams points into tree in batches, so memory mapped points are never converted at once
+        :param points: (n, d) array of points
+        :param batch_size: number of points converted to float64 at once
+        """
+        for start in range(0, len(points), batch_size):
+            for point in points[start:start + batch_size].astype(np.float64):
+                self.insert(point)
+
+    def insert(self, point: np.ndarray) -> None:
+        """
+        method that inserts one point, when root is split new root is created above both halves
+        :param point: (d,) float64 coordinates of point
+        """
+        split = self._insert(self.root, point, float(point @ point))
+        if split is not None:
+            self.root = self._new_node(leaf=False)
+            for node in split:
+                self.root.append(node.summary(), node)
+        self.num_of_points += 1
+
+    def _closest_entry(self, node: CFNode, point: np.ndarray) -> int:
+        """
+        method that finds entry of node whose centroid is the closest to point, on tie the first entry wins
+        :param node: node with at least one entry
+        :param point: coordinates of point
+        :return: index of the closest entry
+        """
+        differences = node.sums[:node.size] / node.counts[:node.size, np.newaxis] - point
+        differences *= differences
+        self.distances_computed += node.size
+        return int(differences.sum(axis=1).argmin())
+
+    def _insert(self, node: CFNode, point: np.ndarray, square: float) -> tuple[CFNode, CFNode] or None:
+        """
+        method that inserts point into subtree of node and updates clustering features on the way back
+        :param node: root of subtree
+        :param point: coordinates of point
+        :param square: sum of squared coordinates of point
+        :return: two nodes that replace node when it overflowed, otherwise None
+        """
+        if node.size == 0:
+            node.append((1, point, square))
+            return None
+        index = self._closest_entry(node, point)
+        if node.leaf:
+            count = node.counts[index] + 1
+            sums = node.sums[index] + point
+            squares = node.squares[index] + square
+            mean = sums / count
+            if squares / count - float(mean @ mean) <= self.threshold * self.threshold:
+                node.counts[index] = count
+                node.sums[index] = sums
+                node.squares[index] = squares
+                return None
+            node.append((1, point, square))
+        else:
+            split = self._insert(node.children[index], point, square)
+            if split is None:
+                node.counts[index] += 1
+                node.sums[index] += point
+                node.squares[index] += square
+                return None
+            node.remove(index)
+            for child in split:
+                node.append(child.summary(), child)
+        if node.size > self.branching:
+            return self._split(node)
+        return None
+
+    def _split(self, node: CFNode) -> tuple[CFNode, CFNode]:
+        """
+        method that splits overflowed node, two entries with the farthest centroids are seeds and every other entry
+        goes to node of the closer seed, on tie to the first one. When all centroids are equal first and last entry are
+        seeds, so both nodes get at least one entry
+        :param node: node with branching + 1 entries
+        :return: two new nodes
+        """
+        centroids = node.sums[:node.size] / node.counts[:node.size, np.newaxis]
+        distances = squared_distances(centroids, centroids)
+        self.distances_computed += node.size * node.size
+        first, second = np.unravel_index(np.argmax(distances), distances.shape)
+        if first == second:
+            first, second = 0, node.size - 1
+        sides = (distances[second] < distances[first]).tolist()
+        sides[first], sides[second] = False, True
+        halves = (self._new_node(node.leaf), self._new_node(node.leaf))
+        for index, side in enumerate(sides):
+            halves[side].append((node.counts[index], node.sums[index], node.squares[index]),
+                                None if node.leaf else node.children[index])
+        return halves
+
+    def leaf_entries(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        method that collects clustering features of all leaf subclusters in depth first order
+        :return: (m,) number of points, (m, d) sums of coordinates and (m,) sums of squared coordinates of subclusters
+        """
+        counts, sums, squares = [], [], []
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if node.leaf:
+                counts.append(node.counts[:node.size])
+                sums.append(node.sums[:node.size])
+                squares.append(node.squares[:node.size])
+            else:
+                nodes.extend(reversed(node.children))
+        return np.concatenate(counts), np.concatenate(sums), np.concatenate(squares)
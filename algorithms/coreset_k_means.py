@@ -0,0 +1,111 @@
+import timeit
+from typing import List
+
+import numpy as np
+
+from algorithms.k_means import KMeans
+from helpers.consts import K_MEANS_ITERATIONS, MAX_ITERATIONS, TOLERANCE, PLOT_PATH, CORESET_SIZE
+from helpers.coreset import lightweight_coreset
+from helpers.evaluation import inertia, success_rate
+from helpers.measurements import nearest_centers, compact_labels, as_points
+from helpers.plotting import plot_clusters
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result import ClusteringResult
+
+
+class CoresetKMeans:
+    """
+    class that runs k-means (centroid or medoid) on weighted lightweight coreset instead of all points, all restarts
+    see only coreset and final centers label all points in one pass of blocked distances. Cost ratio is weighted
+    inertia of coreset divided by inertia of all points for the same centers, value close to 1 means coreset
+    represents points well
+    """
+    points: np.ndarray
+    k_means: KMeans or None
+    coreset_indexes: np.ndarray or None
+    cost_ratio: float or None
+    start_time: float
+    stop_time: float
+    result: ClusteringResult or None
+
+    def __init__(self, clusters: List[List[int]] or np.ndarray, num_of_clusters: int, cluster_center: str,
+                 engine: str = "python", workers: int = 1, init: str = "random",
+                 restarts: int = K_MEANS_ITERATIONS, tolerance: float = TOLERANCE,
+                 max_iterations: int = MAX_ITERATIONS, spatial_index: bool = False,
+                 profiler: Profiler = NULL_PROFILER, warm_start: np.ndarray = None,
+                 coreset_size: int = CORESET_SIZE) -> None:
+        """
+        arguments are passed to k-means that runs on coreset
+        :param coreset_size: number of sampled points, coreset can be smaller because points sampled more than once are
+        merged
+        """
+        self.points = as_points(clusters)
+        self.k = num_of_clusters
+        self.cluster_center = cluster_center
+        self.engine = engine
+        self.workers = workers
+        self.init = init
+        self.restarts = restarts
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.spatial_index = spatial_index
+        self.profiler = profiler
+        self.warm_start = warm_start
+        self.coreset_size = coreset_size
+        self.k_means = None
+        self.coreset_indexes = None
+        self.cost_ratio = None
+        self.result = None
+
+    def fit(self) -> ClusteringResult:
+        """
+        method that builds coreset, runs k-means restarts on it and labels all points by the closest final center,
+        inertia and success rate are calculated on all points. Time is measured from start of this method
+        :return: labels of all points, centers, inertia, success rate, time and counters of clustering
+        """
+        self.start_time = timeit.default_timer()
+        with self.profiler.phase("coreset"):
+            self.coreset_indexes, weights = lightweight_coreset(self.points, self.coreset_size)
+        self.k_means = KMeans(self.points[self.coreset_indexes], self.k, self.cluster_center, self.engine, self.workers,
+                              self.init, self.restarts, self.tolerance, self.max_iterations, self.spatial_index,
+                              self.profiler, self.warm_start, weights)
+        coreset_result = self.k_means.fit()
+        with self.profiler.phase("labeling"):
+            labels, centers = compact_labels(nearest_centers(self.points, coreset_result.centers)[0],
+                                             coreset_result.centers)
+        with self.profiler.phase("evaluation"):
+            full_inertia = inertia(self.points, labels, centers)
+            rate = success_rate(self.points, labels, centers)
+        self.cost_ratio = coreset_result.inertia / full_inertia if full_inertia > 0 else 1.0
+        distances_computed = self.k_means.distances_computed + len(self.points) * len(coreset_result.centers)
+        self.stop_time = timeit.default_timer()
+        self.profiler.count("distances", len(self.points) * len(coreset_result.centers))
+        self.result = ClusteringResult(labels, centers, full_inertia, rate, self.stop_time - self.start_time,
+                                       self.k_means.iterations, distances_computed)
+        return self.result
+
+    def _console_print(self) -> None:
+        """
+        method that prints info to console
+        """
+        print(f"K-means clustering with {self.k} clusters on coreset of {len(self.coreset_indexes)} points")
+        if self.cluster_center == "m":
+            print(f"Center calculation: medoid")
+        else:
+            print(f"Center calculation: centroid")
+        print(f"Time to calculate clusters : {self.stop_time - self.start_time} seconds")
+        print(f"Cluster success rate {self.result.success_rate} %")
+        print(f"Coreset cost ratio {self.cost_ratio} (weighted coreset inertia / inertia of all points)")
+
+    def run(self, plot_mode: str = "show", plot_path: str = PLOT_PATH) -> ClusteringResult:
+        """
+        main method of coreset k-means, it fits clusters, prints statistics and plots clusters of all points
+        :param plot_mode: show, save or off
+        :param plot_path: png file used when plot is saved
+        :return: result of fit
+        """
+        result = self.fit()
+        self._console_print()
+        with self.profiler.phase("plotting"):
+            plot_clusters(self.points, result.labels, plot_mode, plot_path)
+        return result
@@ -0,0 +1,72 @@
+import numpy as np
+
+
+class Dendrogram:
+    """
+    class that holds whole merge tree of agglomerative clustering as linkage array, row i describes merge i as
+    (id of first cluster, id of second cluster, distance between them, size of merged cluster). Points have ids 0 to
+    n - 1 and cluster created by merge i gets id n + i, the same layout as scipy linkage matrix. Clustering with any
+    number of clusters is read from the tree without clustering again
+    """
+    linkage: np.ndarray
+
+    def __init__(self, linkage: np.ndarray) -> None:
+        """
+        :param linkage: (n - 1, 4) float64 array of merges in order they were made
+        """
+        self.linkage = np.asarray(linkage, dtype=np.float64).reshape(-1, 4)
+
+    @property
+    def num_of_points(self) -> int:
+        """
+        :return: number of clustered points
+        """
+        return len(self.linkage) + 1
+
+    def cut(self, k: int) -> np.ndarray:
+        """
+        method that replays first n - k merges and returns clusters that exist at that moment. Merges are walked once
+        from the last one, cluster that was not merged later gets new label and both merged clusters inherit label of
+        cluster they created, so every point gets label of its root in O(n). Clusters are then numbered in order of
+        their first point
+        :param k: number of wanted clusters (1 <= k <= n)
+        :return: cluster index for every point
+        """
+        n = self.num_of_points
+        if k < 1 or k > n:
+            raise ValueError(f"number of clusters must be between 1 and {n}")
+        merges = n - k
+        labels = [-1] * (n + merges)
+        num_of_roots = 0
+        for node, (first, second) in zip(range(n + merges - 1, n - 1, -1),
+                                         reversed(self.linkage[:merges, :2].astype(np.int64).tolist())):
+            if labels[node] < 0:
+                labels[node] = num_of_roots
+                num_of_roots += 1
+            labels[first] = labels[second] = labels[node]
+        roots = np.array(labels[:n], dtype=np.int64)
+        not_merged = roots < 0
+        roots[not_merged] = num_of_roots + np.arange(np.count_nonzero(not_merged))
+
+        first_points = np.full(k, n)
+        np.minimum.at(first_points, roots, np.arange(n))
+        starts = np.flatnonzero(first_points[roots] == np.arange(n))
+        root_labels = np.empty(k, dtype=np.int64)
+        root_labels[roots[starts]] = np.arange(k)
+        return root_labels[roots]
+
+    def save(self, path: str) -> None:
+        """
+        method that writes linkage array to .npy file
+        :param path: path to file
+        """
+        np.save(path, self.linkage)
+
+    @staticmethod
+    def load(path: str) -> "Dendrogram":
+        """
+        method that reads dendrogram saved by save method
+        :param path: path to .npy file
+        :return: loaded dendrogram
+        """
+        return Dendrogram(np.load(path))
@@ -1,11 +1,20 @@
+import heapq
 import random as rd
 import timeit
 from typing import List
 
-import matplotlib.pyplot as plot
+import numpy as np
 
-from helpers.consts import RANDOM_SEED, DIVISIVE_ITERATIONS
-from helpers.measurements import get_dist_calculator, distance
+from helpers.consts import DIVISIVE_ITERATIONS, MAX_ITERATIONS, TOLERANCE, PLOT_PATH, DISTANCE_MEMORY_BUDGET
+from helpers.evaluation import calculate_centers, success_rate, size_balance, inertia
+from helpers.initialization import choose_init_indexes
+from helpers.measurements import get_dist_calculator, nearest_centers, centroid_sums, move_centroid_sums, \
+    centroids_from_sums, center_shift, as_points, integer_points, distance_blocks
+from helpers.parallel import RestartExecutor, restart_random
+from helpers.plotting import plot_clusters
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result import ClusteringResult
+from helpers.spatial_index import KDTree
 
 
 class DivisiveClustering:
@@ -13,132 +22,253 @@ class DivisiveClustering:
     class that implements divisive reverse k-means algorithm. It follows the top down approach and every iteration it
     splits current clusters into two by implementing k-means logic. Meaning recursively we call method that selects 2
     random points from cluster and assigns closest points to them. We do this until we reach out wanted number of k
-    clusters
+    clusters. Points are kept in one (n, d) int32 or float32 array, cluster is array of indexes of its points and
+    result of every restart is label of every point. In bisecting mode clusters wait in max-heap ordered by their SSE
+    and the worst one is always split, cluster is range of one permutation of point indexes that is partitioned in
+    place by every split
     """
-    final_clusters = []
+    points: np.ndarray
+    final_clusters: List[np.ndarray]
     start_time: float
     stop_time: float
+    random: rd.Random
+    iterations: int
+    distances_computed: int
+    center_updates: int
+    profiler: Profiler
+    result: ClusteringResult or None
 
-    def __init__(self, created_points: List[List[int]], num_of_clusters: int, center_calculation: str) -> None:
+    def __init__(self, created_points: List[List[int]] or np.ndarray, num_of_clusters: int, center_calculation: str,
+                 workers: int = 1, init: str = "random", restarts: int = DIVISIVE_ITERATIONS,
+                 tolerance: float = TOLERANCE, max_iterations: int = MAX_ITERATIONS,
+                 spatial_index: bool = False, profiler: Profiler = NULL_PROFILER, bisecting: bool = False) -> None:
         """
-        init method that also gets center_calculation even though i set divisive to only have centroid calculation
+        init method that also gets center_calculation even though i set divisive to only have centroid calculation,
+        workers is number of processes that run restarts in parallel and init selects how 2 points of every split are
+        chosen (random, k-means++, greedy-k-means++), every split stops when no point changes cluster, no center moves
+        more than tolerance, centers repeat or after max_iterations, with spatial_index points of split are assigned to
+        centers by kd-tree query over whole cluster at once, profiler collects phase times, counters and iteration
+        callbacks, with bisecting the cluster with the largest SSE is split first and workers split clusters instead
+        of running restarts, kd-tree compares exact integer distances so it needs integer points
         """
-        self.start_time = timeit.default_timer()
-        self.clusters = [created_points]
+        self.points = as_points(created_points)
+        if spatial_index and not integer_points(self.points):
+            raise ValueError("spatial index can be used only with integer points")
         self.center_char = center_calculation
         self.k = num_of_clusters
+        self.workers = workers
+        self.init = init
+        self.restarts = restarts
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.spatial_index = spatial_index
+        self.profiler = profiler
+        self.bisecting = bisecting
+        self.restart = 0
         self.center_calculation = get_dist_calculator(center_calculation)
-        rd.seed(RANDOM_SEED)  # setting seed for random for reproducibility
+        self.random = restart_random(0)
         self.current_num_of_clusters = 1
+        self.iterations = 0
+        self.distances_computed = 0
+        self.center_updates = 0
+        self.final_clusters = []
         self.final_cluster_success_rate = 0
+        self.result = None
 
-    @staticmethod
-    def _choose_2_points_as_clusters(cluster: List[List[int]]) -> List[List[int]] or None:
+    def _choose_2_points_as_clusters(self, points: np.ndarray) -> List[int]:
         """
-        static method that returns 2 randomly selected points from given cluster
-        :param cluster: from which we want to select random points
-        :return: selected points
+        method that returns 2 points selected from given cluster by init strategy
+        :param points: points of cluster from which we want to select points
+        :return: indexes of selected points in cluster
         """
-        return rd.sample(cluster, 2)
+        if self.init == "random":
+            return self.random.sample(range(len(points)), 2)
+        return choose_init_indexes(points, 2, self.init, self.random)
 
-    @staticmethod
-    def _assign_points_to_clusters(points: List[List[int]], cluster: List[List[int]]) -> dict:
+    def _assign_labels(self, centers: np.ndarray, points: np.ndarray) -> np.ndarray:
         """
-        static method that assigned points from clusters to the closest center point that was selected
-        :param points: selected center points of clusters
-        :param cluster: from which we want to assign points to
-        :return: dict with assigned points
+        method that assigns every point of cluster to the closest of 2 center points, on tie first center is
+        selected, with spatial index closest centers are found by kd-tree query
+        :param centers: (2, d) array of center points
+        :param points: points of cluster we want to assign
+        :return: 0 or 1 for every point of cluster
         """
+        if self.spatial_index:
+            tree = KDTree(centers)
+            labels = tree.query(points)[0]
+            self.distances_computed += tree.distances_computed
+            return labels
+        self.distances_computed += 2 * len(points)
+        return nearest_centers(points, centers)[0]
 
-        cluster_dict = {tuple(point): [] for point in points}
-        for value in cluster:
-            distance_a = distance(points[0], value)
-            distance_b = distance(points[1], value)
-            if distance_a <= distance_b:
-                cluster_dict[tuple(points[0])].append(value)
-            else:
-                cluster_dict[tuple(points[1])].append(value)
-        return cluster_dict
+    def _top_down_k_means(self, cluster: np.ndarray) -> List[np.ndarray] or None:
+        """
+        method that implements top down k-means meaning it selects 2 random points from given cluster and continues
+        k- means algorithm like when we want to have 2 final clusters, centroids are kept as running coordinate sums
+        that are updated only for points that changed cluster
+        :param cluster: indexes of points of cluster we want to split
+        :return: indexes of points of 2 new clusters
+        """
+        if self.current_num_of_clusters == self.k:
+            return
+        labels = self._two_means(self.points[cluster])
+        self.current_num_of_clusters += 1
+        return [cluster[labels == side] for side in (0, 1)]
 
-    def _calculate_new_center_points(self, clusters: dict) -> List[List[int]]:
+    def _two_means(self, points: np.ndarray) -> np.ndarray:
         """
-        method that calculates new center points from given clusters
-        :param clusters: for which we want to calculate new center points
-        :return: recalculated center points
+        method that splits points of one cluster by k-means with 2 centers chosen by init strategy
+        :param points: points of cluster we want to split
+        :return: 0 or 1 for every point of cluster
         """
-        center_points = []
-        for values in clusters.values():
-            center_points.append(self.center_calculation(values))
-        return center_points
+        created_center_points = {}
+        with self.profiler.phase("seeding"):
+            centers = points[self._choose_2_points_as_clusters(points)].astype(np.float64)
+        with self.profiler.phase("assignment"):
+            labels = self._assign_labels(centers, points)
+        with self.profiler.phase("update"):
+            sums, counts = centroid_sums(points, labels, 2)
+        iteration = 0
+        while True:
+            iteration += 1
+            self.iterations += 1
+            with self.profiler.phase("update"):
+                old_centers, centers = centers, centroids_from_sums(sums, counts, centers, integer_points(points))
+            with self.profiler.phase("assignment"):
+                old_labels, labels = labels, self._assign_labels(centers, points)
+            with self.profiler.phase("update"):
+                moved = move_centroid_sums(points, old_labels, labels, sums, counts)
+            self.center_updates += 2
+            self.profiler.iteration(algorithm="divisive", restart=self.restart, split=self.current_num_of_clusters,
+                                    iteration=iteration, moved=moved)
+            key = centers.tobytes()
+            if moved == 0 or iteration >= self.max_iterations or created_center_points.get(key) \
+                    or center_shift(old_centers, centers) <= self.tolerance:
+                break
+            created_center_points[key] = True
+        return labels
 
-    @staticmethod
-    def _reassign_points_to_center(cluster: List[List[int]], centers: List[List[int]]) -> dict:
+    def _split_range(self, segment: np.ndarray, restart: int, start: int) -> tuple[np.ndarray, List[float]]:
         """
-        method that reassigns points from already assigned clusters to new recalculated centers
-        :param cluster: with assigned points
-        :param centers: newly calculated centers
-        :return: dict with reassigned points
+        method that splits one cluster of bisecting mode, random generator depends only on restart and position of
+        cluster in permutation, so cluster is split the same way in any process and in any order
+        :param segment: indexes of points of cluster, range of permutation
+        :param restart: number of restart
+        :param start: start of range in permutation
+        :return: 0 or 1 for every point of cluster and SSE of both new clusters
         """
-        center_dict = {center: [] for center in centers}
-        for point in cluster:
-            distances = [distance(point, center) for center in centers]
-            min_index = distances.index(min(distances))
-            center_dict[tuple(centers[min_index])].append(point)
-        return center_dict
+        self.random = restart_random(restart, start, start + len(segment))
+        points = self.points[segment]
+        labels = self._two_means(points)
+        return labels, _cluster_sse(points, labels, 2).tolist()
 
-    def _top_down_k_means(self, cluster: List[List[int]]) -> List[List[int]] or None:
+    def _split_concurrently(self, heap: List[tuple[float, int, int]], splits: dict, executor: RestartExecutor) -> None:
         """
-        method that implements top down k-means meaning it selects 2 random points from given cluster and continues
-        k- means algorithm like when we want to have 2 final clusters
-        :param cluster: cluster we want to split
-        :return: list of 2 new clusters
+        method that splits clusters with the largest SSE in worker processes before they are popped from heap, clusters
+        are disjoint ranges of permutation, so split of cluster does not change when other cluster is split first.
+        Permutation is shared with workers, so only ranges are sent to them. Splits are kept until their cluster is
+        popped
+        :param heap: heap of (-SSE, start, stop) of clusters
+        :param splits: splits computed in advance by (start, stop) of cluster
+        :param executor: executor with shared points and permutation
         """
-        created_center_points = {}
-        if self.current_num_of_clusters == self.k:
+        candidates = [(start, stop) for _, start, stop in heapq.nsmallest(self.workers, heap)
+                      if (start, stop) not in splits and stop - start > 1]
+        if len(candidates) < 2:
             return
-        chosen_points = self._choose_2_points_as_clusters(cluster)
-        assigned_points = self._assign_points_to_clusters(chosen_points, cluster)
-        while True:
-            recalculated_center_points = self._calculate_new_center_points(assigned_points)
-            assigned_points = self._reassign_points_to_center(cluster, recalculated_center_points)
-            if created_center_points.get(tuple(recalculated_center_points)):
-                break
-            created_center_points[tuple(recalculated_center_points)] = True
-        self.current_num_of_clusters += 1
-        return assigned_points.values()
+        arguments = [(self.center_char, self.init, self.tolerance, self.max_iterations, self.spatial_index,
+                      self.profiler.enabled, self.restart, start, stop) for start, stop in candidates]
+        for candidate, split in zip(candidates, executor.map(_split_range, arguments)):
+            splits[candidate] = split
 
-    def _select_best_variance(self) -> List[List[List[int]]]:
+    def _run_bisecting(self, restart: int, executor: RestartExecutor or None = None) -> np.ndarray:
+        """
+        method that runs one bisecting restart, clusters are kept in max-heap by SSE and the worst cluster is split
+        until we have k, its range of permutation is reordered so points of first new cluster come first. Cluster that
+        can not be split (single point or all points in one side) stays final. With executor permutation is its shared
+        array
+        :param restart: number of restart
+        :param executor: executor that splits clusters concurrently or None
+        :return: label of every point in final clusters of the restart
+        """
+        self.restart = restart
+        self.current_num_of_clusters = 1
+        permutation = np.empty(len(self.points), dtype=np.int64) if executor is None else \
+            executor.shared_array("permutation")
+        permutation[:] = np.arange(len(self.points))
+        heap = [(-float(_cluster_sse(self.points, np.zeros(len(self.points), dtype=np.int64), 1)[0]),
+                 0, len(self.points))]
+        final_ranges = []
+        splits = {}
+        while heap and self.current_num_of_clusters < self.k:
+            if executor is not None:
+                self._split_concurrently(heap, splits, executor)
+            _, start, stop = heapq.heappop(heap)
+            segment = permutation[start:stop]
+            if (start, stop) in splits:
+                labels, sse, counters, report = splits.pop((start, stop))
+                self._add_counters(counters)
+                self.profiler.merge(report)
+            elif stop - start > 1:
+                labels, sse = self._split_range(segment, restart, start)
+            else:
+                final_ranges.append((start, stop))
+                continue
+            middle = start + int(np.count_nonzero(labels == 0))
+            if middle == start or middle == stop:
+                final_ranges.append((start, stop))
+                continue
+            first = labels == 0
+            segment[:] = np.concatenate([segment[first], segment[~first]])
+            heapq.heappush(heap, (-sse[0], start, middle))
+            heapq.heappush(heap, (-sse[1], middle, stop))
+            self.current_num_of_clusters += 1
+        labels = np.empty(len(self.points), dtype=np.int64)
+        for label, (start, stop) in enumerate(sorted(final_ranges + [(start, stop) for _, start, stop in heap])):
+            labels[permutation[start:stop]] = label
+        return labels
+
+    def _add_counters(self, counters: tuple[int, int, int]) -> None:
+        """
+        method that adds counters of work done in worker process
+        :param counters: iterations, computed distances and center updates
+        """
+        iterations, distances_computed, center_updates = counters
+        self.iterations += iterations
+        self.distances_computed += distances_computed
+        self.center_updates += center_updates
+
+    def _select_best_variance(self) -> np.ndarray:
         """
         method that selects best variance out of generated clusters, we repeat the whole k-means process n times (in my
         case 5 times) and then based on variance we select the best one. Best variance means that generated k clusters
         have the most evenly split number of points in all clusters
-        :return: k clusters with the best variance
-        """
-        variances = []
-        total_length = len(self.clusters[0])
-        for final_cluster in self.final_clusters:
-            variance = 1
-            for values in final_cluster:
-                variance = variance * (len(values) / total_length)
-            variances.append(variance)
+        :return: labels of k clusters with the best variance
+        """
+        variances = [size_balance(labels, self.k) for labels in self.final_clusters]
         max_variance_index = variances.index(max(variances))
         return self.final_clusters[max_variance_index]
 
-    def _calculate_success_rate(self, best_variance: List[List[List[int]]]) -> None:
+    def _calculate_success_rate(self, best_variance: np.ndarray) -> np.ndarray:
         """
         method that calculates final cluster success rate for output, if average distance from cluster center is greater
         than 5 that cluster is marked as unsuccessful
-        :param best_variance: final cluster
-        """
-        good_clusters = 0
-        for cluster in best_variance:
-            center = self.center_calculation(cluster)
-            sum_of_distances = 0
-            for points in cluster:
-                sum_of_distances += distance(points, center)
-            if sum_of_distances / len(cluster) <= 500:
-                good_clusters += 1
-        self.final_cluster_success_rate = good_clusters / len(best_variance) * 100
+        :param best_variance: labels of final clusters
+        :return: centers of final clusters
+        """
+        num_of_clusters = int(best_variance.max()) + 1
+        centers = calculate_centers(self.points, best_variance, num_of_clusters, self.center_char)
+        self.final_cluster_success_rate = success_rate(self.points, best_variance, centers)
+        return centers
+
+    def _count_profiler_totals(self) -> None:
+        """
+        method that adds totals of counters collected during run to profiler
+        """
+        self.profiler.count("restarts", self.restarts)
+        self.profiler.count("iterations", self.iterations)
+        self.profiler.count("distances", self.distances_computed)
+        self.profiler.count("center_updates", self.center_updates)
 
     def _console_print(self) -> None:
         """
@@ -152,50 +282,151 @@ class DivisiveClustering:
         print(f"Time to calculate clusters : {self.stop_time - self.start_time} seconds")
         print(f"Cluster success rate {self.final_cluster_success_rate} %")
 
-    def _finish_iteration(self, old_clusters: List[List[int]], newly_created_clusters: List[List[int]], index: int) \
-            -> None:
+    def _finish_iteration(self, old_clusters: List[np.ndarray], newly_created_clusters: List[np.ndarray], index: int) \
+            -> np.ndarray:
         """
         method that is called at the end of one divisive k-means iteration, it creates one final cluster for old
         clusters that have not been split yet and new clusters that have been already split
         :param old_clusters: one loop before splitting
         :param newly_created_clusters: clusters that have been already split
         :param index: at what index in old clusters did algorithm stop
+        :return: label of every point in final clusters of the iteration
         """
-        final_clusters = []
-        for i in range(index, len(old_clusters), 1):
-            final_clusters.append(old_clusters[i])
-        for cluster in newly_created_clusters:
-            final_clusters.append(cluster)
-        self.final_clusters.append(final_clusters)
+        final_clusters = old_clusters[index:] + newly_created_clusters
+        labels = np.empty(len(self.points), dtype=np.int64)
+        for label, cluster in enumerate(final_clusters):
+            labels[cluster] = label
         self.current_num_of_clusters = self.k + 1
+        return labels
+
+    def _run_restart(self, restart: int) -> np.ndarray:
+        """
+        method that runs one divisive iteration with its own random generator, clusters are split until we have k
+        :param restart: number of restart
+        :return: label of every point in final clusters of the iteration
+        """
+        self.random = restart_random(restart)
+        self.restart = restart
+        self.current_num_of_clusters = 1
+        current_clusters = [np.arange(len(self.points))]
+        while True:
+            new_clusters = []
+            counter = 0
+            for cluster in current_clusters:
+                created_clusters = self._top_down_k_means(cluster)
+                if not created_clusters:
+                    return self._finish_iteration(current_clusters, new_clusters, counter)
+                for created_cluster in created_clusters:
+                    new_clusters.append(created_cluster)
+                counter += 1
+            current_clusters = new_clusters
 
-    def run(self) -> None:
-        """
-        main method that implements divisive reverse k-means algorithm
-        it repeats cluster splitting until we have created wanted k clusters
-        at the end of method it also generates graphic plot for created clusters
-        """
-        for i in range(DIVISIVE_ITERATIONS):
-            self.current_num_of_clusters = 1
-            current_clusters = self.clusters
-            while self.current_num_of_clusters <= self.k:
-                new_clusters = []
-                counter = 0
-                for cluster in current_clusters:
-                    created_clusters = self._top_down_k_means(cluster)
-                    if not created_clusters:
-                        self._finish_iteration(current_clusters, new_clusters, counter)
-                        break
-                    for created_cluster in created_clusters:
-                        new_clusters.append(created_cluster)
-                    counter += 1
-                current_clusters = new_clusters
-
-        best_variance = self._select_best_variance()
-        self._calculate_success_rate(best_variance)
+    def fit(self) -> ClusteringResult:
+        """
+        method that implements divisive reverse k-means algorithm without console output and plot
+        it repeats cluster splitting until we have created wanted k clusters, restarts times, in worker
+        processes when more workers are wanted (in bisecting mode workers split clusters of one restart), time is
+        measured from start of this method so setup of object is not included
+        :return: labels, centers, inertia, success rate, time and counters of restart with the best variance
+        """
+        self.start_time = timeit.default_timer()
+        if self.bisecting and self.workers > 1:
+            permutation = np.empty(len(self.points), dtype=np.int64)
+            with RestartExecutor(self.points, self.workers, permutation=permutation) as executor:
+                self.final_clusters = [self._run_bisecting(i, executor) for i in range(self.restarts)]
+        elif self.bisecting:
+            self.final_clusters = [self._run_bisecting(i) for i in range(self.restarts)]
+        elif self.workers > 1:
+            self.final_clusters = []
+            with RestartExecutor(self.points, self.workers) as executor:
+                arguments = [(self.k, self.center_char, self.init, self.tolerance, self.max_iterations,
+                              self.spatial_index, self.profiler.enabled, i) for i in range(self.restarts)]
+                for labels, counters, report in executor.map(_run_restart, arguments):
+                    self.final_clusters.append(labels)
+                    self._add_counters(counters)
+                    self.profiler.merge(report)
+        else:
+            self.final_clusters = [self._run_restart(i) for i in range(self.restarts)]
+
+        with self.profiler.phase("evaluation"):
+            labels = self._select_best_variance()
+            centers = self._calculate_success_rate(labels)
         self.stop_time = timeit.default_timer()
+        self._count_profiler_totals()
+        self.result = ClusteringResult(labels, centers, inertia(self.points, labels, centers),
+                                       self.final_cluster_success_rate, self.stop_time - self.start_time,
+                                       self.iterations, self.distances_computed)
+        return self.result
+
+    def run(self, plot_mode: str = "show", plot_path: str = PLOT_PATH) -> ClusteringResult:
+        """
+        main method of divisive clustering, it fits clusters, prints statistics and at the end it also generates
+        graphic plot for created clusters
+        :param plot_mode: show, save or off
+        :param plot_path: png file used when plot is saved
+        :return: result of fit
+        """
+        result = self.fit()
         self._console_print()
+        with self.profiler.phase("plotting"):
+            plot_clusters(self.points, result.labels, plot_mode, plot_path)
+        return result
+
+
+def _run_restart(points: np.ndarray, arguments: tuple[int, str, str, float, int, bool, bool, int]) \
+        -> tuple[np.ndarray, tuple, dict]:
+    """
+    function that runs one divisive restart in worker process of RestartExecutor
+    :param points: shared points
+    :param arguments: number of clusters, center calculation, init strategy, tolerance, max iterations, spatial index,
+    profiling and number of restart
+    :return: labels of final clusters of the restart, its counters (iterations, computed distances, center updates)
+    and profiler report with phase times
+    """
+    num_of_clusters, center_calculation, init, tolerance, max_iterations, spatial_index, profiling, restart = arguments
+    divisive = DivisiveClustering(points, num_of_clusters, center_calculation, init=init, tolerance=tolerance,
+                                  max_iterations=max_iterations, spatial_index=spatial_index,
+                                  profiler=Profiler() if profiling else NULL_PROFILER)
+    labels = divisive._run_restart(restart)
+    return labels, (divisive.iterations, divisive.distances_computed, divisive.center_updates), \
+        divisive.profiler.report()
+
 
-        for values in best_variance:
-            plot.scatter([x[0] for x in values], [x[1] for x in values])
-        plot.show()
+def _split_range(points: np.ndarray, arguments: tuple[str, str, float, int, bool, bool, int, int, int],
+                 permutation: np.ndarray) -> tuple[np.ndarray, List[float], tuple, dict]:
+    """
+    function that splits one cluster of bisecting restart in worker process of RestartExecutor
+    :param points: shared points
+    :param arguments: center calculation, init strategy, tolerance, max iterations, spatial index, profiling, number of
+    restart, start and stop of cluster in permutation
+    :param permutation: shared permutation of point indexes of the restart
+    :return: 0 or 1 for every point of cluster, SSE of both new clusters, counters (iterations, computed distances,
+    center updates) and profiler report with phase times
+    """
+    center_calculation, init, tolerance, max_iterations, spatial_index, profiling, restart, start, stop = arguments
+    divisive = DivisiveClustering(points, 2, center_calculation, init=init, tolerance=tolerance,
+                                  max_iterations=max_iterations, spatial_index=spatial_index,
+                                  profiler=Profiler() if profiling else NULL_PROFILER)
+    labels, sse = divisive._split_range(permutation[start:stop], restart, start)
+    return labels, sse, (divisive.iterations, divisive.distances_computed, divisive.center_updates), \
+        divisive.profiler.report()
+
+
+def _cluster_sse(points: np.ndarray, labels: np.ndarray, k: int, memory_budget: int = DISTANCE_MEMORY_BUDGET) \
+        -> np.ndarray:
+    """
+    helper function that calculates SSE of every cluster as sum of squared distances of its points to their mean,
+    distances are summed in blocks of points within memory budget
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param k: number of clusters
+    :param memory_budget: bytes that can be used by one block
+    :return: (k,) SSE of every cluster, 0 for empty cluster
+    """
+    sums, counts = centroid_sums(points, labels, k)
+    means = sums / np.maximum(counts, 1)[:, np.newaxis]
+    sse = np.zeros(k)
+    for block in distance_blocks(len(points), points.shape[1], memory_budget=memory_budget):
+        differences = points[block] - means[labels[block]]
+        sse += np.bincount(labels[block], weights=(differences * differences).sum(axis=1), minlength=k)
+    return sse
@@ -0,0 +1,165 @@
+import numpy as np
+
+from helpers.consts import MAX_ITERATIONS, TOLERANCE
+from helpers.measurements import centroid_sums, move_centroid_sums, centroids_from_sums, center_shift, \
+    squared_distances, integer_points, distance_blocks
+
+
+class ElkanKMeans:
+    """
+    class that implements k-means engine accelerated by triangle inequality (Elkan). Every point keeps upper bound of
+    distance to its center and lower bound of distance to every other center, bounds are moved by center shifts after
+    every update, so distance is calculated only for pairs where bounds can not prove that center can not be closer
+    """
+    upper_bounds: np.ndarray
+    lower_bounds: np.ndarray
+    distances_computed: int
+    distances_skipped: int
+    iterations: int
+
+    def __init__(self, points: np.ndarray, weights: np.ndarray = None) -> None:
+        """
+        :param points: (n, d) array of point coordinates
+        :param weights: (n,) weight of every point, centroids are weighted means, None means every point has weight 1
+        """
+        self.points = points
+        self.weights = weights
+        self.distances_computed = 0
+        self.distances_skipped = 0
+        self.iterations = 0
+
+    @staticmethod
+    def _center_distances(centers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        method that calculates distances between centers and half distance from every center to its closest center
+        :param centers: (k, d) array of centers
+        :return: (k, k) distances between centers and (k,) half distances to the closest other center
+        """
+        differences = centers[:, np.newaxis, :] - centers[np.newaxis, :, :]
+        center_distances = np.sqrt((differences ** 2).sum(axis=2))
+        others = center_distances + np.diag(np.full(len(centers), np.inf))
+        return center_distances, others.min(axis=1) / 2
+
+    def _pair_distances(self, point_indexes: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        """
+        method that calculates distances only for given (point, center) pairs and counts them, points are converted to
+        float64 in blocks within DISTANCE_MEMORY_BUDGET
+        :param point_indexes: indexes of points
+        :param centers: coordinates of centers paired with points
+        :return: distances of pairs
+        """
+        self.distances_computed += len(point_indexes)
+        distances = np.empty(len(point_indexes))
+        for block in distance_blocks(len(point_indexes), self.points.shape[1]):
+            differences = self.points[point_indexes[block]] - centers[block]
+            distances[block] = np.sqrt((differences ** 2).sum(axis=1))
+        return distances
+
+    @staticmethod
+    def _may_be_closer(upper: np.ndarray, limits: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """
+        method that selects centers which bounds can not exclude, center at the same distance as assigned center wins
+        when it has lower index, so ties are broken like argmin over all distances
+        :param upper: (m,) upper bounds of points
+        :param limits: (m, k) lowest possible distance from every point to every center
+        :param labels: (m,) index of assigned center for every point
+        :return: (m, k) mask of centers whose distance has to be calculated
+        """
+        upper = upper[:, np.newaxis]
+        lower_index = np.arange(limits.shape[1]) < labels[:, np.newaxis]
+        return (upper > limits) | ((upper == limits) & lower_index)
+
+    def _init_bounds(self, centers: np.ndarray) -> np.ndarray:
+        """
+        first assignment calculates all n x k distances, they become exact bounds, points are converted to float64 in
+        blocks, so only (n, k) bounds are kept whatever the number of dimensions is
+        :param centers: initial centers
+        :return: index of the closest center for every point
+        """
+        self.lower_bounds = np.empty((len(self.points), len(centers)))
+        for block in distance_blocks(len(self.points), len(centers)):
+            self.lower_bounds[block] = np.sqrt(squared_distances(self.points[block], centers))
+        self.distances_computed += self.lower_bounds.size
+        labels = np.argmin(self.lower_bounds, axis=1)
+        self.upper_bounds = self.lower_bounds[np.arange(len(self.points)), labels]
+        return labels
+
+    def _move_bounds(self, labels: np.ndarray, old_centers: np.ndarray, centers: np.ndarray) -> None:
+        """
+        method that loosens bounds by distance that every center moved
+        :param labels: index of assigned center for every point
+        :param old_centers: centers before update
+        :param centers: centers after update
+        """
+        shifts = np.sqrt(((centers - old_centers) ** 2).sum(axis=1))
+        self.upper_bounds += shifts[labels]
+        self.lower_bounds = np.maximum(self.lower_bounds - shifts, 0)
+
+    def _assign(self, labels: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        """
+        assignment step with bounds, points whose upper bound is below half distance from their center to closest
+        other center can not change cluster, for the rest only centers that bounds can not exclude are calculated
+        :param labels: index of assigned center for every point
+        :param centers: current centers
+        :return: new index of the closest center for every point
+        """
+        center_distances, half_closest = self._center_distances(centers)
+        computed_before = self.distances_computed
+        labels = labels.copy()
+
+        candidates = np.flatnonzero(self.upper_bounds >= half_closest[labels])
+        candidate_labels = labels[candidates]
+        upper = self.upper_bounds[candidates]
+        limits = np.maximum(self.lower_bounds[candidates], center_distances[candidate_labels] / 2)
+        limits[np.arange(len(candidates)), candidate_labels] = np.inf
+        candidates_mask = self._may_be_closer(upper, limits, candidate_labels)
+        need_check = candidates_mask.any(axis=1)
+        candidates, candidate_labels = candidates[need_check], candidate_labels[need_check]
+        limits = limits[need_check]
+
+        upper = self._pair_distances(candidates, centers[candidate_labels])
+        self.upper_bounds[candidates] = upper
+        self.lower_bounds[candidates, candidate_labels] = upper
+        rows, columns = np.nonzero(self._may_be_closer(upper, limits, candidate_labels))
+        if len(rows) > 0:
+            distances = self._pair_distances(candidates[rows], centers[columns])
+            self.lower_bounds[candidates[rows], columns] = distances
+
+            closest = np.full(limits.shape, np.inf)
+            closest[np.arange(len(candidates)), candidate_labels] = upper
+            closest[rows, columns] = distances
+            new_labels = np.argmin(closest, axis=1)
+            labels[candidates] = new_labels
+            self.upper_bounds[candidates] = closest[np.arange(len(candidates)), new_labels]
+
+        self.distances_skipped += self.lower_bounds.size - (self.distances_computed - computed_before)
+        return labels
+
+    def run(self, init_centers: np.ndarray, tolerance: float = TOLERANCE, max_iterations: int = MAX_ITERATIONS) \
+            -> tuple[np.ndarray, np.ndarray]:
+        """
+        main method of elkan k-means engine, it follows the same loop as numpy k-means engine, centroids are kept as
+        running sums updated only for points that changed cluster and loop stops when no point changed cluster, no
+        center moved more than tolerance, centers repeat or after max_iterations
+        :param init_centers: (k, d) array of initial centers
+        :param tolerance: largest center shift that is considered as converged
+        :param max_iterations: maximal number of iterations
+        :return: index of assigned center for every point and final centers
+        """
+        already_assigned_center_points = {}
+        labels = self._init_bounds(init_centers)
+        sums, counts = centroid_sums(self.points, labels, len(init_centers), self.weights)
+        centers = init_centers
+        iteration = 0
+        while True:
+            iteration += 1
+            self.iterations += 1
+            old_centers, centers = centers, centroids_from_sums(sums, counts, centers, integer_points(self.points))
+            self._move_bounds(labels, old_centers, centers)
+            old_labels, labels = labels, self._assign(labels, centers)
+            moved = move_centroid_sums(self.points, old_labels, labels, sums, counts, self.weights)
+            if moved == 0 or iteration >= max_iterations or already_assigned_center_points.get(centers.tobytes()) \
+                    or center_shift(old_centers, centers) <= tolerance:
+                break
+            already_assigned_center_points[centers.tobytes()] = True
+        return labels, centers
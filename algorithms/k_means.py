@@ -2,124 +2,403 @@ import random as rd
 import timeit
 from typing import List
 
-from matplotlib import pyplot as plot
+import numpy as np
 
-from helpers.consts import RANDOM_SEED, K_MEANS_ITERATIONS, COLORS
-from helpers.measurements import distance, get_dist_calculator
+from algorithms.elkan_k_means import ElkanKMeans
+from algorithms.k_medoids import KMedoids
+from helpers.consts import K_MEANS_ITERATIONS, MAX_ITERATIONS, TOLERANCE, PLOT_PATH
+from helpers.evaluation import calculate_centers, success_rate, size_balance, inertia
+from helpers.initialization import choose_init_indexes, warm_start_indexes
+from helpers.measurements import squared_distance, get_dist_calculator, nearest_centers, centroid_sums, \
+    move_centroid_sums, centroids_from_sums, center_shift, cluster_sums, move_cluster_sums, centers_from_cluster_sums, \
+    cluster_indexes, compact_labels, as_points, integer_points
+from helpers.parallel import RestartExecutor, restart_random
+from helpers.plotting import plot_clusters
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result import ClusteringResult
+from helpers.spatial_index import KDTree
 
 
 class KMeans:
     """
-    class that implements k-means clustering algorithm
+    class that implements k-means clustering algorithm, points are kept in one (n, d) array (int32 for integer and
+    float32 for float coordinates) and result of every restart is label of every point with array of centers
     """
-    final_clusters = []
+    points: np.ndarray
+    clusters: List[List[int]] or None
+    final_clusters: List[tuple[np.ndarray, np.ndarray, float]]
     start_time: float
     stop_time: float
     final_clusters_success_rate: float
+    medoid_engine: KMedoids or None
+    elkan_engine: ElkanKMeans or None
+    distances_computed: int
+    distances_skipped: int
+    iterations: int
+    center_updates: int
+    random: rd.Random
+    profiler: Profiler
+    result: ClusteringResult or None
 
-    def __init__(self, clusters: List[List[int]], num_of_clusters: int, cluster_center: str) -> None:
+    def __init__(self, clusters: List[List[int]] or np.ndarray, num_of_clusters: int, cluster_center: str,
+                 engine: str = "python", workers: int = 1, init: str = "random",
+                 restarts: int = K_MEANS_ITERATIONS, tolerance: float = TOLERANCE,
+                 max_iterations: int = MAX_ITERATIONS, spatial_index: bool = False,
+                 profiler: Profiler = NULL_PROFILER, warm_start: np.ndarray = None, weights: np.ndarray = None) -> None:
         """
         in init we also get center_calculation which returns either medoid or centroid calculation based on our argument
+        engine selects between raw python loops, numpy engine which holds points and centers as arrays and elkan engine
+        which skips distances by triangle inequality, workers is number of processes that run restarts in parallel,
+        init selects how initial centers are chosen (random, k-means++, greedy-k-means++), one restart stops when no
+        point changes cluster, no center moves more than tolerance, centers repeat or after max_iterations, with
+        spatial_index closest centers of centroid k-means are found in kd-tree built over centers, profiler collects
+        phase times, counters and iteration callbacks, python engine loops over points as list that is created from
+        points array, warm_start are centers of earlier run (for example cached run with other k) that first restart
+        starts from, other restarts use init strategy, weights are weights of points (for example of coreset), then
+        centers are weighted means and every cost is weighted sum, centroids of integer points are truncated to int and
+        centroids of float points are exact means, kd-tree compares exact integer distances so it needs integer points
         """
-        self.start_time = timeit.default_timer()
-        self.clusters = clusters
+        self.points = as_points(clusters)
+        if spatial_index and not integer_points(self.points):
+            raise ValueError("spatial index can be used only with integer points")
+        self.clusters = self.points.tolist() if engine == "python" else None
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64).reshape(-1)
+        self.weight_list = self.weights.tolist() if self.weights is not None and engine == "python" else None
         self.cluster_center = cluster_center
         self.k = num_of_clusters
-        rd.seed(RANDOM_SEED)  # setting random seed fo reproducibility
+        self.workers = workers
+        self.init = init
+        self.warm_start = None if warm_start is None else \
+            np.asarray(warm_start, dtype=np.float64).reshape(-1, self.points.shape[1])
+        self.restarts = restarts
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.spatial_index = spatial_index
+        self.profiler = profiler
+        self.restart = 0
+        self.random = restart_random(0)
         self.center_calculator = get_dist_calculator(cluster_center)
+        self.final_clusters = []
         self.final_clusters_success_rate = 0
         self.already_assigned_center_points = {}
+        self.engine = engine
+        self.distances_computed = 0
+        self.distances_skipped = 0
+        self.iterations = 0
+        self.center_updates = 0
+        self.medoid_engine = None
+        self.elkan_engine = None
+        self.result = None
 
-    def _assign_points_to_init_clusters(self, init_clusters: List[List[int]]) -> dict:
+    def _choose_init_indexes(self) -> List[int]:
         """
-        this method assign points to the closet init cluster which is selected randomly
-        :param init_clusters: clusters that act as base points
-        :return: dictionary that contains assigned points to selected init clusters
+        method that returns indexes of k points selected by init strategy based on how many clusters we want to end up
+        with, first restart starts from points closest to warm start centers when they were given
+        :return: indexes of k selected points
         """
-        init_dict = {tuple(cluster): [] for cluster in init_clusters}
-
-        for cluster in self.clusters:
-            distances = [distance(cluster, init_cluster) for init_cluster in init_clusters]
-            min_index = distances.index(min(distances))
-            init_dict[tuple(init_clusters[min_index])].append(cluster)
-
-        return init_dict
+        if self.warm_start is not None and self.restart == 0:
+            return warm_start_indexes(self.points, self.warm_start, self.k, self.random, self.weights)
+        return choose_init_indexes(self.points, self.k, self.init, self.random, self.weights)
 
     def _choose_init_clusters(self) -> List[List[int]]:
         """
-        method that returns k randomly selected clusters based on how many clusters we want to end up with
-        :return: k randomly selected clusters
+        method that returns k clusters selected by init strategy based on how many clusters we want to end up with
+        :return: k selected clusters
         """
-        return rd.sample(self.clusters, self.k)
+        return [self.clusters[index] for index in self._choose_init_indexes()]
 
-    def _calculate_center_points(self, clusters: dict) -> List[List[int]]:
+    def _calculate_center_points(self, labels: List[int], num_of_centers: int) -> List[tuple]:
         """
-        method that calculates center points for k clusters that have generated in the first part of k-means algorithm
-        center calculation can be centroid or medoid based on initial program argument
-        :param clusters: for which we want to calculate new center points
+        method that calculates center points for clusters that have generated in the first part of k-means algorithm
+        center calculation can be centroid or medoid based on initial program argument, clusters without points are
+        left out
+        :param labels: index of assigned center for every point
+        :param num_of_centers: number of centers points were assigned to
         :return: created center points
         """
-        center_points = []
-        for values in clusters.values():
-            center_points.append(self.center_calculator(values))
-        return center_points
+        clusters = cluster_indexes(np.array(labels), num_of_centers)
+        if self.weights is not None:
+            return [self.center_calculator(self.points[cluster].tolist(), self.weights[cluster].tolist())
+                    for cluster in clusters if len(cluster)]
+        return [self.center_calculator(self.points[cluster].tolist()) for cluster in clusters if len(cluster)]
+
+    def _assign_points_vectorized(self, centers: np.ndarray) -> np.ndarray:
+        """
+        numpy engine counterpart of point assignment, squared distances are calculated in blocks and closest center is
+        selected by argmin, or only centers that kd-tree can not exclude are calculated
+        :param centers: (k, d) array of current centers
+        :return: index of the closest center for every point
+        """
+        if self.spatial_index:
+            return self._query_spatial_index(centers)
+        self.distances_computed += len(self.points) * len(centers)
+        return nearest_centers(self.points, centers)[0]
 
-    def _assign_points_to_recalculated_centers(self, centers: List[List[int]]) -> dict:
+    def _query_spatial_index(self, centers: np.ndarray) -> np.ndarray:
         """
-        2nd part of k-means algorithm when we want to assign points again based on recalculated init points
-        :param centers: new calculated centers
-        :return: reassigned points to new clusters
+        method that finds the closest center for every point in kd-tree built over centers
+        :param centers: (k, d) array of current centers
+        :return: index of the closest center for every point
         """
-        center_dict = {center: [] for center in centers}
+        tree = KDTree(centers)
+        labels = tree.query(self.points)[0]
+        self.distances_computed += tree.distances_computed
+        return labels
+
+    def _assign_labels(self, centers: List[tuple]) -> List[int]:
+        """
+        python engine assignment that returns index of the closest center for every point
+        :param centers: current centers
+        :return: index of the closest center for every point
+        """
+        if self.spatial_index:
+            return self._query_spatial_index(np.array(centers)).tolist()
+        self.distances_computed += len(self.clusters) * len(centers)
+        labels = []
         for cluster in self.clusters:
-            distances = [distance(cluster, center) for center in centers]
-            min_index = distances.index(min(distances))
-            center_dict[tuple(centers[min_index])].append(cluster)
-        return center_dict
+            distances = [squared_distance(cluster, center) for center in centers]
+            labels.append(distances.index(min(distances)))
+        return labels
+
+    def _converged(self, old_centers: List[tuple] or np.ndarray, centers: List[tuple] or np.ndarray,
+                   labels_changed: bool, iteration: int) -> bool:
+        """
+        method that decides if one k-means restart can stop, it stops when no point changed its cluster, when no center
+        moved more than tolerance, when centers repeat or when max_iterations is reached
+        :param old_centers: centers before update
+        :param centers: centers after update
+        :param labels_changed: whether any point changed its cluster in last assignment
+        :param iteration: number of current iteration
+        :return: True if restart should stop
+        """
+        key = np.asarray(centers, dtype=np.float64).tobytes()
+        if not labels_changed or iteration >= self.max_iterations or self.already_assigned_center_points.get(key) \
+                or (len(old_centers) == len(centers) and center_shift(old_centers, centers) <= self.tolerance):
+            self.already_assigned_center_points.clear()
+            return True
+        self.already_assigned_center_points[key] = True
+        return False
+
+    def _run_python(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        one iteration of k-means algorithm implemented with raw python loops over points, centroids are kept as running
+        coordinate sums that are updated only for points that changed cluster
+        :return: index of assigned center for every point and final centers
+        """
+        if self.cluster_center == "m":
+            return self._run_python_medoids()
+        with self.profiler.phase("seeding"):
+            centers = [tuple(cluster) for cluster in self._choose_init_clusters()]
+        with self.profiler.phase("assignment"):
+            labels = self._assign_labels(centers)
+        with self.profiler.phase("update"):
+            sums, counts = cluster_sums(self.clusters, labels, self.k, self.weight_list)
+        iteration = 0
+        while True:
+            iteration += 1
+            self.iterations += 1
+            with self.profiler.phase("update"):
+                old_centers, centers = centers, centers_from_cluster_sums(sums, counts, centers,
+                                                                               integer_points(self.points))
+            with self.profiler.phase("assignment"):
+                old_labels, labels = labels, self._assign_labels(centers)
+            with self.profiler.phase("update"):
+                moved = move_cluster_sums(self.clusters, old_labels, labels, sums, counts, self.weight_list)
+            self.center_updates += len(centers)
+            self.profiler.iteration(algorithm="k-means", restart=self.restart, iteration=iteration, moved=moved)
+            if self._converged(old_centers, centers, moved > 0, iteration):
+                break
+        return np.array(labels), np.array(centers, dtype=np.float64)
+
+    def _run_python_medoids(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        one iteration of medoid k-means algorithm implemented with raw python loops, medoids are calculated again from
+        all points of cluster every iteration
+        :return: index of assigned medoid for every point and final medoids
+        """
+        with self.profiler.phase("seeding"):
+            calculated_center_points = [tuple(cluster) for cluster in self._choose_init_clusters()]
+        with self.profiler.phase("assignment"):
+            labels = self._assign_labels(calculated_center_points)
+        iteration = 0
+        while True:
+            iteration += 1
+            self.iterations += 1
+            old_center_points = calculated_center_points
+            with self.profiler.phase("update"):
+                calculated_center_points = self._calculate_center_points(labels, len(old_center_points))
+            with self.profiler.phase("assignment"):
+                old_labels, labels = labels, self._assign_labels(calculated_center_points)
+            labels_changed = old_labels != labels
+            self.center_updates += len(calculated_center_points)
+            self.profiler.iteration(algorithm="k-means", restart=self.restart, iteration=iteration,
+                                    labels_changed=labels_changed)
+            if self._converged(old_center_points, calculated_center_points, labels_changed, iteration):
+                break
+        return np.array(labels), np.array(calculated_center_points, dtype=np.float64)
+
+    def _run_vectorized(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        one iteration of k-means algorithm implemented with numpy engine, every assignment is one batched distance
+        calculation with argmin, centroids are kept as running coordinate sums and counts that are updated only for
+        points that changed cluster
+        :return: index of assigned center for every point and final centers
+        """
+        with self.profiler.phase("seeding"):
+            centers = self.points[self._choose_init_indexes()].astype(np.float64)
+        with self.profiler.phase("assignment"):
+            labels = self._assign_points_vectorized(centers)
+        with self.profiler.phase("update"):
+            sums, counts = centroid_sums(self.points, labels, self.k, self.weights)
+        iteration = 0
+        while True:
+            iteration += 1
+            self.iterations += 1
+            with self.profiler.phase("update"):
+                old_centers, centers = centers, centroids_from_sums(sums, counts, centers, integer_points(self.points))
+            with self.profiler.phase("assignment"):
+                old_labels, labels = labels, self._assign_points_vectorized(centers)
+            with self.profiler.phase("update"):
+                moved = move_centroid_sums(self.points, old_labels, labels, sums, counts, self.weights)
+            self.center_updates += len(centers)
+            self.profiler.iteration(algorithm="k-means", restart=self.restart, iteration=iteration, moved=moved)
+            if self._converged(old_centers, centers, moved > 0, iteration):
+                break
+        return labels, centers
+
+    def _create_medoid_engine(self) -> KMedoids:
+        """
+        method that creates k-medoids engine when it does not exist yet, its distance matrix is calculated only once
+        and shared by all restarts, with more workers it is shared with them through shared memory
+        :return: k-medoids engine
+        """
+        if self.medoid_engine is None:
+            with self.profiler.phase("distance_matrix"):
+                self.medoid_engine = KMedoids(self.points, weights=self.weights)
+            self.distances_computed += len(self.points) ** 2
+        return self.medoid_engine
+
+    def _run_medoids(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        one iteration of k-medoids algorithm implemented with numpy engine, medoids are improved by swaps evaluated on
+        distance matrix which is calculated only once and shared by all iterations
+        :return: index of assigned medoid for every point and final medoids
+        """
+        medoid_engine = self._create_medoid_engine()
+        with self.profiler.phase("seeding"):
+            init_medoids = self._choose_init_indexes()
+        with self.profiler.phase("iterations"):
+            labels, medoids = medoid_engine.run(init_medoids)
+        self.iterations += self.medoid_engine.iterations
+        self.center_updates += self.medoid_engine.swaps
+        return labels, self.points[medoids]
+
+    def _run_elkan(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        one iteration of k-means algorithm implemented with elkan engine, it follows the same loop as numpy engine but
+        most distances in later iterations are skipped by bounds
+        :return: index of assigned center for every point and final centers
+        """
+        if self.elkan_engine is None:
+            self.elkan_engine = ElkanKMeans(self.points, self.weights)
+        computed, skipped = self.elkan_engine.distances_computed, self.elkan_engine.distances_skipped
+        iterations = self.elkan_engine.iterations
+        with self.profiler.phase("seeding"):
+            init_clusters = self.points[self._choose_init_indexes()].astype(np.float64)
+        with self.profiler.phase("iterations"):
+            result = self.elkan_engine.run(init_clusters, self.tolerance, self.max_iterations)
+        self.distances_computed += self.elkan_engine.distances_computed - computed
+        self.distances_skipped += self.elkan_engine.distances_skipped - skipped
+        self.iterations += self.elkan_engine.iterations - iterations
+        self.center_updates += (self.elkan_engine.iterations - iterations) * self.k
+        return result
+
+    def _run_restart(self, restart: int) -> tuple[np.ndarray, np.ndarray, float]:
+        """
+        method that runs one restart of k-means algorithm with its own random generator, result is evaluated as soon as
+        restart finishes (in worker process when restarts run in parallel), so clusters are not evaluated again after
+        all restarts, centers without points are left out. Centroids are calculated again from final labels, medoids
+        are kept as engine returned them, because every point was assigned to its closest medoid
+        :param restart: number of restart
+        :return: index of assigned center for every point, centers calculated by center calculation and success rate
+        """
+        self.random = restart_random(restart)
+        self.restart = restart
+        if self.engine == "numpy" and self.cluster_center == "m":
+            result = self._run_medoids()
+        elif self.engine == "numpy":
+            result = self._run_vectorized()
+        elif self.engine == "elkan":
+            result = self._run_elkan()
+        else:
+            result = self._run_python()
+        with self.profiler.phase("evaluation"):
+            labels, centers = compact_labels(*result)
+            if self.cluster_center != "m":
+                centers = calculate_centers(self.points, labels, len(centers), self.cluster_center, self.weights)
+            return labels, centers, success_rate(self.points, labels, centers, self.weights)
+
+    def _run_restarts(self) -> None:
+        """
+        method that runs all restarts (K_MEANS_ITERATIONS by default), in worker processes when more workers are wanted,
+        and stores their labels, centers and success rates in final_clusters in order of restarts. Weights of points and
+        distance matrix of k-medoids engine are calculated once and shared with workers like points
+        """
+        if self.workers > 1:
+            warm_start = None if self.warm_start is None else tuple(map(tuple, self.warm_start.tolist()))
+            distances = self._create_medoid_engine().distances \
+                if self.engine == "numpy" and self.cluster_center == "m" else None
+            configuration = (self.k, self.cluster_center, self.engine, self.init, self.tolerance, self.max_iterations,
+                             self.spatial_index, warm_start, self.profiler.enabled)
+            with RestartExecutor(self.points, self.workers, weights=self.weights, distances=distances) as executor:
+                worker_results = executor.map(_run_restart, [(configuration, i) for i in range(self.restarts)])
+            results = []
+            for result, counters, report in worker_results:
+                results.append(result)
+                computed, skipped, iterations, center_updates = counters
+                self.distances_computed += computed
+                self.distances_skipped += skipped
+                self.iterations += iterations
+                self.center_updates += center_updates
+                self.profiler.merge(report)
+        else:
+            results = [self._run_restart(i) for i in range(self.restarts)]
+
+        self.final_clusters = results
 
-    def _select_best_variance(self) -> dict:
+    def _select_best_variance(self) -> int:
         """
         method that is called when cluster success rate is 0, it selects best variance out of generated clusters,
         we repeat the whole k-means process n times  and then based on variance we select the best one. Best variance
         means that generated k clusters have the most evenly split number of points in all clusters
-        :return: best variance of k-means algorithm
+        :return: index of restart with the best variance
         """
-        variances = []
-        total_length = len(self.clusters)
-        for final_cluster in self.final_clusters:
-            variance = 1
-            for values in final_cluster.values():
-                variance = variance * (len(values) / total_length)
-            variances.append(variance)
-        max_variance_index = variances.index(max(variances))
-        return self.final_clusters[max_variance_index]
+        variances = [size_balance(labels, len(centers), self.weights) for labels, centers, _ in self.final_clusters]
+        return variances.index(max(variances))
 
-    def _select_best_cluster(self) -> dict:
+    def _select_best_cluster(self) -> int:
         """
         method that finds best clusters from generated clusters, cluster success rate is determined by calculating its
         average distance from middle. It average distance is greater than 500 it is classified as unsuccessfully
-        otherwise it is successful
-        """
-        success_rate_list = []
-        for clusters in self.final_clusters:
-            good_clusters = 0
-            for cluster in clusters.values():
-                center = self.center_calculator(cluster)
-                sum_of_distances = 0
-                for points in cluster:
-                    sum_of_distances += distance(points, center)
-                if sum_of_distances / len(cluster) <= 500:
-                    good_clusters += 1
-            cluster_success_rate = good_clusters / len(clusters) * 100
-            success_rate_list.append(cluster_success_rate)
+        otherwise it is successful, success rates were already calculated when restarts finished
+        :return: index of the best restart
+        """
+        success_rate_list = [cluster_success_rate for _, _, cluster_success_rate in self.final_clusters]
         max_success_rate_index = success_rate_list.index(max(success_rate_list))
+        self.final_clusters_success_rate = success_rate_list[max_success_rate_index]
         if max_success_rate_index == 0:
-            self.final_clusters_success_rate = success_rate_list[max_success_rate_index]
             return self._select_best_variance()
+        return max_success_rate_index
 
-        else:
-            self.final_clusters_success_rate = success_rate_list[max_success_rate_index]
-            return self.final_clusters[max_success_rate_index]
+    def _count_profiler_totals(self) -> None:
+        """
+        method that adds totals of counters collected during run to profiler
+        """
+        self.profiler.count("restarts", self.restarts)
+        self.profiler.count("iterations", self.iterations)
+        self.profiler.count("distances", self.distances_computed)
+        self.profiler.count("distances_skipped", self.distances_skipped)
+        self.profiler.count("center_updates", self.center_updates)
 
     def _console_print(self) -> None:
         """
@@ -132,35 +411,77 @@ class KMeans:
             print(f"Center calculation: centroid")
         print(f"Time to calculate clusters : {self.stop_time - self.start_time} seconds")
         print(f"Cluster success rate {self.final_clusters_success_rate} %")
+        if self.engine == "elkan":
+            print(f"Distances computed: {self.distances_computed}, skipped: {self.distances_skipped}")
 
-    def run(self) -> None:
+    def fit(self) -> ClusteringResult:
         """
-        main method of k-means algorithm, it contains the basic logic of k-means pseudo code and at the end it also
-        generates graphic plot for best selected k-means iteration
+        method that runs all restarts of k-means, selects the best one and returns it without console output and plot,
+        time is measured from start of this method so setup of object is not included
+        :return: labels, centers, inertia, success rate, time and counters of the best restart
         """
+        self.start_time = timeit.default_timer()
+        self.final_clusters = []
+        self._run_restarts()
+        with self.profiler.phase("evaluation"):
+            best = self._select_best_cluster()
+        labels, centers, _ = self.final_clusters[best]
+        self.stop_time = timeit.default_timer()
+        self._count_profiler_totals()
+        self.result = ClusteringResult(labels, centers, inertia(self.points, labels, centers, self.weights),
+                                       self.final_clusters_success_rate, self.stop_time - self.start_time,
+                                       self.iterations, self.distances_computed)
+        return self.result
 
-        for i in range(K_MEANS_ITERATIONS):
-            init_clusters = self._choose_init_clusters()
-            assigned_points = self._assign_points_to_init_clusters(init_clusters)
-            while True:
-                calculated_center_points = self._calculate_center_points(assigned_points)
-                assigned_points = self._assign_points_to_recalculated_centers(calculated_center_points)
-                if self.already_assigned_center_points.get(tuple(calculated_center_points)):
-                    break
-                self.already_assigned_center_points[tuple(calculated_center_points)] = True
+    def run(self, plot_mode: str = "show", plot_path: str = PLOT_PATH) -> ClusteringResult:
+        """
+        main method of k-means algorithm, it fits clusters, prints statistics and at the end it also generates graphic
+        plot for best selected k-means iteration
+        :param plot_mode: show, save or off
+        :param plot_path: png file used when plot is saved
+        :return: result of fit
+        """
+        result = self.fit()
+        self._console_print()
+        with self.profiler.phase("plotting"):
+            plot_clusters(self.points, result.labels, plot_mode, plot_path)
+        return result
 
-            self.final_clusters.append(assigned_points)
-            self.already_assigned_center_points.clear()
 
-        best_variance = self._select_best_cluster()
-        self.stop_time = timeit.default_timer()
+_worker_k_means: dict = {}
 
-        self._console_print()
 
-        color_counter = 0
-        for values in best_variance.values():
-            if color_counter == len(COLORS):
-                color_counter = 0
-            plot.scatter([x[0] for x in values], [x[1] for x in values])
-            color_counter += 1
-        plot.show()
+def _run_restart(points: np.ndarray, arguments: tuple[tuple, int], weights: np.ndarray = None,
+                 distances: np.ndarray = None) -> tuple[dict or tuple, tuple, dict]:
+    """
+    function that runs one k-means restart in worker process of RestartExecutor, k-means object is kept between
+    restarts of the same configuration, k-medoids engine uses shared distance matrix, so it is not calculated again in
+    worker
+    :param points: shared points
+    :param arguments: k-means configuration (k, center calculation, engine, init, tolerance, max iterations, spatial
+    index, warm start centers, profiling) and number of restart
+    :param weights: shared weights of points or None
+    :param distances: shared distance matrix of k-medoids engine or None
+    :return: result of the restart, its counters (computed and skipped distances, iterations, center updates) and
+    profiler report with phase times
+    """
+    configuration, restart = arguments
+    if configuration not in _worker_k_means:
+        _worker_k_means.clear()
+        num_of_clusters, cluster_center, engine, init, tolerance, max_iterations, spatial_index, warm_start, _ = \
+            configuration
+        k_means = KMeans(points, num_of_clusters, cluster_center, engine, init=init, tolerance=tolerance,
+                         max_iterations=max_iterations, spatial_index=spatial_index, warm_start=warm_start,
+                         weights=weights)
+        if distances is not None:
+            k_means.medoid_engine = KMedoids(k_means.points, distances, weights=k_means.weights)
+        _worker_k_means[configuration] = k_means
+    k_means = _worker_k_means[configuration]
+    k_means.profiler = Profiler() if configuration[-1] else NULL_PROFILER
+    k_means.distances_computed = 0
+    k_means.distances_skipped = 0
+    k_means.iterations = 0
+    k_means.center_updates = 0
+    result = k_means._run_restart(restart)
+    counters = (k_means.distances_computed, k_means.distances_skipped, k_means.iterations, k_means.center_updates)
+    return result, counters, k_means.profiler.report()
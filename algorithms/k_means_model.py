@@ -0,0 +1,177 @@
+import numpy as np
+
+from algorithms.k_means import KMeans
+from helpers.consts import MODEL_DRIFT_THRESHOLD, MODEL_DRIFT_WINDOW, MODEL_RESERVOIR_SIZE, RANDOM_SEED, \
+    K_MEANS_ITERATIONS
+from helpers.measurements import nearest_centers, update_running_means, as_points
+
+
+class KMeansModel:
+    """
+    class that keeps fitted k-means as centers and number of points of every center, so new points can be labeled by
+    predict and centers can follow arriving points by partial_fit without old points. Every center is running mean of
+    points assigned to it. Drift is relative growth of mean squared distance of new points to their centers compared
+    to the fit, when it crosses threshold after at least MODEL_DRIFT_WINDOW new points, k-means is fitted again on
+    uniform reservoir sample of all seen points
+    """
+    centers: np.ndarray
+    counts: np.ndarray
+    reservoir: np.ndarray
+    num_of_seen: int
+    reference_cost: float
+    drift_sum: float
+    drift_count: int
+    refits: int
+
+    def __init__(self, centers: np.ndarray, counts: np.ndarray, reservoir: np.ndarray, num_of_seen: int,
+                 reference_cost: float, cluster_center: str = "c", engine: str = "numpy", init: str = "random",
+                 restarts: int = K_MEANS_ITERATIONS, drift_threshold: float = MODEL_DRIFT_THRESHOLD,
+                 reservoir_size: int = MODEL_RESERVOIR_SIZE) -> None:
+        """
+        only centroid models are supported, running means of partial_fit would move medoids off data points
+        :param centers: (k, d) array of centers
+        :param counts: (k,) number of points of every center
+        :param reservoir: (m, d) uniform sample of seen points, m <= reservoir_size, it keeps data type of points
+        :param num_of_seen: number of points model has seen
+        :param reference_cost: mean squared distance of points to their centers when model was fitted
+        :param cluster_center: center calculation of k-means that is used to fit model again, only c
+        :param engine: engine of k-means that is used to fit model again
+        :param init: init strategy of k-means that is used to fit model again
+        :param restarts: number of restarts of k-means that is used to fit model again
+        :param drift_threshold: relative growth of mean squared distance after which model is fitted again
+        :param reservoir_size: maximal number of points kept for fitting again
+        """
+        if cluster_center != "c":
+            raise ValueError("model can be created only from centroid k-means (cluster_center c)")
+        self.counts = np.array(counts, dtype=np.int64)
+        self.centers = np.array(centers, dtype=np.float64).reshape(len(self.counts), -1)
+        self.reservoir = np.array(as_points(reservoir)).reshape(-1, self.centers.shape[1])
+        self.num_of_seen = num_of_seen
+        self.reference_cost = reference_cost
+        self.cluster_center = cluster_center
+        self.engine = engine
+        self.init = init
+        self.restarts = restarts
+        self.drift_threshold = drift_threshold
+        self.reservoir_size = reservoir_size
+        self.random = np.random.default_rng(int(RANDOM_SEED) + num_of_seen)
+        self.drift_sum = 0.0
+        self.drift_count = 0
+        self.refits = 0
+
+    @staticmethod
+    def from_k_means(k_means: KMeans, drift_threshold: float = MODEL_DRIFT_THRESHOLD,
+                     reservoir_size: int = MODEL_RESERVOIR_SIZE) -> "KMeansModel":
+        """
+        method that creates model from fitted centroid k-means, counts are sizes of its clusters
+        :param k_means: k-means after fit
+        :param drift_threshold: relative growth of mean squared distance after which model is fitted again
+        :param reservoir_size: maximal number of points kept for fitting again
+        :return: model of k-means
+        """
+        result = k_means.result
+        random = np.random.default_rng(int(RANDOM_SEED))
+        sample = k_means.points if len(k_means.points) <= reservoir_size else \
+            k_means.points[np.sort(random.choice(len(k_means.points), reservoir_size, replace=False))]
+        return KMeansModel(result.centers, np.bincount(result.labels, minlength=len(result.centers)), sample,
+                           len(k_means.points), result.inertia / len(k_means.points), k_means.cluster_center,
+                           k_means.engine, k_means.init, k_means.restarts, drift_threshold, reservoir_size)
+
+    @property
+    def drift(self) -> float:
+        """
+        :return: relative growth of mean squared distance of points seen since fit, 0 when no point arrived
+        """
+        if self.drift_count == 0 or self.reference_cost == 0:
+            return 0.0
+        return self.drift_sum / self.drift_count / self.reference_cost - 1
+
+    def predict(self, points: np.ndarray) -> np.ndarray:
+        """
+        method that assigns every point to its closest center, squared distances are calculated in blocks
+        :param points: (n, d) array of points
+        :return: (n,) index of the closest center
+        """
+        return nearest_centers(np.asarray(points).reshape(-1, self.centers.shape[1]), self.centers)[0]
+
+    def partial_fit(self, points: np.ndarray) -> bool:
+        """
+        method that moves centers with new batch of points, points are added to reservoir and their squared distances
+        to centers before update are added to drift. When drift of at least MODEL_DRIFT_WINDOW points crosses threshold
+        k-means is fitted again
+        :param points: (m, d) array of new points, they are converted to data type of reservoir
+        :return: True when model was fitted again
+        """
+        points = np.ascontiguousarray(points, dtype=self.reservoir.dtype).reshape(-1, self.centers.shape[1])
+        if len(points) == 0:
+            return False
+        labels, closest = nearest_centers(points, self.centers)
+        self.counts = update_running_means(self.centers, self.counts, points, labels)
+        self.drift_sum += float(closest.sum())
+        self.drift_count += len(points)
+        self._sample(points)
+        if self.drift_count >= MODEL_DRIFT_WINDOW and self.drift > self.drift_threshold:
+            self.refit()
+            return True
+        return False
+
+    def _sample(self, points: np.ndarray) -> None:
+        """
+        method that keeps reservoir uniform sample of all seen points (algorithm R), point number t replaces random
+        slot with probability reservoir_size / (t + 1)
+        :param points: (m, d) array of new points
+        """
+        free = min(self.reservoir_size - len(self.reservoir), len(points))
+        if free > 0:
+            self.reservoir = np.concatenate([self.reservoir, points[:free]])
+        slots = self.random.integers(0, self.num_of_seen + np.arange(free, len(points)) + 1)
+        accepted = slots < self.reservoir_size
+        self.reservoir[slots[accepted]] = points[free:][accepted]
+        self.num_of_seen += len(points)
+
+    def refit(self) -> None:
+        """
+        method that fits k-means again on reservoir, first restart starts from current centers. Counts are sizes of
+        clusters of reservoir scaled to all seen points and drift starts again from 0, centers are kept when new
+        clustering has fewer than k clusters
+        """
+        k_means = KMeans(self.reservoir, len(self.centers), self.cluster_center, self.engine, init=self.init,
+                         restarts=self.restarts, warm_start=self.centers)
+        result = k_means.fit()
+        if len(result.centers) == len(self.centers):
+            sizes = np.bincount(result.labels, minlength=len(self.centers))
+            self.centers = result.centers.astype(np.float64)
+            self.counts = np.round(sizes * self.num_of_seen / len(self.reservoir)).astype(np.int64)
+            self.reference_cost = result.inertia / len(self.reservoir)
+        self.drift_sum = 0.0
+        self.drift_count = 0
+        self.refits += 1
+
+    def save(self, path: str) -> None:
+        """
+        method that writes model to .npz file
+        :param path: path to file
+        """
+        with open(path, "wb") as file:
+            np.savez(file, centers=self.centers, counts=self.counts, reservoir=self.reservoir,
+                     stats=np.array([self.num_of_seen, self.reference_cost, self.drift_sum, self.drift_count,
+                                     self.restarts, self.drift_threshold, self.reservoir_size], dtype=np.float64),
+                     options=np.array([self.cluster_center, self.engine, self.init]))
+
+    @staticmethod
+    def load(path: str) -> "KMeansModel":
+        """
+        method that reads model saved by save method
+        :param path: path to .npz file
+        :return: loaded model
+        """
+        with np.load(path) as stored:
+            num_of_seen, reference_cost, drift_sum, drift_count, restarts, drift_threshold, reservoir_size = \
+                stored["stats"].tolist()
+            cluster_center, engine, init = stored["options"].tolist()
+            model = KMeansModel(stored["centers"], stored["counts"], stored["reservoir"], int(num_of_seen),
+                                reference_cost, cluster_center, engine, init, int(restarts), drift_threshold,
+                                int(reservoir_size))
+        model.drift_sum = drift_sum
+        model.drift_count = int(drift_count)
+        return model
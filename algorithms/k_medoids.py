@@ -0,0 +1,154 @@
+import numpy as np
+
+from helpers.measurements import pairwise_distances
+
+IMPROVEMENT_TOLERANCE = 1e-6
+
+
+class KMedoids:
+    """
+    class that implements k-medoids engine with PAM swap step evaluated the FastPAM way. Distance matrix between points
+    is calculated only once, medoids are first moved inside their clusters and then every swap step evaluates costs of
+    all (medoid, candidate) swaps at once from distances to the nearest and second nearest medoid of every point
+    """
+    swaps: int
+    iterations: int
+
+    def __init__(self, points: np.ndarray, distances: np.ndarray = None, block_size: int = 128,
+                 weights: np.ndarray = None) -> None:
+        """
+        distance matrix can be passed in so it can be shared between restarts
+        :param points: (n, d) array of point coordinates
+        :param distances: precalculated (n, n) distance matrix
+        :param block_size: number of swap candidates evaluated at once
+        :param weights: (n,) weight of every point, deviation is weighted sum of distances, None means weight 1
+        """
+        self.points = points
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float32)
+        self.distances = pairwise_distances(points) if distances is None else distances
+        self.block_size = block_size
+        self.swaps = 0
+        self.iterations = 0
+
+    def _nearest_medoids(self, medoids: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        method that finds nearest and second nearest medoid for every point
+        :param medoids: indexes of current medoids
+        :return: index of nearest medoid, distance to it and distance to second nearest medoid for every point
+        """
+        medoid_distances = self.distances[:, medoids]
+        if len(medoids) == 1:
+            return (np.zeros(len(self.points), dtype=np.int64), medoid_distances[:, 0],
+                    np.full(len(self.points), np.inf, dtype=np.float32))
+        closest_two = np.argpartition(medoid_distances, 1, axis=1)[:, :2]
+        closest_distances = np.take_along_axis(medoid_distances, closest_two, axis=1)
+        swap_order = closest_distances[:, 1] < closest_distances[:, 0]
+        closest_two[swap_order] = closest_two[swap_order][:, ::-1]
+        closest_distances.sort(axis=1)
+        return closest_two[:, 0], closest_distances[:, 0], closest_distances[:, 1]
+
+    def _total_deviation(self, medoids: np.ndarray) -> float:
+        """
+        method that calculates sum of distances from every point to its nearest medoid
+        :param medoids: indexes of medoids
+        :return: total deviation
+        """
+        closest = self.distances[:, medoids].min(axis=1)
+        if self.weights is not None:
+            return float(closest @ self.weights.astype(np.float64))
+        return float(closest.sum(dtype=np.float64))
+
+    def _membership(self, labels: np.ndarray, k: int) -> np.ndarray:
+        """
+        method that creates one hot matrix of cluster membership, so sums over clusters can be done by matrix product,
+        with weights the one is replaced by weight of point
+        :param labels: index of nearest medoid for every point
+        :param k: number of medoids
+        :return: (n, k) float32 matrix with 1 (or weight) at [point, its medoid]
+        """
+        membership = np.zeros((len(self.points), k), dtype=np.float32)
+        membership[np.arange(len(self.points)), labels] = 1 if self.weights is None else self.weights
+        return membership
+
+    def _update_medoids_in_clusters(self, medoids: np.ndarray) -> np.ndarray:
+        """
+        method that moves every medoid to the point of its cluster with the smallest sum of distances to other points
+        in the cluster, sums for all clusters are one matrix product and it is repeated until no medoid moves (or
+        more than n times, in case ties make medoids cycle)
+        :param medoids: indexes of current medoids
+        :return: indexes of updated medoids
+        """
+        for _ in range(len(self.points)):
+            labels = self._nearest_medoids(medoids)[0]
+            membership = self._membership(labels, len(medoids))
+            cluster_sums = self.distances @ membership
+            cluster_sums[membership == 0] = np.inf
+            new_medoids = np.argmin(cluster_sums, axis=0)
+            if np.array_equal(new_medoids, medoids):
+                break
+            medoids = new_medoids
+        return medoids
+
+    def _swap_costs(self, medoids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        method that evaluates change of total deviation for every swap of medoid with non medoid point, when medoid j is
+        replaced by candidate x, points of medoid j move to min(second nearest, x) and other points to min(nearest, x)
+        :param medoids: indexes of current medoids
+        :return: the lowest cost change for every medoid position and candidate point that achieves it
+        """
+        labels, nearest, second = self._nearest_medoids(medoids)
+        membership = self._membership(labels, len(medoids))
+
+        best_costs = np.full(len(medoids), np.inf)
+        best_candidates = np.full(len(medoids), -1, dtype=np.int64)
+        for start in range(0, len(self.points), self.block_size):
+            candidate_distances = self.distances[start:start + self.block_size]
+            closer_than_nearest = np.minimum(candidate_distances, nearest)
+            if self.weights is None:
+                shared_cost = (closer_than_nearest - nearest).sum(axis=1, dtype=np.float64)
+            else:
+                shared_cost = (closer_than_nearest - nearest) @ self.weights
+            removal_cost = (np.minimum(candidate_distances, second) - closer_than_nearest) @ membership
+            costs = shared_cost[:, np.newaxis] + removal_cost
+            is_medoid = (medoids >= start) & (medoids < start + len(candidate_distances))
+            costs[medoids[is_medoid] - start] = np.inf
+
+            block_candidates = np.argmin(costs, axis=0)
+            block_costs = costs[block_candidates, np.arange(len(medoids))]
+            better = block_costs < best_costs
+            best_costs[better] = block_costs[better]
+            best_candidates[better] = start + block_candidates[better]
+        return best_costs, best_candidates
+
+    def run(self, init_medoids: np.ndarray, max_swaps: int = 1000) -> tuple[np.ndarray, np.ndarray]:
+        """
+        main method of k-medoids engine, after medoids are moved inside their clusters it keeps applying the best swaps
+        until no swap lowers total deviation. Like in FastPAM2 more swaps can be applied after one evaluation, every one
+        of them is accepted only if exact total deviation decreases
+        :param init_medoids: indexes of points that are used as initial medoids
+        :param max_swaps: upper bound of swaps
+        :return: index of nearest medoid for every point and indexes of final medoids
+        """
+        medoids = self._update_medoids_in_clusters(np.array(init_medoids, dtype=np.int64))
+        deviation = self._total_deviation(medoids)
+        self.swaps = 0
+        self.iterations = 0
+        while self.swaps < max_swaps:
+            self.iterations += 1
+            costs, candidates = self._swap_costs(medoids)
+            swapped = False
+            for position in np.argsort(costs):
+                if costs[position] >= -IMPROVEMENT_TOLERANCE or self.swaps == max_swaps:
+                    break
+                if candidates[position] in medoids:
+                    continue
+                trial_medoids = medoids.copy()
+                trial_medoids[position] = candidates[position]
+                trial_deviation = self._total_deviation(trial_medoids)
+                if trial_deviation < deviation - IMPROVEMENT_TOLERANCE:
+                    medoids, deviation = trial_medoids, trial_deviation
+                    self.swaps += 1
+                    swapped = True
+            if not swapped:
+                break
+        return self._nearest_medoids(medoids)[0], medoids
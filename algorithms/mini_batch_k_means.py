@@ -0,0 +1,162 @@
+import timeit
+from typing import Iterator
+
+import numpy as np
+
+from algorithms.k_means import KMeans
+from helpers.consts import MINI_BATCH_SIZE, MINI_BATCH_PASSES, SUCCESS_DISTANCE, PLOT_PATH
+from helpers.measurements import nearest_centers, update_running_means
+from helpers.plotting import plot_clusters
+from helpers.point_io import read_point_chunks, write_labels
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result import ClusteringResult
+
+
+class MiniBatchKMeans(KMeans):
+    """
+    class that implements streaming mini-batch k-means on top of k-means algorithm. Points are read from file in chunks
+    and centroids are updated after every chunk as running means with per center counts, so memory depends only on
+    batch size and k, not on number of points in file
+    """
+    centers: np.ndarray
+    counts: np.ndarray
+
+    def __init__(self, input_path: str, num_of_clusters: int, output_path: str, batch_size: int = MINI_BATCH_SIZE,
+                 passes: int = MINI_BATCH_PASSES, profiler: Profiler = NULL_PROFILER, dtype: str = "int32",
+                 dimensions: int = 2) -> None:
+        """
+        mini-batch k-means always uses centroid calculation and numpy engine
+        :param input_path: csv or binary file with points
+        :param num_of_clusters: number of clusters
+        :param output_path: file where final labels are written
+        :param batch_size: number of points read and processed at once
+        :param passes: how many times centroids are updated over whole file
+        :param profiler: profiler that collects phase times, counters and callback for every pass
+        :param dtype: data type of raw binary input file
+        :param dimensions: number of coordinates of every point in raw binary input file
+        """
+        super().__init__([], num_of_clusters, "c", "numpy", restarts=1, profiler=profiler)
+        self.input_path = input_path
+        self.output_path = output_path
+        self.batch_size = batch_size
+        self.passes = passes
+        self.dtype = np.dtype(dtype)
+        self.dimensions = dimensions
+        self.num_of_points = 0
+
+    def _batches(self) -> Iterator[np.ndarray]:
+        """
+        method that streams points from input file
+        :return: iterator of point batches
+        """
+        return read_point_chunks(self.input_path, self.batch_size, self.dtype, self.dimensions)
+
+    def _closest_centers(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        method that assigns batch of points to the closest centers
+        :param points: batch of points
+        :return: index of the closest center and distance to it for every point
+        """
+        self.distances_computed += len(points) * self.k
+        labels, closest = nearest_centers(points, self.centers)
+        return labels, np.sqrt(closest)
+
+    def _choose_init_centers(self) -> None:
+        """
+        method that selects k random points from the beginning of the file as initial centers, batches are read until
+        there are at least k points
+        """
+        init_points = []
+        num_of_init_points = 0
+        for batch in self._batches():
+            init_points.append(batch)
+            num_of_init_points += len(batch)
+            if num_of_init_points >= self.k:
+                break
+        if num_of_init_points < self.k:
+            raise ValueError(f"input file has only {num_of_init_points} points, {self.k} clusters can not be created")
+        init_points = np.concatenate(init_points)
+        self.centers = init_points[self.random.sample(range(len(init_points)), self.k)].astype(np.float64)
+        self.counts = np.zeros(self.k, dtype=np.int64)
+
+    def _update_centers(self, points: np.ndarray) -> None:
+        """
+        method that moves centers with one batch, every center becomes mean of all points that were assigned to it so
+        far, which is calculated from its previous position, its count and grouped sum of batch
+        :param points: batch of points
+        """
+        labels = self._closest_centers(points)[0]
+        self.counts = update_running_means(self.centers, self.counts, points, labels)
+
+    def _label_batches(self, distance_sums: np.ndarray, squared_sums: np.ndarray, cluster_sizes: np.ndarray) \
+            -> Iterator[np.ndarray]:
+        """
+        final streamed pass that assigns every point to its closest center, distances to centers are summed on the way
+        so success rate and inertia can be calculated without second pass
+        :param distance_sums: sum of distances to center for every cluster, it is filled during the pass
+        :param squared_sums: sum of squared distances to center for every cluster, it is filled during the pass
+        :param cluster_sizes: number of points in every cluster, it is filled during the pass
+        :return: iterator of label batches
+        """
+        self.num_of_points = 0
+        for batch in self._batches():
+            labels, distances = self._closest_centers(batch)
+            distance_sums += np.bincount(labels, weights=distances, minlength=self.k)
+            squared_sums += np.bincount(labels, weights=distances * distances, minlength=self.k)
+            cluster_sizes += np.bincount(labels, minlength=self.k)
+            self.num_of_points += len(batch)
+            yield labels
+
+    def _console_print(self) -> None:
+        """
+        method that prints info to console
+        """
+        super()._console_print()
+        print(f"Labels of {self.num_of_points} points written to {self.output_path}")
+
+    def fit(self) -> ClusteringResult:
+        """
+        method that streams input file passes times to update centers and then streams it once more to write labels to
+        output file, labels are not kept in memory, so they are not part of result
+        :return: centers, inertia, success rate, time and counters of mini-batch k-means
+        """
+        self.start_time = timeit.default_timer()
+        with self.profiler.phase("seeding"):
+            self._choose_init_centers()
+        for iteration in range(self.passes):
+            with self.profiler.phase("update"):
+                for batch in self._batches():
+                    self._update_centers(batch)
+            self.iterations += 1
+            self.center_updates += self.k
+            self.profiler.iteration(algorithm="mini-batch k-means", restart=0, iteration=iteration + 1)
+
+        distance_sums = np.zeros(self.k)
+        squared_sums = np.zeros(self.k)
+        cluster_sizes = np.zeros(self.k, dtype=np.int64)
+        with self.profiler.phase("assignment"):
+            write_labels(self.output_path, self._label_batches(distance_sums, squared_sums, cluster_sizes))
+        not_empty = cluster_sizes > 0
+        good_clusters = np.count_nonzero(distance_sums[not_empty] / cluster_sizes[not_empty] <= SUCCESS_DISTANCE)
+        self.final_clusters_success_rate = good_clusters / np.count_nonzero(not_empty) * 100
+        self.stop_time = timeit.default_timer()
+        self._count_profiler_totals()
+        self.result = ClusteringResult(None, self.centers, float(squared_sums.sum()), self.final_clusters_success_rate,
+                                       self.stop_time - self.start_time, self.iterations, self.distances_computed)
+        return self.result
+
+    def run(self, plot_mode: str = "show", plot_path: str = PLOT_PATH) -> ClusteringResult:
+        """
+        main method of mini-batch k-means, it fits centers, prints statistics and plots clusters like other algorithms,
+        labels are not kept in memory, so only first batch of file is labeled again and plotted
+        :param plot_mode: show, save or off
+        :param plot_path: png file used when plot is saved
+        :return: result of fit
+        """
+        result = self.fit()
+        self._console_print()
+        with self.profiler.phase("plotting"):
+            if plot_mode != "off":
+                points = next(self._batches())
+                plot_clusters(points, nearest_centers(points, self.centers)[0], plot_mode, plot_path)
+        return result
@@ -0,0 +1,60 @@
+import argparse
+import sys
+
+from helpers.benchmark import run_benchmark, save_results, load_results, compare_results
+from helpers.consts import RANDOM_SEED, NUM_OF_POINTS, ENGINES, BENCHMARK_K, BENCHMARK_REPEATS, BENCHMARK_THRESHOLD
+
+
+def main() -> int:
+    """
+    main function of benchmark, it sweeps algorithms, engines, k, number of points and generator seeds, writes results
+    to json file and optionally compares them with saved baseline
+    :return: exit code, 1 when regression was found
+    """
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-a", "--algorithms", nargs="+", default=["c", "m", "d", "a"],
+                    help="algorithms to benchmark (c, m, d, a)")
+    ap.add_argument("-e", "--engines", nargs="+", default=["numpy"],
+                    help=f"engines of k-means and agglomerative ({', '.join(ENGINES)})")
+    ap.add_argument("-k", "--clusters", nargs="+", type=int, default=BENCHMARK_K, help="numbers of clusters")
+    ap.add_argument("-n", "--points", nargs="+", type=int, default=[NUM_OF_POINTS], help="numbers of generated points")
+    ap.add_argument("-s", "--seeds", nargs="+", default=[RANDOM_SEED], help="seeds of point generator")
+    ap.add_argument("-r", "--repeats", type=int, default=BENCHMARK_REPEATS, help="measured runs of every configuration")
+    ap.add_argument("-o", "--output", default="benchmark.json", help="json file where results are written")
+    ap.add_argument("--compare", help="json file with baseline results that new results are compared with")
+    ap.add_argument("--input", help="compare already saved results from this file instead of running benchmark")
+    ap.add_argument("--threshold", type=float, default=BENCHMARK_THRESHOLD,
+                    help="allowed relative growth of time and memory before it is reported as regression")
+    args = vars(ap.parse_args())
+    if any(algorithm not in ['c', 'm', 'd', 'a'] for algorithm in args["algorithms"]):
+        print("Select valid arguments -a (c, m, d, a)")
+        return 2
+    if any(engine not in ENGINES for engine in args["engines"]):
+        print(f"Select valid arguments -e ({', '.join(ENGINES)})")
+        return 2
+    if min(args["clusters"]) < 1 or min(args["points"]) < 1 or args["repeats"] < 1 or args["threshold"] < 0:
+        print("Arguments -k, -n and -r must be positive and --threshold can not be negative")
+        return 2
+    if args["input"] and not args["compare"]:
+        print("Argument --input needs --compare")
+        return 2
+
+    if args["input"]:
+        results = load_results(args["input"])
+    else:
+        results = run_benchmark(args["algorithms"], args["engines"], args["clusters"], args["points"], args["seeds"],
+                                args["repeats"])
+        save_results(args["output"], results)
+        print(f"Results written to {args['output']}")
+
+    if args["compare"]:
+        regressions = compare_results(load_results(args["compare"]), results, args["threshold"])
+        for regression in regressions:
+            print(f"Regression {regression}")
+        print(f"{len(regressions)} regressions against {args['compare']}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import json
+import platform
+import statistics
+import timeit
+import tracemalloc
+from typing import List, Iterator
+
+import numpy as np
+
+from algorithms.agglomerative_clustering import AgglomerativeClustering
+from algorithms.divisive_clustering import DivisiveClustering
+from algorithms.k_means import KMeans
+from helpers.consts import NUM_OF_SEED_POINTS
+from helpers.generator import Generator
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result import ClusteringResult
+
+BENCHMARK_FORMAT = 1
+CASE_KEYS = ("algorithm", "engine", "k", "points", "seed")
+
+
+def _create_algorithm(algorithm: str, engine: str, k: int, points: List[List[int]], profiler: Profiler) \
+        -> KMeans or AgglomerativeClustering or DivisiveClustering:
+    """
+    function that creates clustering algorithm the same way as main.py does
+    :param algorithm: c, m, d or a
+    :param engine: engine of k-means and agglomerative
+    :param k: number of clusters
+    :param points: generated points
+    :param profiler: profiler passed to algorithm
+    :return: algorithm ready to run
+    """
+    if algorithm == "c" or algorithm == "m":
+        return KMeans(points, k, algorithm, engine, profiler=profiler)
+    elif algorithm == "a":
+        return AgglomerativeClustering(points, k, algorithm, engine, profiler=profiler)
+    return DivisiveClustering(points, k, algorithm, profiler=profiler)
+
+
+def _fit(algorithm: str, engine: str, k: int, points: List[List[int]], profiler: Profiler = NULL_PROFILER) \
+        -> ClusteringResult:
+    """
+    function that creates algorithm and fits it, fit does not print or plot anything
+    :param algorithm: c, m, d or a
+    :param engine: engine of k-means and agglomerative
+    :param k: number of clusters
+    :param points: generated points
+    :param profiler: profiler passed to algorithm
+    :return: result of algorithm
+    """
+    return _create_algorithm(algorithm, engine, k, points, profiler).fit()
+
+
+def run_case(algorithm: str, engine: str, k: int, num_of_points: int, seed: str, repeats: int) -> dict:
+    """
+    function that benchmarks one configuration, points are generated once and are not part of measured time, sizes
+    smaller than NUM_OF_SEED_POINTS are generated only from seed points (main.py requires seeds <= points, otherwise
+    generator never finishes). Time is measured over repeats runs without tracing and peak memory in one extra run
+    traced by tracemalloc, because tracing slows python code down. Phase times are taken from profiler of the last
+    measured run
+    :param algorithm: c, m, d or a
+    :param engine: engine of k-means and agglomerative
+    :param k: number of clusters
+    :param num_of_points: number of generated points
+    :param seed: seed of generator
+    :param repeats: number of measured runs
+    :return: dictionary with measured statistics
+    """
+    points = Generator(num_of_points, min(NUM_OF_SEED_POINTS, num_of_points), seed=seed).generate_points()
+    times = []
+    result = None
+    profiler = None
+    for _ in range(repeats):
+        profiler = Profiler()
+        start = timeit.default_timer()
+        result = _fit(algorithm, engine, k, points, profiler)
+        times.append(timeit.default_timer() - start)
+
+    tracemalloc.start()
+    _fit(algorithm, engine, k, points)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm, "engine": engine, "k": k, "points": num_of_points, "seed": seed, "repeats": repeats,
+        "times": times, "time_min": min(times), "time_mean": statistics.mean(times),
+        "time_stdev": statistics.stdev(times) if repeats > 1 else 0.0, "peak_memory": peak_memory,
+        "iterations": result.iterations, "distances_computed": result.distances_computed,
+        "success_rate": result.success_rate, "inertia": result.inertia, "phases": profiler.report()["phases"]
+    }
+
+
+def benchmark_cases(algorithms: List[str], engines: List[str], ks: List[int], sizes: List[int], seeds: List[str]) \
+        -> Iterator[tuple[str, str, int, int, str]]:
+    """
+    function that returns all valid combinations of sweep, elkan engine is used only with centroid k-means and
+    divisive does not have engines, so it is run once per k, size and seed
+    :param algorithms: algorithms to sweep
+    :param engines: engines to sweep
+    :param ks: numbers of clusters to sweep
+    :param sizes: numbers of points to sweep
+    :param seeds: generator seeds to sweep
+    :return: iterator of (algorithm, engine, k, points, seed)
+    """
+    for algorithm in algorithms:
+        algorithm_engines = ["python"] if algorithm == "d" else engines
+        for engine in algorithm_engines:
+            if engine == "elkan" and algorithm != "c":
+                continue
+            for size in sizes:
+                for k in ks:
+                    if k > size:
+                        continue
+                    for seed in seeds:
+                        yield algorithm, engine, k, size, seed
+
+
+def run_benchmark(algorithms: List[str], engines: List[str], ks: List[int], sizes: List[int], seeds: List[str],
+                  repeats: int) -> dict:
+    """
+    function that runs whole sweep and prints one line per finished configuration
+    :param algorithms: algorithms to sweep
+    :param engines: engines to sweep
+    :param ks: numbers of clusters to sweep
+    :param sizes: numbers of points to sweep
+    :param seeds: generator seeds to sweep
+    :param repeats: number of measured runs of every configuration
+    :return: benchmark results with information about environment
+    """
+    results = []
+    for case in benchmark_cases(algorithms, engines, ks, sizes, seeds):
+        result = run_case(*case, repeats)
+        print(f"{_case_name(result)}: {result['time_min']:.4f} s, {result['peak_memory'] / 2 ** 20:.2f} MiB, "
+              f"{result['iterations']} iterations, {result['distances_computed']} distances")
+        results.append(result)
+    return {"format": BENCHMARK_FORMAT, "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "results": results}
+
+
+def _case_name(result: dict) -> str:
+    """
+    helper function that creates readable name of configuration
+    :param result: result of configuration
+    :return: name of configuration
+    """
+    return f"-a {result['algorithm']} -e {result['engine']} -k {result['k']} -n {result['points']} " \
+           f"seed {result['seed']}"
+
+
+def save_results(path: str, results: dict) -> None:
+    """
+    function that writes benchmark results to json file
+    :param path: path to json file
+    :param results: benchmark results
+    """
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """
+    function that reads benchmark results from json file
+    :param path: path to json file
+    :return: benchmark results
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """
+    function that compares results with saved baseline, configurations are matched by algorithm, engine, k, number of
+    points and seed. Minimal time and peak memory are regressions when they grow more than threshold, iterations and
+    computed distances are deterministic, so any growth is regression
+    :param baseline: saved benchmark results
+    :param current: new benchmark results
+    :param threshold: allowed relative growth of time and memory (0.1 = 10 %)
+    :return: descriptions of regressions
+    """
+    baseline_results = {tuple(result[key] for key in CASE_KEYS): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = baseline_results.get(tuple(result[key] for key in CASE_KEYS))
+        if old is None:
+            continue
+        for metric, allowed in (("time_min", threshold), ("peak_memory", threshold), ("iterations", 0),
+                                ("distances_computed", 0)):
+            if result[metric] > old[metric] * (1 + allowed):
+                regressions.append(f"{_case_name(result)}: {metric} {old[metric]} -> {result[metric]}")
+    return regressions
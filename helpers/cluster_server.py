@@ -0,0 +1,363 @@
+import asyncio
+import json
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from algorithms.agglomerative_clustering import AgglomerativeClustering
+from algorithms.coreset_k_means import CoresetKMeans
+from algorithms.divisive_clustering import DivisiveClustering
+from algorithms.k_means import KMeans
+from helpers.consts import ENGINES, INIT_STRATEGIES, K_MEANS_ITERATIONS, DIVISIVE_ITERATIONS, TOLERANCE, \
+    MAX_ITERATIONS, NUM_OF_POINTS, NUM_OF_SEED_POINTS, RANDOM_SEED, SERVER_HOST, SERVER_PORT
+from helpers.generator import Generator
+from helpers.measurements import as_points
+from helpers.point_io import open_points
+from helpers.result import ClusteringResult
+
+_worker_datasets: dict = {}
+
+
+def _attach_dataset(name: str, shape: tuple, dtype: str, live_blocks: frozenset) -> np.ndarray:
+    """
+    function that maps dataset from shared memory block in worker process, block stays mapped for next jobs. Every
+    load creates new block, so blocks of dropped or reloaded datasets are not among live blocks and their mappings are
+    closed here, mapping that is still used by some array is closed by one of next jobs
+    :param name: name of shared memory block
+    :param shape: shape of points array
+    :param dtype: data type of points array
+    :param live_blocks: names of blocks of all datasets server holds
+    :return: points of dataset, they are not copied
+    """
+    for block in [block for block in _worker_datasets if block not in live_blocks]:
+        try:
+            _worker_datasets[block].close()
+        except BufferError:
+            continue
+        del _worker_datasets[block]
+    if name not in _worker_datasets:
+        _worker_datasets[name] = SharedMemory(name=name)
+    return np.ndarray(shape, dtype=dtype, buffer=_worker_datasets[name].buf)
+
+
+def _load_points(request: dict) -> tuple[SharedMemory, tuple, str]:
+    """
+    function that reads points from file (.npy, csv or raw binary) or generates them by Generator with the same
+    arguments as main.py and copies them into new shared memory block, with dimensions float32 points of that many
+    dimensions are generated or read from raw binary file. Integer points are stored as int32 and float points as
+    float32. It runs in thread of default executor of event loop, so server answers other requests meanwhile
+    :param request: load request with path, dtype and dimensions or points, seeds, seed and dimensions
+    :return: shared memory block, shape and data type of points
+    """
+    dimensions = request.get("dimensions")
+    if request.get("path"):
+        points = open_points(request["path"], np.dtype(request.get("dtype", "int32")), int(dimensions or 2))
+    else:
+        generator = Generator(int(request.get("points", NUM_OF_POINTS)), int(request.get("seeds", NUM_OF_SEED_POINTS)),
+                              seed=str(request.get("seed", RANDOM_SEED)))
+        points = generator.generate_float_array(int(dimensions)) if dimensions else generator.generate_array()
+    points = as_points(points)
+    shared_memory = SharedMemory(create=True, size=max(points.nbytes, 1))
+    np.ndarray(points.shape, dtype=points.dtype, buffer=shared_memory.buf)[:] = points
+    return shared_memory, points.shape, points.dtype.str
+
+
+def _free_block(shared_memory: SharedMemory) -> None:
+    """
+    helper function that closes and removes shared memory block
+    :param shared_memory: block of dataset
+    """
+    shared_memory.close()
+    shared_memory.unlink()
+
+
+def _free_loaded_block(future: asyncio.Future) -> None:
+    """
+    callback of load whose request was cancelled before points were registered, it frees block created for them
+    :param future: finished future of _load_points
+    """
+    if not future.cancelled() and future.exception() is None:
+        _free_block(future.result()[0])
+
+
+def _warm_up() -> None:
+    """
+    empty task that is sent to every worker when server starts, so processes are started and algorithms are imported
+    before first job comes
+    """
+
+
+def _create_clustering(points: np.ndarray, job: dict) -> KMeans or CoresetKMeans or DivisiveClustering or \
+        AgglomerativeClustering:
+    """
+    function that creates algorithm of job, arguments have the same names and defaults as arguments of main.py, every
+    job runs in one process because parallelism comes from the pool
+    :param points: points of dataset
+    :param job: cluster request
+    :return: algorithm ready to fit
+    """
+    algorithm = job.get("algorithm", "c")
+    k = int(job["k"])
+    engine = job.get("engine", "python")
+    init = job.get("init", "random")
+    tolerance = float(job.get("tolerance", TOLERANCE))
+    max_iterations = int(job.get("max_iterations", MAX_ITERATIONS))
+    index = bool(job.get("index", False))
+    if algorithm not in ['c', 'm', 'd', 'a']:
+        raise ValueError("algorithm must be c, m, d or a")
+    if engine not in ENGINES or init not in INIT_STRATEGIES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)} and init one of {', '.join(INIT_STRATEGIES)}")
+    if k < 1 or k > len(points):
+        raise ValueError(f"k must be between 1 and {len(points)}")
+    if algorithm == "a":
+        return AgglomerativeClustering(points, k, algorithm, engine, index, cf_threshold=job.get("cf"))
+    if algorithm == "d":
+        return DivisiveClustering(points, k, algorithm, init=init,
+                                  restarts=int(job.get("restarts") or DIVISIVE_ITERATIONS), tolerance=tolerance,
+                                  max_iterations=max_iterations, spatial_index=index,
+                                  bisecting=bool(job.get("bisecting", False)))
+    restarts = int(job.get("restarts") or K_MEANS_ITERATIONS)
+    if job.get("coreset"):
+        return CoresetKMeans(points, k, algorithm, engine, 1, init, restarts, tolerance, max_iterations, index,
+                             coreset_size=int(job["coreset"]))
+    return KMeans(points, k, algorithm, engine, 1, init, restarts, tolerance, max_iterations, index)
+
+
+def _run_job(dataset: tuple[str, tuple, str], job: dict, live_blocks: frozenset) -> dict:
+    """
+    function that runs one clustering job in worker process of the pool
+    :param dataset: name of shared memory block, shape and data type of points
+    :param job: cluster request
+    :param live_blocks: names of blocks of all datasets server holds
+    :return: response with result of algorithm, labels are left out when job does not want them
+    """
+    result = _create_clustering(_attach_dataset(*dataset, live_blocks), job).fit()
+    return _result_response(result, job.get("labels", True))
+
+
+def _result_response(result: ClusteringResult, labels: bool) -> dict:
+    """
+    helper function that turns result of algorithm into json response
+    :param result: result of fit
+    :param labels: whether labels are included
+    :return: json serializable response
+    """
+    response = {"ok": True, "centers": result.centers.tolist(), "inertia": result.inertia,
+                "success_rate": result.success_rate, "time": result.time, "iterations": result.iterations,
+                "distances_computed": result.distances_computed}
+    if labels:
+        response["labels"] = result.labels.tolist()
+    return response
+
+
+class ClusterServer:
+    """
+    class that implements long running asyncio clustering worker. Requests and responses are json objects, one per
+    line, on unix socket or localhost port. Named datasets are loaded (or generated) once and kept in shared memory
+    blocks, cluster jobs run in process pool that maps them, so job does not pay for imports, point generation or
+    copying points. At most workers jobs run at once, others wait in queue, every connection gets its responses in
+    order of its requests and more connections can wait for their jobs at the same time. Block of dropped or reloaded
+    dataset is freed when the last job that uses it finishes
+    """
+    datasets: dict
+    block_jobs: dict
+    retired_blocks: dict
+    pool: ProcessPoolExecutor or None
+
+    def __init__(self, workers: int = 1) -> None:
+        """
+        :param workers: number of processes that run jobs, it is also the number of jobs that run at once
+        """
+        self.workers = workers
+        self.datasets = {}
+        self.block_jobs = {}
+        self.retired_blocks = {}
+        self.pool = None
+        self.slots = None
+        self.stopped = None
+        self.jobs_done = 0
+
+    def _add_dataset(self, name: str, dataset: tuple[SharedMemory, tuple, str]) -> dict:
+        """
+        method that registers loaded dataset and replaces older dataset of the same name
+        :param name: name of dataset
+        :param dataset: shared memory block, shape and data type of points
+        :return: response with number of points and their dimensions
+        """
+        self._drop_dataset(name)
+        self.datasets[name] = dataset
+        shape = dataset[1]
+        return {"ok": True, "dataset": name, "points": shape[0], "dimensions": shape[1]}
+
+    def _drop_dataset(self, name: str) -> bool:
+        """
+        method that removes dataset, its shared memory block is freed now or, when jobs still use it, after the last
+        of them. Workers keep their mapping until next job or until they exit
+        :param name: name of dataset
+        :return: True when dataset existed
+        """
+        if name not in self.datasets:
+            return False
+        shared_memory = self.datasets.pop(name)[0]
+        if self.block_jobs.get(shared_memory.name):
+            self.retired_blocks[shared_memory.name] = shared_memory
+        else:
+            _free_block(shared_memory)
+        return True
+
+    async def _load(self, request: dict) -> dict:
+        """
+        method that handles load request, points are read or generated and copied to shared memory in thread, so event
+        loop is not blocked, and dataset is registered back on event loop. When request is cancelled meanwhile, block
+        is freed after thread finishes
+        :param request: load request with name and path, dtype and dimensions or points, seeds, seed and dimensions
+        :return: response with number of points and their dimensions
+        """
+        name = request["name"]
+        loading = asyncio.get_running_loop().run_in_executor(None, _load_points, request)
+        try:
+            dataset = await asyncio.shield(loading)
+        except asyncio.CancelledError:
+            loading.add_done_callback(_free_loaded_block)
+            raise
+        return self._add_dataset(name, dataset)
+
+    async def _cluster(self, request: dict) -> dict:
+        """
+        method that waits for free slot and runs cluster job in the pool, dataset is looked up only when job gets slot,
+        so dataset dropped or reloaded while job waited is not used and block of running job is not freed before job
+        finishes
+        :param request: cluster request with dataset and arguments of algorithm
+        :return: response with result of job
+        """
+        async with self.slots:
+            if request.get("dataset") not in self.datasets:
+                raise ValueError(f"unknown dataset {request.get('dataset')}")
+            shared_memory, shape, dtype = self.datasets[request["dataset"]]
+            block = shared_memory.name
+            self.block_jobs[block] = self.block_jobs.get(block, 0) + 1
+            try:
+                live_blocks = frozenset(memory.name for memory, _, _ in self.datasets.values())
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self.pool, _run_job, (block, shape, dtype), request, live_blocks)
+            finally:
+                self._finish_job(block)
+        self.jobs_done += 1
+        return response
+
+    def _finish_job(self, block: str) -> None:
+        """
+        method that marks job on block as finished, block of dropped dataset is freed with its last job
+        :param block: name of shared memory block
+        """
+        self.block_jobs[block] -= 1
+        if self.block_jobs[block] == 0:
+            del self.block_jobs[block]
+            if block in self.retired_blocks:
+                _free_block(self.retired_blocks.pop(block))
+
+    async def handle(self, request: dict) -> dict:
+        """
+        method that executes one request, every error (invalid request, failed job or broken pool) is returned as
+        response instead of closing connection
+        :param request: request with op load, drop, datasets, cluster, status or shutdown
+        :return: json serializable response
+        """
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("request must be json object")
+            operation = request.get("op")
+            if operation == "cluster":
+                return await self._cluster(request)
+            elif operation == "load":
+                return await self._load(request)
+            elif operation == "drop":
+                return {"ok": self._drop_dataset(request.get("name"))}
+            elif operation == "datasets":
+                return {"ok": True, "datasets": {name: shape[0] for name, (_, shape, _) in self.datasets.items()}}
+            elif operation == "status":
+                return {"ok": True, "workers": self.workers, "jobs_done": self.jobs_done}
+            elif operation == "shutdown":
+                self.stopped.set()
+                return {"ok": True}
+            raise ValueError(f"unknown op {operation}")
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        method that answers requests of one connection until client closes it, connection that is still open when
+        server shuts down is cancelled and closed quietly
+        :param reader: stream of requests
+        :param writer: stream of responses
+        """
+        try:
+            while not reader.at_eof():
+                line = await reader.readline()
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {"ok": False, "error": f"invalid json: {error}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path: str or None = None, host: str = SERVER_HOST, port: int = SERVER_PORT) -> None:
+        """
+        method that starts pool and listens on unix socket (when path is given) or on localhost port until shutdown
+        request arrives, all shared memory blocks are freed at the end. Resource tracker is started before workers,
+        so they share it with server and do not remove datasets when they exit
+        :param path: path of unix socket
+        :param host: host of tcp socket
+        :param port: port of tcp socket
+        """
+        self.slots = asyncio.Semaphore(self.workers)
+        self.stopped = asyncio.Event()
+        resource_tracker.ensure_running()
+        self.pool = ProcessPoolExecutor(self.workers)
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(self.pool, _warm_up)
+                               for _ in range(self.workers)))
+        if path:
+            server = await asyncio.start_unix_server(self._serve_connection, path)
+        else:
+            server = await asyncio.start_server(self._serve_connection, host, port)
+        address = path or "{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(f"Clustering worker with {self.workers} processes listening on {address}", flush=True)
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            for name in list(self.datasets):
+                self._drop_dataset(name)
+            for block in list(self.retired_blocks):
+                _free_block(self.retired_blocks.pop(block))
+
+
+def request(address: str, message: dict) -> dict:
+    """
+    function that sends one request to clustering worker and waits for its response
+    :param address: path of unix socket or host:port
+    :param message: json serializable request
+    :return: response of worker
+    """
+    if ":" in address and not address.startswith("/"):
+        host, port = address.rsplit(":", 1)
+        connection = socket.create_connection((host, int(port)))
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(address)
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(message).encode() + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
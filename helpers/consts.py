@@ -7,8 +7,39 @@ COORDINATES_END = 5000
 OFFSET_START = -100
 OFFSET_END = 100
 NUM_OF_POINTS = 2020
+NUM_OF_SEED_POINTS = 20
+GENERATOR_BATCH_SIZE = 65536
 K_MEANS_ITERATIONS = 5
 DIVISIVE_ITERATIONS = 5
+MAX_ITERATIONS = 300
+TOLERANCE = 0.0
+SUCCESS_DISTANCE = 500
+SILHOUETTE_SAMPLE = 1000
+DISTANCE_MEMORY_BUDGET = 32 * 2 ** 20
+EXPANDED_DISTANCE_DIMENSIONS = 3
+ENGINES = ['python', 'numpy', 'elkan']
+INIT_STRATEGIES = ['random', 'k-means++', 'greedy-k-means++']
+KD_TREE_LEAF_SIZE = 8
+GRID_POINTS_PER_CELL = 2
+GRID_REFINEMENTS = 3
+MINI_BATCH_SIZE = 4096
+MINI_BATCH_PASSES = 3
+MODEL_DRIFT_THRESHOLD = 0.5
+MODEL_DRIFT_WINDOW = 1000
+MODEL_RESERVOIR_SIZE = 10000
+CF_THRESHOLD = 50.0
+CF_BRANCHING = 50
+CORESET_SIZE = 5000
+INPUT_DTYPES = ['int32', 'float32']
+BENCHMARK_K = [5, 10, 20]
+BENCHMARK_REPEATS = 3
+BENCHMARK_THRESHOLD = 0.1
+PLOT_MODES = ['show', 'save', 'off']
+PLOT_PATH = "clusters.png"
+CACHE_DIRECTORY = ".cluster_cache"
+CACHE_MAX_BYTES = 256 * 2 ** 20
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
 COLORS = ['aqua', 'azure', 'beige', 'blue', 'brown', 'chartreuse', 'chocolate', 'coral', 'crimson', 'darkblue',
           'darkgreen', 'fuchsia', 'gold', 'grey', 'khaki', 'lavender', 'orange', 'pink', 'red', 'violet',
           'yellow', 'plum']
@@ -0,0 +1,32 @@
+import numpy as np
+
+from helpers.consts import RANDOM_SEED, DISTANCE_MEMORY_BUDGET
+from helpers.measurements import squared_distances, distance_blocks
+
+
+def lightweight_coreset(points: np.ndarray, size: int, seed: str = RANDOM_SEED,
+                        memory_budget: int = DISTANCE_MEMORY_BUDGET) -> tuple[np.ndarray, np.ndarray]:
+    """
+    function that builds lightweight coreset of points (Bachem, Lucic, Krause 2018). Every point is sampled with
+    probability q = 1 / 2n + d^2 / 2 sum(d^2), where d is distance of point to mean of all points, and gets weight
+    1 / (size * q), so weighted cost of any centers is unbiased estimate of their cost on all points. Point sampled
+    more than once is kept once with sum of its weights. Distances to mean are calculated in blocks of points within
+    memory budget, so memory mapped points are never converted at once
+    :param points: (n, d) array of points
+    :param size: number of samples, all points with weight 1 are returned when it is at least n
+    :param seed: seed of sampling
+    :param memory_budget: bytes that can be used by one block
+    :return: sorted indexes of coreset points and their weights
+    """
+    n = len(points)
+    if size >= n:
+        return np.arange(n), np.ones(n)
+    mean = points.mean(axis=0, dtype=np.float64)
+    squared = np.empty(n)
+    for block in distance_blocks(n, points.shape[1], memory_budget=memory_budget):
+        squared[block] = squared_distances(mean[np.newaxis], points[block])[0]
+    total = squared.sum()
+    probabilities = 0.5 / n + (0.5 * squared / total if total > 0 else 0.5 / n)
+    generator = np.random.default_rng(int(seed))
+    indexes, counts = np.unique(generator.choice(n, size, p=probabilities / probabilities.sum()), return_counts=True)
+    return indexes, counts / (size * probabilities[indexes])
@@ -0,0 +1,153 @@
+import math
+
+import numpy as np
+
+from helpers.consts import RANDOM_SEED, SUCCESS_DISTANCE, DISTANCE_MEMORY_BUDGET
+from helpers.measurements import centroid_sums, squared_distances, distance_blocks, integer_points, medoid_index, \
+    cluster_indexes
+
+
+def centroids(points: np.ndarray, labels: np.ndarray, k: int, weights: np.ndarray = None) -> np.ndarray:
+    """
+    vectorized version of centroid_calculation for all clusters at once, centroids of integer points are truncated to
+    int the same way
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param k: number of clusters, every cluster has at least one point
+    :param weights: (n,) weight of every point or None
+    :return: (k, d) array of centroids
+    """
+    sums, counts = centroid_sums(points, labels, k, weights)
+    means = sums / counts[:, np.newaxis]
+    return np.trunc(means) if integer_points(points) else means
+
+
+def medoids(points: np.ndarray, labels: np.ndarray, k: int, weights: np.ndarray = None) -> np.ndarray:
+    """
+    vectorized version of medoid_calculation for all clusters, like there medoid is the point of cluster with the
+    smallest sum of distances to other points of cluster and on tie the first point wins
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param k: number of clusters, every cluster has at least one point
+    :param weights: (n,) weight of every point, distances to it are weighted by them, or None
+    :return: (k, d) array of medoids
+    """
+    indexes = [cluster[medoid_index(points[cluster], None if weights is None else weights[cluster])]
+               for cluster in cluster_indexes(labels, k)]
+    return points[indexes].astype(np.float64)
+
+
+def calculate_centers(points: np.ndarray, labels: np.ndarray, k: int, center_calculation: str,
+                      weights: np.ndarray = None) -> np.ndarray:
+    """
+    function that calculates centers of all clusters by the same rule as get_dist_calculator selects
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param k: number of clusters, every cluster has at least one point
+    :param center_calculation: m = medoid, c, d, a = centroid
+    :param weights: (n,) weight of every point or None
+    :return: (k, d) array of centers
+    """
+    if center_calculation == "m":
+        return medoids(points, labels, k, weights)
+    return centroids(points, labels, k, weights)
+
+
+def success_rate(points: np.ndarray, labels: np.ndarray, centers: np.ndarray, weights: np.ndarray = None) -> float:
+    """
+    function that calculates cluster success rate, cluster is successful when average distance of its points from its
+    center is at most SUCCESS_DISTANCE, distances of integer points are truncated to int the same way as distance
+    function does. Distances are summed in blocks of points within DISTANCE_MEMORY_BUDGET, so memory mapped points are
+    never converted at once
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param centers: (k, d) array of centers, every cluster has at least one point
+    :param weights: (n,) weight of every point, average distance is weighted by them, or None
+    :return: % of successful clusters
+    """
+    sums = np.zeros(len(centers))
+    for block in distance_blocks(len(points), points.shape[1]):
+        differences = points[block] - centers[labels[block]]
+        distances = np.sqrt((differences * differences).sum(axis=1))
+        if integer_points(points):
+            distances = distances.astype(np.int64)
+        if weights is not None:
+            distances = distances * weights[block]
+        sums += np.bincount(labels[block], weights=distances, minlength=len(centers))
+    counts = np.bincount(labels, weights=weights, minlength=len(centers))
+    return np.count_nonzero(sums / counts <= SUCCESS_DISTANCE) / len(centers) * 100
+
+
+def inertia(points: np.ndarray, labels: np.ndarray, centers: np.ndarray, weights: np.ndarray = None) -> float:
+    """
+    function that calculates sum of squared distances of all points to centers of their clusters (SSE) in blocks of
+    points within DISTANCE_MEMORY_BUDGET
+    :param points: (n, d) array of points
+    :param labels: (n,) index of center for every point
+    :param centers: (k, d) array of centers
+    :param weights: (n,) weight of every point, then SSE is weighted sum, or None
+    :return: inertia of clustering
+    """
+    total = 0.0
+    for block in distance_blocks(len(points), points.shape[1]):
+        differences = points[block] - centers[labels[block]]
+        if weights is None:
+            total += float((differences * differences).sum())
+        else:
+            total += float((differences * differences).sum(axis=1) @ weights[block])
+    return total
+
+
+def size_balance(labels: np.ndarray, k: int, weights: np.ndarray = None) -> float:
+    """
+    function that calculates how evenly points are split between clusters as product of relative sizes of clusters,
+    it is the largest when all clusters have the same size. Product is calculated in order of clusters like variance
+    heuristic of algorithms always did, so equal splits stay equal
+    :param labels: (n,) index of cluster for every point
+    :param k: number of clusters
+    :param weights: (n,) weight of every point, size of cluster is sum of its weights, or None
+    :return: product of relative cluster sizes
+    """
+    if weights is not None:
+        return math.prod((np.bincount(labels, weights=weights, minlength=k) / weights.sum()).tolist())
+    return math.prod((np.bincount(labels, minlength=k) / len(labels)).tolist())
+
+
+def silhouette(points: np.ndarray, labels: np.ndarray, k: int, sample_size: int, seed: str = RANDOM_SEED,
+               memory_budget: int = DISTANCE_MEMORY_BUDGET) -> float:
+    """
+    function that calculates silhouette score on random sample of points, for every sampled point a is average distance
+    to other points of its cluster and b is the smallest average distance to points of other cluster. Distances from
+    sample to all points are calculated in blocks of sampled points that fit into memory budget and summed per cluster
+    over points sorted by cluster. Points of single point clusters have score 0
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param k: number of clusters, every cluster has at least one point
+    :param sample_size: number of sampled points, all points are used when it is larger than n
+    :param seed: seed of sampling
+    :param memory_budget: bytes that can be used by one block of distances
+    :return: average silhouette of sampled points between -1 and 1
+    """
+    if k < 2:
+        return 0.0
+    generator = np.random.default_rng(int(seed))
+    sample = np.arange(len(points)) if sample_size >= len(points) else \
+        np.sort(generator.choice(len(points), sample_size, replace=False))
+    order = np.argsort(labels, kind="stable")
+    sorted_points = points[order]
+    counts = np.bincount(labels, minlength=k)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    scores = []
+    for rows in distance_blocks(len(sample), len(points), memory_budget=memory_budget):
+        block = sample[rows]
+        cluster_sums = np.add.reduceat(np.sqrt(squared_distances(points[block], sorted_points)), starts, axis=1)
+        own = labels[block]
+        own_sizes = counts[own]
+        a = cluster_sums[np.arange(len(block)), own] / np.maximum(own_sizes - 1, 1)
+        cluster_sums[np.arange(len(block)), own] = np.inf
+        b = (cluster_sums / counts).min(axis=1)
+        larger = np.maximum(a, b)
+        block_scores = np.divide(b - a, larger, out=np.zeros(len(block)), where=larger > 0)
+        block_scores[own_sizes == 1] = 0
+        scores.append(block_scores)
+    return float(np.concatenate(scores).mean())
@@ -1,27 +1,47 @@
 import random as rd
-from typing import List
+from typing import List, Iterator
 
-from helpers.consts import RANDOM_SEED, COORDINATES_START, COORDINATES_END, OFFSET_START, OFFSET_END, NUM_OF_POINTS
+import numpy as np
+
+from helpers.consts import RANDOM_SEED, COORDINATES_START, COORDINATES_END, OFFSET_START, OFFSET_END, NUM_OF_POINTS, \
+    NUM_OF_SEED_POINTS, GENERATOR_BATCH_SIZE
 
 
 class Generator:
     """
-    class that generates random unique points for clustering algorithms
+    class that generates random unique points for clustering algorithms, 2-d integer points or float32 points with
+    any number of dimensions
     """
-    coordinates_created = {}
-    created_clusters = []
-    cluster_counter = 0
+    coordinates_created: dict
+    created_clusters: List[List[int]]
 
-    def __init__(self) -> None:
-        rd.seed(RANDOM_SEED)
+    def __init__(self, num_of_points: int = NUM_OF_POINTS, num_of_seeds: int = NUM_OF_SEED_POINTS,
+                 coordinates_start: int = COORDINATES_START, coordinates_end: int = COORDINATES_END,
+                 seed: str = RANDOM_SEED) -> None:
+        """
+        all created points are stored on instance, so separate generators do not share already created coordinates
+        :param num_of_points: how many points we want to generate
+        :param num_of_seeds: how many points are generated randomly before rest is generated around them
+        :param coordinates_start: lowest possible coordinate
+        :param coordinates_end: highest possible coordinate
+        :param seed: random seed for reproducibility
+        """
+        rd.seed(seed)
+        self.seed = seed
+        self.num_of_points = num_of_points
+        self.num_of_seeds = num_of_seeds
+        self.coordinates_start = coordinates_start
+        self.coordinates_end = coordinates_end
+        self.coordinates_created = {}
+        self.created_clusters = []
 
-    def _generate_first_20(self) -> None:
+    def _generate_seeds(self) -> None:
         """
-        method that generated first random unique 20 points
+        method that generates first random unique points (20 by default), rest of the points is created around them
         """
-        while len(self.created_clusters) != 20:
-            x = rd.randint(COORDINATES_START, COORDINATES_END)
-            y = rd.randint(COORDINATES_START, COORDINATES_END)
+        while len(self.created_clusters) != self.num_of_seeds:
+            x = rd.randint(self.coordinates_start, self.coordinates_end)
+            y = rd.randint(self.coordinates_start, self.coordinates_end)
             if not self.coordinates_created.get(tuple([x, y])):
                 self.coordinates_created[tuple([x, y])] = True
                 self.created_clusters.append([x, y])
@@ -30,16 +50,16 @@ class Generator:
         """
         method that creates rest of the unique points based on offset from randomly selected already created points
         """
-        while len(self.created_clusters) != NUM_OF_POINTS:
+        while len(self.created_clusters) != self.num_of_points:
             random_cluster = rd.choice(self.created_clusters)
             offset_x = rd.randint(OFFSET_START, OFFSET_END)
             offset_y = rd.randint(OFFSET_START, OFFSET_END)
             new_x = random_cluster[0] + offset_x
             new_y = random_cluster[1] + offset_y
 
-            if new_x > COORDINATES_END or new_x < COORDINATES_START:
+            if new_x > self.coordinates_end or new_x < self.coordinates_start:
                 continue
-            elif new_y > COORDINATES_END or new_y < COORDINATES_START:
+            elif new_y > self.coordinates_end or new_y < self.coordinates_start:
                 continue
             elif self.coordinates_created.get(tuple([new_x, new_y])):
                 continue
@@ -51,6 +71,103 @@ class Generator:
         method that starts generating random points
         :return: randomly generated unique points
         """
-        self._generate_first_20()
+        self._generate_seeds()
         self._generate_rest()
         return self.created_clusters
+
+    def _take_new_points(self, candidates: np.ndarray, created_bitmap: np.ndarray, limit: int) -> np.ndarray:
+        """
+        method that filters candidate points to the ones that are inside bounds and were not created yet, duplicates
+        inside candidates are removed as well. Every coordinate has one bit in created bitmap
+        :param candidates: (m, 2) array of candidate points
+        :param created_bitmap: bitmap of already created coordinates, it is updated with taken points
+        :param limit: maximum number of points to take
+        :return: new unique points in the order they were generated
+        """
+        inside = ((candidates >= self.coordinates_start) & (candidates <= self.coordinates_end)).all(axis=1)
+        candidates = candidates[inside]
+        width = self.coordinates_end - self.coordinates_start + 1
+        keys = (candidates[:, 0].astype(np.int64) - self.coordinates_start) * width + \
+               (candidates[:, 1].astype(np.int64) - self.coordinates_start)
+
+        first_occurrences = np.sort(np.unique(keys, return_index=True)[1])
+        keys = keys[first_occurrences]
+        not_created = (created_bitmap[keys >> 3] >> (keys & 7).astype(np.uint8)) & 1 == 0
+        taken = first_occurrences[not_created][:limit]
+        keys = keys[not_created][:limit]
+        np.bitwise_or.at(created_bitmap, keys >> 3, (1 << (keys & 7)).astype(np.uint8))
+        return candidates[taken]
+
+    def generate_batches(self, batch_size: int = GENERATOR_BATCH_SIZE) -> Iterator[np.ndarray]:
+        """
+        bulk version of generate_points, offsets for whole batch are sampled at once and uniqueness is checked in
+        bitmap of all coordinates instead of dictionary, it is meant for millions of points. Batch is never larger than
+        number of already created points, so points keep growing around previous ones like in generate_points
+        :param batch_size: how many candidate points are sampled at once
+        :return: iterator of int32 arrays with newly created points
+        """
+        generator = np.random.default_rng(int(self.seed))
+        width = self.coordinates_end - self.coordinates_start + 1
+        created_bitmap = np.zeros((width * width + 7) // 8, dtype=np.uint8)
+        points = np.empty((self.num_of_points, 2), dtype=np.int32)
+        count = 0
+
+        while count != self.num_of_seeds:
+            candidates = generator.integers(self.coordinates_start, self.coordinates_end + 1,
+                                            size=(self.num_of_seeds - count, 2), dtype=np.int32)
+            new_points = self._take_new_points(candidates, created_bitmap, self.num_of_seeds - count)
+            points[count:count + len(new_points)] = new_points
+            count += len(new_points)
+        yield points[:count].copy()
+
+        while count != self.num_of_points:
+            candidates_size = min(batch_size, count)
+            parents = generator.integers(0, count, size=candidates_size)
+            offsets = generator.integers(OFFSET_START, OFFSET_END + 1, size=(candidates_size, 2), dtype=np.int32)
+            new_points = self._take_new_points(points[parents] + offsets, created_bitmap, self.num_of_points - count)
+            points[count:count + len(new_points)] = new_points
+            count += len(new_points)
+            yield new_points
+
+    def generate_array(self, batch_size: int = GENERATOR_BATCH_SIZE) -> np.ndarray:
+        """
+        method that generates all points in bulk mode and returns them as one array
+        :param batch_size: how many candidate points are sampled at once
+        :return: (n, 2) int32 array of randomly generated unique points
+        """
+        return np.concatenate(list(self.generate_batches(batch_size)))
+
+    def generate_float_batches(self, dimensions: int, batch_size: int = GENERATOR_BATCH_SIZE) -> Iterator[np.ndarray]:
+        """
+        float32 version of generate_batches for feature vectors, seeds are uniform in coordinate bounds in every
+        dimension and rest of the points is created around already created points by uniform offsets in all dimensions
+        at once. Float points practically never repeat, so only points outside of bounds are dropped
+        :param dimensions: number of coordinates of every point
+        :param batch_size: how many candidate points are sampled at once
+        :return: iterator of (m, dimensions) float32 arrays with newly created points
+        """
+        generator = np.random.default_rng(int(self.seed))
+        points = np.empty((self.num_of_points, dimensions), dtype=np.float32)
+        count = min(self.num_of_seeds, self.num_of_points)
+        points[:count] = generator.uniform(self.coordinates_start, self.coordinates_end, size=(count, dimensions))
+        yield points[:count].copy()
+
+        while count != self.num_of_points:
+            candidates_size = min(batch_size, count)
+            parents = generator.integers(0, count, size=candidates_size)
+            offsets = generator.uniform(OFFSET_START, OFFSET_END, size=(candidates_size, dimensions))
+            candidates = (points[parents] + offsets).astype(np.float32)
+            inside = ((candidates >= self.coordinates_start) & (candidates <= self.coordinates_end)).all(axis=1)
+            new_points = candidates[inside][:self.num_of_points - count]
+            points[count:count + len(new_points)] = new_points
+            count += len(new_points)
+            yield new_points
+
+    def generate_float_array(self, dimensions: int, batch_size: int = GENERATOR_BATCH_SIZE) -> np.ndarray:
+        """
+        method that generates all float points in bulk mode and returns them as one array
+        :param dimensions: number of coordinates of every point
+        :param batch_size: how many candidate points are sampled at once
+        :return: (n, dimensions) float32 array of randomly generated points
+        """
+        return np.concatenate(list(self.generate_float_batches(dimensions, batch_size)))
@@ -0,0 +1,91 @@
+import math
+import random as rd
+from typing import List
+
+import numpy as np
+
+from helpers.measurements import squared_distances, nearest_centers, distance_blocks
+
+
+def _squared_distances_to(points: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    helper function that calculates squared distances from few selected points to all points, points are converted to
+    float64 in blocks within DISTANCE_MEMORY_BUDGET, so memory mapped points are never converted at once
+    :param points: (n, d) array of points
+    :param others: (m, d) array of selected points
+    :return: (m, n) array of squared distances
+    """
+    squared = np.empty((len(others), len(points)))
+    for block in distance_blocks(len(points), len(others)):
+        squared[:, block] = squared_distances(others, points[block])
+    return squared
+
+
+def k_means_plus_plus(points: np.ndarray, k: int, random: rd.Random, greedy: bool = False,
+                      indexes: List[int] = None, weights: np.ndarray = None) -> List[int]:
+    """
+    function that selects initial centers by k-means++ D^2 sampling, every next center is sampled with probability
+    proportional to squared distance to the closest already selected center. Greedy variant samples 2 + log(k)
+    candidates every step and keeps the one that lowers sum of squared distances the most. With weights squared
+    distances are multiplied by weight of their point
+    :param points: (n, d) array of points
+    :param k: number of centers
+    :param random: random generator of current restart
+    :param greedy: whether to use greedy k-means++
+    :param indexes: already selected points, first point is selected at random when there are none
+    :param weights: (n,) weight of every point or None
+    :return: indexes of selected points
+    """
+    num_of_candidates = 2 + int(math.log(k)) if greedy else 1
+    indexes = list(indexes) if indexes else [random.randrange(len(points))]
+    closest = _squared_distances_to(points, points[indexes]).min(axis=0)
+    for _ in range(len(indexes), k):
+        cumulative = np.cumsum(closest if weights is None else closest * weights)
+        if cumulative[-1] == 0:
+            return indexes + np.setdiff1d(np.arange(len(points)), indexes)[:k - len(indexes)].tolist()
+        thresholds = [random.random() * cumulative[-1] for _ in range(num_of_candidates)]
+        candidates = np.minimum(np.searchsorted(cumulative, thresholds, side="right"), len(points) - 1)
+        candidate_closest = np.minimum(closest, _squared_distances_to(points, points[candidates]))
+        best = int(np.argmin(candidate_closest.sum(axis=1) if weights is None else candidate_closest @ weights))
+        indexes.append(int(candidates[best]))
+        closest = candidate_closest[best]
+    return indexes
+
+
+def warm_start_indexes(points: np.ndarray, centers: np.ndarray, k: int, random: rd.Random,
+                       weights: np.ndarray = None) -> List[int]:
+    """
+    function that turns centers of earlier run (usually with other k) into k initial points, every center is
+    replaced by its closest point. When there are more of them than k, k are selected among them by k-means++, when
+    there are fewer, missing centers are added by k-means++ over all points
+    :param points: (n, d) array of points
+    :param centers: (c, d) array of centers of earlier run
+    :param k: number of centers
+    :param random: random generator of current restart
+    :param weights: (n,) weight of every point or None
+    :return: indexes of selected points
+    """
+    seeds = list(dict.fromkeys(nearest_centers(np.asarray(centers), points)[0].tolist()))
+    if len(seeds) > k:
+        return [seeds[index] for index in
+                k_means_plus_plus(points[seeds], k, random, weights=None if weights is None else weights[seeds])]
+    return k_means_plus_plus(points, k, random, indexes=seeds, weights=weights)
+
+
+def choose_init_indexes(points: np.ndarray, k: int, strategy: str, random: rd.Random,
+                        weights: np.ndarray = None) -> List[int]:
+    """
+    function that returns indexes of initial centers based on selected init strategy, weights are used by k-means++
+    sampling, random strategy selects points uniformly
+    :param points: (n, d) array of points
+    :param k: number of centers
+    :param strategy: random, k-means++ or greedy-k-means++
+    :param random: random generator of current restart
+    :param weights: (n,) weight of every point or None
+    :return: indexes of selected points
+    """
+    if strategy == "k-means++":
+        return k_means_plus_plus(points, k, random, weights=weights)
+    elif strategy == "greedy-k-means++":
+        return k_means_plus_plus(points, k, random, greedy=True, weights=weights)
+    return random.sample(range(len(points)), k)
@@ -1,42 +1,168 @@
 import math
-from typing import List
+from typing import List, Iterator
 
 import numpy as np
 
+from helpers.consts import DISTANCE_MEMORY_BUDGET, EXPANDED_DISTANCE_DIMENSIONS
 
-def distance(a: List[int], b: List[int]) -> int:
+
+def as_points(points: List[List[float]] or np.ndarray) -> np.ndarray:
+    """
+    function that converts points to contiguous (n, d) array algorithms work with, integer coordinates become int32
+    and float coordinates float32, flat array is read as x, y pairs of 2-d points
+    :param points: list of points or array
+    :return: (n, d) array of points, it is not copied when it already has this form
+    """
+    points = np.asarray(points)
+    dtype = np.float32 if np.issubdtype(points.dtype, np.floating) else np.int32
+    if points.ndim != 2:
+        points = points.reshape(-1, 2)
+    return np.ascontiguousarray(points, dtype=dtype)
+
+
+def integer_points(points: np.ndarray) -> bool:
+    """
+    helper function that tells whether points have integer coordinates, centroids of integer points are truncated to
+    int the same way as centroid_calculation does and centroids of float points are exact means
+    :param points: array of points
+    :return: True for integer data type
     """
-    helper function that calculates euclidean distance for 2 given points
+    return np.issubdtype(points.dtype, np.integer)
+
+
+def distance(a: List[float], b: List[float]) -> float:
+    """
+    helper function that calculates euclidean distance for 2 given points, distance of integer points is truncated to
+    int
     :param a: first point coordinates
     :param b: second point coordinates
     :return: distance between points
     """
-    return int(math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2))
+    result = math.sqrt(squared_distance(a, b))
+    return int(result) if isinstance(a[0], (int, np.integer)) and isinstance(b[0], (int, np.integer)) else result
 
 
-def centroid_calculation(cluster: List[List[int]]) -> tuple[int, int]:
+def squared_distance(a: List[float], b: List[float]) -> float:
     """
-    function to calculate centroid location in cluster
+    helper function that calculates squared euclidean distance for 2 given points, it is used where distances are only
+    compared, so no sqrt is needed and integer points keep exact distances
+    :param a: first point coordinates
+    :param b: second point coordinates
+    :return: squared distance between points
+    """
+    return sum((x - y) ** 2 for x, y in zip(a, b))
+
+
+def centroid_calculation(cluster: List[List[float]], weights: List[float] = None) -> tuple:
+    """
+    function to calculate centroid location in cluster, centroid of integer points is truncated to int
     :param cluster: cluster you want to calculate for
+    :param weights: weight of every point, None means every point has weight 1
     :return: calculated centroid
     """
-    x = 0
-    y = 0
-    for point in cluster:
-        x += point[0]
-        y += point[1]
-    return int(x / len(cluster)), int(y / len(cluster))
+    truncate = isinstance(cluster[0][0], (int, np.integer))
+    if weights is not None:
+        total = sum(weights)
+        means = [sum(coordinate * weight for coordinate, weight in zip(axis, weights)) / total
+                 for axis in zip(*cluster)]
+    else:
+        means = [sum(axis) / len(cluster) for axis in zip(*cluster)]
+    return tuple(int(mean) for mean in means) if truncate else tuple(means)
 
 
-def medoid_calculation(cluster: List[List[int]]) -> tuple[int, int]:
+def medoid_calculation(cluster: List[List[float]], weights: List[float] = None) -> tuple:
     """
-    helper function that calculates medoid coordinates from given cluster and returns its location
+    helper function that calculates medoid coordinates from given cluster and returns its location, medoid is the
+    point of cluster with the smallest sum of distances to other points of cluster
     :param cluster: we want to calculate medoid for
+    :param weights: weight of every point, distances to it are weighted by them, None means every point has weight 1
     :return: calculated medoid position
     """
-    centroid = np.mean(cluster)
-    medoid = cluster[np.argmin([sum((x - centroid) ** 2) for x in cluster])]
-    return medoid[0], medoid[1]
+    return tuple(cluster[medoid_index(np.asarray(cluster), None if weights is None else np.asarray(weights))])
+
+
+def medoid_index(points: np.ndarray, weights: np.ndarray = None, memory_budget: int = DISTANCE_MEMORY_BUDGET) -> int:
+    """
+    function that finds medoid of cluster, it is the point with the smallest (weighted) sum of distances to all points
+    of cluster (the same cost k-medoids engine minimises), sums are calculated in blocks of rows within memory budget
+    and on tie the first point wins
+    :param points: (m, d) array of points of one cluster
+    :param weights: (m,) weight of every point, distance to point is multiplied by it, or None
+    :param memory_budget: bytes that can be used by one block
+    :return: index of medoid in points
+    """
+    sums = np.empty(len(points), dtype=np.float64)
+    for block in distance_blocks(len(points), len(points), memory_budget=memory_budget):
+        distances = np.sqrt(squared_distances(points[block], points))
+        sums[block] = distances.sum(axis=1) if weights is None else distances @ weights
+    return int(np.argmin(sums))
+
+
+def cluster_sums(cluster: List[List[float]], labels: List[int], k: int, weights: List[float] = None) \
+        -> tuple[List[List[float]], List[float]]:
+    """
+    helper function that calculates coordinate sums and number of points of every cluster for python loops, centroids
+    are then kept up to date by move_cluster_sums
+    :param cluster: points
+    :param labels: index of assigned center for every point
+    :param k: number of clusters
+    :param weights: weight of every point, then sums and counts are weighted, None means every point has weight 1
+    :return: coordinate sums and counts of clusters
+    """
+    sums = [[0] * (len(cluster[0]) if cluster else 2) for _ in range(k)]
+    counts = [0] * k
+    for index, (point, label) in enumerate(zip(cluster, labels)):
+        weight = 1 if weights is None else weights[index]
+        total = sums[label]
+        for axis, coordinate in enumerate(point):
+            total[axis] += coordinate * weight
+        counts[label] += weight
+    return sums, counts
+
+
+def move_cluster_sums(cluster: List[List[float]], old_labels: List[int], labels: List[int], sums: List[List[float]],
+                      counts: List[float], weights: List[float] = None) -> int:
+    """
+    helper function that updates coordinate sums and counts only for points that changed cluster
+    :param cluster: points
+    :param old_labels: index of center every point was assigned to before
+    :param labels: index of center every point is assigned to now
+    :param sums: coordinate sums of clusters
+    :param counts: counts of clusters
+    :param weights: weight of every point, None means every point has weight 1
+    :return: number of points that changed cluster
+    """
+    moved = 0
+    for index, (point, old_label, label) in enumerate(zip(cluster, old_labels, labels)):
+        if old_label != label:
+            weight = 1 if weights is None else weights[index]
+            old_total = sums[old_label]
+            total = sums[label]
+            for axis, coordinate in enumerate(point):
+                old_total[axis] -= coordinate * weight
+                total[axis] += coordinate * weight
+            counts[old_label] -= weight
+            counts[label] += weight
+            moved += 1
+    return moved
+
+
+def centers_from_cluster_sums(sums: List[List[float]], counts: List[float], centers: List[tuple],
+                              truncate: bool = True) -> List[tuple]:
+    """
+    helper function that calculates centroids from coordinate sums the same way as centroid_calculation, center of
+    cluster without points stays where it was
+    :param sums: coordinate sums of clusters
+    :param counts: counts of clusters
+    :param centers: current centers
+    :param truncate: whether centroids are truncated to int, it is done for integer points
+    :return: calculated centroids
+    """
+    if not truncate:
+        return [tuple(value / count for value in total) if count else tuple(center)
+                for total, count, center in zip(sums, counts, centers)]
+    return [tuple(int(value / count) for value in total) if count else tuple(center)
+            for total, count, center in zip(sums, counts, centers)]
 
 
 def get_dist_calculator(algorithm: str) -> centroid_calculation or medoid_calculation:
@@ -49,3 +175,231 @@ def get_dist_calculator(algorithm: str) -> centroid_calculation or medoid_calcul
         return centroid_calculation
     else:
         return medoid_calculation
+
+
+def squared_distances(points: np.ndarray, others: np.ndarray, dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    vectorized version of squared_distance function, it calculates squared distances from every point of block to
+    every other point (or center) of block, so only (n, m) arrays are created. Points with few dimensions are summed
+    axis by axis, which keeps squared distances of integer points exact in float64. From EXPANDED_DISTANCE_DIMENSIONS
+    dimensions they are calculated as |a|^2 + |b|^2 - 2ab with one matrix product over all axes, rounding errors
+    below 0 are clipped. float32 halves memory and time
+    :param points: (n, d) array of point coordinates
+    :param others: (m, d) array of point or center coordinates
+    :param dtype: float32 or float64
+    :return: (n, m) array of squared distances
+    """
+    points = np.asarray(points, dtype=dtype)
+    others = np.asarray(others, dtype=dtype)
+    if points.shape[1] >= EXPANDED_DISTANCE_DIMENSIONS:
+        squared = points @ others.T
+        squared *= -2
+        squared += np.einsum("ij,ij->i", points, points)[:, np.newaxis]
+        squared += np.einsum("ij,ij->i", others, others)[np.newaxis, :]
+        return np.maximum(squared, 0, out=squared)
+    squared = np.zeros((len(points), len(others)), dtype=dtype)
+    for axis in range(points.shape[1]):
+        differences = points[:, axis, np.newaxis] - others[np.newaxis, :, axis]
+        squared += differences * differences
+    return squared
+
+
+def distance_blocks(num_of_rows: int, num_of_columns: int, dtype: np.dtype = np.float64,
+                    memory_budget: int = DISTANCE_MEMORY_BUDGET) -> Iterator[slice]:
+    """
+    function that splits rows of distance matrix into blocks, so squared distances of one block and temporary
+    differences (2 arrays of block size) fit into memory budget, every block has at least one row
+    :param num_of_rows: number of points whose distances are calculated
+    :param num_of_columns: number of points or centers they are calculated to
+    :param dtype: float32 or float64
+    :param memory_budget: bytes that can be used by one block
+    :return: iterator of row slices
+    """
+    rows = max(memory_budget // (2 * max(num_of_columns, 1) * np.dtype(dtype).itemsize), 1)
+    for start in range(0, num_of_rows, rows):
+        yield slice(start, min(start + rows, num_of_rows))
+
+
+def nearest_centers(points: np.ndarray, centers: np.ndarray, dtype: np.dtype = np.float64,
+                    memory_budget: int = DISTANCE_MEMORY_BUDGET) -> tuple[np.ndarray, np.ndarray]:
+    """
+    function that finds the closest center for every point, squared distances are calculated block by block within
+    memory budget and only compared, so no sqrt is needed. On tie the center with lower index is selected
+    :param points: (n, d) array of point coordinates
+    :param centers: (k, d) array of center coordinates
+    :param dtype: float32 or float64
+    :param memory_budget: bytes that can be used by one block
+    :return: (n,) index of the closest center and (n,) squared distance to it
+    """
+    labels = np.empty(len(points), dtype=np.int64)
+    closest = np.empty(len(points), dtype=dtype)
+    for block in distance_blocks(len(points), len(centers), dtype, memory_budget):
+        squared = squared_distances(points[block], centers, dtype)
+        labels[block] = np.argmin(squared, axis=1)
+        closest[block] = squared[np.arange(len(squared)), labels[block]]
+    return labels, closest
+
+
+def centroid_update(points: np.ndarray, labels: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """
+    vectorized version of centroid_calculation, it calculates centroids of all clusters at once as grouped sums
+    :param points: (n, d) array of point coordinates
+    :param labels: index of assigned center for every point
+    :param centers: current centers, they are kept for clusters that have no points assigned
+    :return: (k, d) array of calculated centroids
+    """
+    return centroids_from_sums(*centroid_sums(points, labels, len(centers)), centers, integer_points(points))
+
+
+def centroid_sums(points: np.ndarray, labels: np.ndarray, k: int, weights: np.ndarray = None) \
+        -> tuple[np.ndarray, np.ndarray]:
+    """
+    function that calculates coordinate sums and number of points of every cluster, centroids are then kept up to date
+    by move_centroid_sums without summing all points again
+    :param points: (n, d) array of point coordinates
+    :param labels: index of assigned center for every point
+    :param k: number of clusters
+    :param weights: (n,) weight of every point, then sums and counts are weighted (counts are float), None means every
+    point has weight 1
+    :return: (k, d) array of coordinate sums and (k,) array of counts
+    """
+    return _grouped_sums(points, labels, k, weights), np.bincount(labels, weights=weights, minlength=k)
+
+
+def _grouped_sums(points: np.ndarray, labels: np.ndarray, k: int, weights: np.ndarray = None,
+                  memory_budget: int = DISTANCE_MEMORY_BUDGET) -> np.ndarray:
+    """
+    helper function that sums (weighted) coordinates of points by their labels with one bincount over all axes, bin of
+    coordinate is label * d + axis, so every coordinate of every cluster is summed in order of points. Bins and float64
+    values are created for blocks of points within memory budget, so memory mapped points are never converted at once
+    :param points: (n, d) array of point coordinates
+    :param labels: index of cluster for every point
+    :param k: number of clusters
+    :param weights: (n,) weight of every point or None
+    :param memory_budget: bytes that can be used by one block
+    :return: (k, d) float64 array of coordinate sums
+    """
+    dimensions = points.shape[1]
+    sums = np.zeros(k * dimensions)
+    for block in distance_blocks(len(points), dimensions, memory_budget=memory_budget):
+        bins = (labels[block, np.newaxis] * dimensions + np.arange(dimensions)).ravel()
+        values = points[block] if weights is None else points[block] * weights[block, np.newaxis]
+        sums += np.bincount(bins, weights=values.ravel(), minlength=k * dimensions)
+    return sums.reshape(k, dimensions)
+
+
+def move_centroid_sums(points: np.ndarray, old_labels: np.ndarray, labels: np.ndarray, sums: np.ndarray,
+                       counts: np.ndarray, weights: np.ndarray = None) -> int:
+    """
+    function that updates coordinate sums and counts in place only for points that changed cluster, they are
+    subtracted from their old cluster and added to the new one
+    :param points: (n, d) array of point coordinates
+    :param old_labels: index of center every point was assigned to before
+    :param labels: index of center every point is assigned to now
+    :param sums: (k, d) array of coordinate sums
+    :param counts: (k,) array of counts
+    :param weights: (n,) weight of every point, None means every point has weight 1
+    :return: number of points that changed cluster
+    """
+    moved = np.flatnonzero(old_labels != labels)
+    if len(moved) == 0:
+        return 0
+    moved_points = points[moved]
+    moved_weights = None if weights is None else weights[moved]
+    for moved_labels, sign in ((old_labels[moved], -1), (labels[moved], 1)):
+        sums += sign * _grouped_sums(moved_points, moved_labels, len(sums), moved_weights)
+        counts += sign * np.bincount(moved_labels, weights=moved_weights, minlength=len(counts))
+    return len(moved)
+
+
+def update_running_means(centers: np.ndarray, counts: np.ndarray, points: np.ndarray, labels: np.ndarray) \
+        -> np.ndarray:
+    """
+    function that moves centers in place with new batch of points, every center becomes mean of all points that were
+    assigned to it so far, which is calculated from its previous position, its count and grouped sum of batch, so
+    earlier points are not needed
+    :param centers: (k, d) float array of current centers, it is updated in place
+    :param counts: (k,) number of points assigned to every center so far
+    :param points: (m, d) batch of points
+    :param labels: index of assigned center for every point of batch
+    :return: (k,) counts including batch
+    """
+    batch_sums, batch_counts = centroid_sums(points, labels, len(centers))
+    new_counts = counts + batch_counts
+    updated = batch_counts > 0
+    centers[updated] = (centers[updated] * counts[updated, np.newaxis] + batch_sums[updated]) / \
+        new_counts[updated, np.newaxis]
+    return new_counts
+
+
+def centroids_from_sums(sums: np.ndarray, counts: np.ndarray, centers: np.ndarray, truncate: bool = True) \
+        -> np.ndarray:
+    """
+    function that calculates centroids from coordinate sums, centroids of integer points are truncated to int the same
+    way as centroid_calculation does
+    :param sums: (k, d) array of coordinate sums
+    :param counts: (k,) array of counts
+    :param centers: current centers, they are kept for clusters that have no points assigned
+    :param truncate: whether centroids are truncated, it is done for integer points
+    :return: (k, d) array of calculated centroids
+    """
+    new_centers = centers.copy()
+    not_empty = counts > 0
+    means = sums[not_empty] / counts[not_empty, np.newaxis]
+    new_centers[not_empty] = np.trunc(means) if truncate else means
+    return new_centers
+
+
+def center_shift(old_centers: List[List[int]] or np.ndarray, centers: List[List[int]] or np.ndarray) -> float:
+    """
+    helper function that returns the largest distance that any center moved, it is compared with convergence tolerance
+    :param old_centers: centers before update
+    :param centers: centers after update
+    :return: largest center shift
+    """
+    differences = np.asarray(centers, dtype=np.float64) - np.asarray(old_centers, dtype=np.float64)
+    return float(np.sqrt((differences ** 2).sum(axis=1)).max(initial=0))
+
+
+def cluster_indexes(labels: np.ndarray, k: int) -> List[np.ndarray]:
+    """
+    function that groups indexes of points by their cluster with one stable sort, indexes of every cluster are views
+    into one array and are in increasing order, so points of cluster are taken as points[indexes]
+    :param labels: index of cluster for every point
+    :param k: number of clusters
+    :return: k arrays of point indexes
+    """
+    order = np.argsort(labels, kind="stable")
+    return np.split(order, np.cumsum(np.bincount(labels, minlength=k))[:-1])
+
+
+def compact_labels(labels: np.ndarray, centers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    function that removes centers without points and renumbers labels, so every label from 0 to k - 1 has points and
+    order of clusters is kept
+    :param labels: index of center for every point
+    :param centers: (k, d) array of centers
+    :return: renumbered labels and centers that have points
+    """
+    used = np.flatnonzero(np.bincount(labels, minlength=len(centers)))
+    if len(used) == len(centers):
+        return labels, centers
+    renumbering = np.full(len(centers), -1, dtype=np.int64)
+    renumbering[used] = np.arange(len(used))
+    return renumbering[labels], centers[used]
+
+
+def pairwise_distances(points: np.ndarray, dtype: np.dtype = np.float32,
+                       memory_budget: int = DISTANCE_MEMORY_BUDGET) -> np.ndarray:
+    """
+    function that calculates matrix of true distances between all points (sums of distances need sqrt), it is filled
+    by blocks of rows whose squared distances are calculated in float64 within memory budget
+    :param points: (n, d) array of point coordinates
+    :param dtype: float32 or float64 matrix
+    :param memory_budget: bytes that can be used by one block
+    :return: (n, n) array of distances
+    """
+    matrix = np.empty((len(points), len(points)), dtype=dtype)
+    for block in distance_blocks(len(points), len(points), np.float64, memory_budget):
+        matrix[block] = np.sqrt(squared_distances(points[block], points))
+    return matrix
@@ -0,0 +1,150 @@
+import random as rd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, List, Any
+
+import numpy as np
+
+from helpers.consts import RANDOM_SEED
+
+_shared_memory: List[SharedMemory] = []
+_shared_points: np.ndarray or None = None
+_shared_arrays: dict = {}
+
+
+def restart_random(restart: int, *keys: int) -> rd.Random:
+    """
+    function that returns random generator of one restart, its seed is derived from RANDOM_SEED and restart number,
+    so every restart gets the same random numbers no matter which process or in which order it runs. Keys select
+    independent generator of one part of restart (for example one split), so parts can run in any order too
+    :param restart: number of restart
+    :param keys: numbers that identify part of restart
+    :return: seeded random generator
+    """
+    return rd.Random("-".join(str(value) for value in (RANDOM_SEED, restart, *keys)))
+
+
+def _attach_shared_arrays(mapped_points: tuple or None, blocks: dict) -> None:
+    """
+    worker initializer that maps points and other shared arrays from shared memory blocks, memory mapped points are
+    mapped from the same file as in main process, nothing is copied to worker
+    :param mapped_points: path, offset, shape and data type of mapped points file or None when points are in block
+    :param blocks: name of shared memory block, shape and data type of every shared array, points are under "points"
+    """
+    global _shared_points
+    arrays = {}
+    for key, (name, shape, dtype) in blocks.items():
+        shared_memory = SharedMemory(name=name)
+        _shared_memory.append(shared_memory)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+    if mapped_points is not None:
+        path, offset, shape, dtype = mapped_points
+        arrays["points"] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    _shared_points = arrays.pop("points")
+    _shared_arrays.update(arrays)
+
+
+def _mapped_file(points: np.ndarray) -> tuple[str, int] or None:
+    """
+    helper function that finds file of memory mapped points, points can also be view of whole mapped array
+    :param points: array of points
+    :return: path and offset of mapped file or None when points are in memory
+    """
+    mapped = points
+    while mapped is not None and not isinstance(mapped, np.memmap):
+        mapped = mapped.base
+    if mapped is None or mapped.filename is None or not points.flags.c_contiguous \
+            or mapped.ctypes.data != points.ctypes.data:
+        return None
+    return mapped.filename, mapped.offset
+
+
+def _call_with_shared_points(function: Callable, argument: Any) -> Any:
+    """
+    function executed in worker, it passes shared points and other shared arrays to restart function
+    :param function: restart function
+    :param argument: argument of restart function
+    :return: result of restart function
+    """
+    return function(_shared_points, argument, **_shared_arrays)
+
+
+class RestartExecutor:
+    """
+    class that runs independent restarts of clustering algorithms in process pool. Points are copied once into shared
+    memory block and every worker reads them from there instead of getting its own pickled copy, memory mapped points
+    are not copied at all and workers map the same file. Other arrays that all restarts need (weights of points,
+    distance matrix) are shared the same way and passed to restart function as keyword arguments. With one worker
+    restarts are executed in current process
+    """
+    shared_memory: List[SharedMemory]
+    shared_arrays: dict
+    pool: ProcessPoolExecutor or None
+
+    def __init__(self, points: np.ndarray, workers: int, **arrays: np.ndarray or None) -> None:
+        """
+        :param points: array of points that all restarts work with
+        :param workers: number of worker processes
+        :param arrays: other arrays that all restarts work with, None values are left out
+        """
+        self.points = points
+        self.workers = workers
+        self.arrays = {key: array for key, array in arrays.items() if array is not None}
+        self.shared_memory = []
+        self.shared_arrays = {}
+        self.pool = None
+
+    def _share(self, key: str, array: np.ndarray) -> tuple[str, tuple, str]:
+        """
+        helper method that copies array into new shared memory block, view of block is kept, so main process can
+        change shared array between map calls
+        :param key: name of array
+        :param array: array that is shared
+        :return: name of block, shape and data type of array
+        """
+        shared_memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.shared_memory.append(shared_memory)
+        self.shared_arrays[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=shared_memory.buf)
+        self.shared_arrays[key][:] = array
+        return shared_memory.name, array.shape, array.dtype.str
+
+    def shared_array(self, key: str) -> np.ndarray:
+        """
+        method that returns array which workers see under key, values written into it are visible to restarts started
+        by next map call, so only ranges of array can be sent to workers instead of its copies
+        :param key: name of array passed to constructor
+        :return: shared array, or the array itself when restarts run in current process
+        """
+        return self.shared_arrays.get(key, self.arrays[key])
+
+    def __enter__(self) -> "RestartExecutor":
+        if self.workers > 1:
+            mapped_file = _mapped_file(self.points)
+            mapped_points = None if mapped_file is None else \
+                (*mapped_file, self.points.shape, self.points.dtype.str)
+            arrays = self.arrays if mapped_file is not None else {"points": self.points, **self.arrays}
+            blocks = {key: self._share(key, array) for key, array in arrays.items()}
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_attach_shared_arrays,
+                                            initargs=(mapped_points, blocks))
+        return self
+
+    def __exit__(self, *exception) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+        self.shared_arrays = {}
+        for shared_memory in self.shared_memory:
+            shared_memory.close()
+            shared_memory.unlink()
+        self.shared_memory = []
+
+    def map(self, function: Callable, arguments: Iterable) -> List:
+        """
+        method that runs function(points, argument, **arrays) for every argument, results keep order of arguments
+        :param function: module level restart function, it has to be picklable
+        :param arguments: arguments of restarts
+        :return: results of restarts
+        """
+        if self.pool is None:
+            return [function(self.points, argument, **self.arrays) for argument in arguments]
+        return list(self.pool.map(_call_with_shared_points, repeat(function), arguments))
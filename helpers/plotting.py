@@ -0,0 +1,28 @@
+import numpy as np
+
+from helpers.consts import PLOT_PATH
+
+
+def plot_clusters(points: np.ndarray, labels: np.ndarray, mode: str = "show", path: str = PLOT_PATH) -> None:
+    """
+    function that draws every cluster as scatter plot, matplotlib is imported only here, so clustering itself does not
+    pay for its import and can run without display. Points with more dimensions are drawn by their first two
+    coordinates and 1-d points on x axis
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :param mode: show opens window, save writes png file, off does nothing
+    :param path: png file used by save mode
+    """
+    if mode == "off":
+        return
+    from matplotlib import pyplot as plot
+
+    figure = plot.figure()
+    for label in np.unique(labels):
+        cluster = points[labels == label]
+        plot.scatter(cluster[:, 0], cluster[:, 1] if cluster.shape[1] > 1 else np.zeros(len(cluster)))
+    if mode == "save":
+        figure.savefig(path)
+        plot.close(figure)
+    else:
+        plot.show()
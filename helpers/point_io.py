@@ -0,0 +1,98 @@
+import itertools
+from typing import Iterator, Iterable
+
+import numpy as np
+
+
+def read_point_chunks(path: str, chunk_size: int, dtype: np.dtype = np.int32, dimensions: int = 2) \
+        -> Iterator[np.ndarray]:
+    """
+    function that reads points from file in chunks of fixed size, so whole file never has to be in memory. Supported
+    files are csv (one point per line), numpy .npy files and raw binary files with coordinates of given dtype
+    :param path: path to the file with points
+    :param chunk_size: number of points in one chunk
+    :param dtype: data type of raw binary file, csv files with float dtype are parsed as floats
+    :param dimensions: number of coordinates of every point in raw binary file
+    :return: iterator of (m, d) arrays with m <= chunk_size
+    """
+    text_dtype = np.int64 if np.issubdtype(dtype, np.integer) else dtype
+    if path.endswith(".csv") or path.endswith(".txt"):
+        with open(path) as file:
+            while True:
+                lines = list(itertools.islice(file, chunk_size))
+                if not lines:
+                    return
+                yield np.loadtxt(lines, delimiter=",", dtype=text_dtype, ndmin=2)
+    elif path.endswith(".npy"):
+        points = np.load(path, mmap_mode="r")
+        for start in range(0, len(points), chunk_size):
+            yield np.array(points[start:start + chunk_size])
+    else:
+        with open(path, "rb") as file:
+            while True:
+                chunk = np.fromfile(file, dtype=dtype, count=chunk_size * dimensions)
+                if len(chunk) == 0:
+                    return
+                yield chunk.reshape(-1, dimensions)
+
+
+def open_points(path: str, dtype: np.dtype = np.int32, dimensions: int = 2) -> np.ndarray:
+    """
+    function that opens whole file with points as (n, d) array without reading it, numpy .npy files and raw binary
+    files with coordinates of given dtype are memory mapped, so pages are loaded only when algorithm touches them and
+    algorithms read points directly from mapped file. Csv files can not be mapped, so they are parsed as given dtype
+    :param path: path to the file with points
+    :param dtype: data type of csv and raw binary file
+    :param dimensions: number of coordinates of every point in raw binary file, .npy and csv files carry their shape
+    :return: (n, d) read only array of points
+    """
+    if path.endswith(".csv") or path.endswith(".txt"):
+        return np.loadtxt(path, delimiter=",", dtype=dtype, ndmin=2)
+    elif path.endswith(".npy"):
+        points = np.load(path, mmap_mode="r")
+    else:
+        points = np.memmap(path, dtype=dtype, mode="r")
+        if len(points) % dimensions:
+            raise ValueError(f"{path} has {len(points)} values, it does not contain points of {dimensions} coordinates")
+        points = points.reshape(-1, dimensions)
+    if points.ndim != 2:
+        raise ValueError(f"{path} has shape {points.shape}, points must have shape (n, d)")
+    return points
+
+
+def write_array(path: str, values: np.ndarray) -> None:
+    """
+    function that writes labels or centers at once, .npy files are created as memory mapped arrays and filled in
+    place, csv and txt files get one row per line and other files get raw values in dtype of array
+    :param path: path to the output file
+    :param values: labels or centers
+    """
+    if path.endswith(".csv") or path.endswith(".txt"):
+        np.savetxt(path, values, fmt="%d" if np.issubdtype(values.dtype, np.integer) else "%.6f", delimiter=",")
+    elif path.endswith(".npy"):
+        mapped = np.lib.format.open_memmap(path, mode="w+", dtype=values.dtype, shape=values.shape)
+        mapped[:] = values
+        mapped.flush()
+        del mapped
+    else:
+        values.tofile(path)
+
+
+def write_labels(path: str, label_chunks: Iterable[np.ndarray]) -> int:
+    """
+    function that writes labels chunk by chunk as they are created, csv and txt files get one label per line, other
+    files get raw int32 values
+    :param path: path to the output file
+    :param label_chunks: iterable of label arrays
+    :return: number of written labels
+    """
+    written = 0
+    text = path.endswith(".csv") or path.endswith(".txt")
+    with open(path, "w" if text else "wb") as file:
+        for labels in label_chunks:
+            if text:
+                np.savetxt(file, labels, fmt="%d")
+            else:
+                labels.astype(np.int32).tofile(file)
+            written += len(labels)
+    return written
@@ -0,0 +1,104 @@
+import contextlib
+import json
+import timeit
+from typing import Callable, List, Iterator
+
+
+class Profiler:
+    """
+    class that collects where clustering algorithms spend time. Phases (seeding, assignment, update, evaluation,
+    plotting, ...) are timed by phase context manager, counters are added by count and every iteration of algorithm
+    is passed to registered callbacks. Everything can be exported as one report
+    """
+    enabled = True
+    phases: dict
+    counters: dict
+    callbacks: List[Callable[[dict], None]]
+
+    def __init__(self, callbacks: List[Callable[[dict], None]] = None) -> None:
+        """
+        :param callbacks: functions that are called with information about every iteration
+        """
+        self.phases = {}
+        self.counters = {}
+        self.callbacks = list(callbacks or [])
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        context manager that adds time spent inside it to given phase, phase can be entered many times
+        :param name: name of phase
+        """
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            seconds, calls = self.phases.get(name, (0.0, 0))
+            self.phases[name] = (seconds + timeit.default_timer() - start, calls + 1)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        method that adds amount to counter
+        :param name: name of counter
+        :param amount: how much is added
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def iteration(self, **info) -> None:
+        """
+        method that passes information about finished iteration to all callbacks
+        :param info: algorithm, restart, iteration and other values describing iteration
+        """
+        for callback in self.callbacks:
+            callback(info)
+
+    def merge(self, report: dict) -> None:
+        """
+        method that adds phases and counters of report, it is used for reports created in worker processes
+        :param report: report created by report method
+        """
+        for name, phase in report["phases"].items():
+            seconds, calls = self.phases.get(name, (0.0, 0))
+            self.phases[name] = (seconds + phase["seconds"], calls + phase["calls"])
+        for name, amount in report["counters"].items():
+            self.count(name, amount)
+
+    def report(self) -> dict:
+        """
+        method that exports collected data
+        :return: dictionary with seconds and calls of every phase and values of counters
+        """
+        phases = {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in self.phases.items()}
+        return {"phases": phases, "counters": dict(self.counters)}
+
+    def save(self, path: str) -> None:
+        """
+        method that writes report to json file
+        :param path: path to json file
+        """
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+
+class NullProfiler(Profiler):
+    """
+    profiler that is used when profiling is disabled, all methods do nothing and phase returns one shared empty context
+    manager, so instrumented code pays only for method call
+    """
+    enabled = False
+    _empty_phase = contextlib.nullcontext()
+
+    def phase(self, name: str) -> contextlib.nullcontext:
+        return self._empty_phase
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def iteration(self, **info) -> None:
+        pass
+
+    def merge(self, report: dict) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
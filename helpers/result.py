@@ -0,0 +1,35 @@
+import numpy as np
+
+
+class ClusteringResult:
+    """
+    class that holds compact result of clustering algorithm, it is returned by fit method of every algorithm, so
+    algorithms can be used as library without console output and plots
+    """
+    labels: np.ndarray or None
+    centers: np.ndarray
+    inertia: float
+    success_rate: float
+    time: float
+    iterations: int
+    distances_computed: int
+
+    def __init__(self, labels: np.ndarray or None, centers: np.ndarray, inertia: float, success_rate: float,
+                 time: float, iterations: int, distances_computed: int) -> None:
+        """
+        :param labels: (n,) index of cluster for every point in order of input points, None when labels were streamed
+        to file
+        :param centers: (k, d) array of cluster centers, row of center is its label
+        :param inertia: sum of squared distances of points to their centers
+        :param success_rate: % of clusters whose average distance from center is at most 500
+        :param time: seconds spent by clustering
+        :param iterations: number of iterations of algorithm
+        :param distances_computed: number of calculated distances
+        """
+        self.labels = labels
+        self.centers = centers
+        self.inertia = inertia
+        self.success_rate = success_rate
+        self.time = time
+        self.iterations = iterations
+        self.distances_computed = distances_computed
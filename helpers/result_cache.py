@@ -0,0 +1,148 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from helpers.consts import CACHE_DIRECTORY, CACHE_MAX_BYTES
+from helpers.measurements import as_points
+from helpers.result import ClusteringResult
+
+
+class ResultCache:
+    """
+    class that stores results of clustering jobs on disk, so the same job is not computed again. Every result is one
+    .npz file named by hash of points, hash of algorithm parameters and k, so runs of the same points and parameters
+    with other k can be found by file name. Modification time of file is time of its last use and the least recently
+    used files are removed when directory grows over max_bytes
+    """
+
+    def __init__(self, directory: str = CACHE_DIRECTORY, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        """
+        :param directory: directory with cached results, it is created when it does not exist
+        :param max_bytes: size of directory after which the least recently used results are removed
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def points_key(points: np.ndarray) -> str:
+        """
+        method that hashes points the same way algorithms see them, as (n, d) int32 or float32 array, so generated
+        lists and arrays loaded from files give the same key, data type of float points is hashed too, so they never
+        share key with integer points of the same bytes
+        :param points: points of job
+        :return: hash of points
+        """
+        points = as_points(points)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(points.shape).encode())
+        if not np.issubdtype(points.dtype, np.integer):
+            digest.update(points.dtype.str.encode())
+        digest.update(memoryview(points).cast("B"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def parameters_key(parameters: dict) -> str:
+        """
+        method that hashes parameters of algorithm except k
+        :param parameters: json serializable parameters that change result of algorithm
+        :return: hash of parameters
+        """
+        return hashlib.blake2b(json.dumps(parameters, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+    def _path(self, points_key: str, parameters_key: str, k: int) -> str:
+        """
+        helper method that returns file of one result
+        :param points_key: hash of points
+        :param parameters_key: hash of parameters
+        :param k: number of clusters
+        :return: path to .npz file
+        """
+        return os.path.join(self.directory, f"{points_key}-{parameters_key}-k{k}.npz")
+
+    @staticmethod
+    def _load(path: str) -> ClusteringResult or None:
+        """
+        helper method that reads result from file and marks it as used, file removed by other process is a miss
+        :param path: path to .npz file
+        :return: stored result or None
+        """
+        try:
+            with np.load(path) as stored:
+                inertia, success_rate, time, iterations, distances_computed = stored["stats"].tolist()
+                result = ClusteringResult(stored["labels"], stored["centers"], inertia, success_rate, time,
+                                          int(iterations), int(distances_computed))
+            os.utime(path)
+        except OSError:
+            return None
+        return result
+
+    def get(self, points_key: str, parameters_key: str, k: int) -> ClusteringResult or None:
+        """
+        method that returns stored result of job
+        :param points_key: hash of points
+        :param parameters_key: hash of parameters
+        :param k: number of clusters
+        :return: stored result or None when job was not cached
+        """
+        return self._load(self._path(points_key, parameters_key, k))
+
+    def nearest(self, points_key: str, parameters_key: str, k: int) -> ClusteringResult or None:
+        """
+        method that finds stored result of the same points and parameters whose k is the closest to given k, on tie the
+        smaller k wins, it is used as warm start when only k differs
+        :param points_key: hash of points
+        :param parameters_key: hash of parameters
+        :param k: number of clusters
+        :return: stored result or None when there is no such result
+        """
+        prefix = self._path(points_key, parameters_key, 0)[:-len("0.npz")]
+        stored_ks = [int(path[len(prefix):-len(".npz")]) for path in glob.glob(f"{prefix}*.npz")]
+        stored_ks = [stored_k for stored_k in stored_ks if stored_k != k]
+        if not stored_ks:
+            return None
+        return self._load(self._path(points_key, parameters_key, min(stored_ks, key=lambda x: (abs(x - k), x))))
+
+    def put(self, points_key: str, parameters_key: str, k: int, result: ClusteringResult) -> None:
+        """
+        method that stores result of job, file is written under temporary name and renamed, so other processes never
+        read half written result, then the least recently used results are evicted
+        :param points_key: hash of points
+        :param parameters_key: hash of parameters
+        :param k: number of clusters
+        :param result: result of algorithm with labels
+        """
+        path = self._path(points_key, parameters_key, k)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        stats = np.array([result.inertia, result.success_rate, result.time, result.iterations,
+                          result.distances_computed], dtype=np.float64)
+        with open(temporary_path, "wb") as file:
+            np.savez(file, labels=np.asarray(result.labels, dtype=np.int32), centers=result.centers, stats=stats)
+        os.replace(temporary_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        helper method that removes the least recently used results until directory fits into max_bytes, the newest
+        result is always kept
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.npz")):
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            entries.append((status.st_mtime_ns, status.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,244 @@
+import math
+
+import numpy as np
+
+from helpers.consts import KD_TREE_LEAF_SIZE, GRID_POINTS_PER_CELL, GRID_REFINEMENTS
+
+
+class KDTree:
+    """
+    class that implements static kd-tree over set of points, usually over cluster centers. Nearest point is found for
+    whole batch of queries at once, every query first descends to its own leaf to get upper bound and then tree is
+    walked level by level for all (query, node) pairs whose box can still contain closer point. Only squared distances
+    are compared, they are exact for integer coordinates and on tie point with lower index wins, so results are the
+    same as argmin over all squared distances
+    """
+    lows: np.ndarray
+    highs: np.ndarray
+    axes: np.ndarray
+    split_values: np.ndarray
+    children: np.ndarray
+    leaf_indexes: np.ndarray
+    distances_computed: int
+
+    def __init__(self, points: np.ndarray, leaf_size: int = KD_TREE_LEAF_SIZE) -> None:
+        """
+        :param points: (k, 2) array of points the tree is built over
+        :param leaf_size: maximal number of points in leaf
+        """
+        self.points = np.asarray(points, dtype=np.float64)
+        self.leaf_size = leaf_size
+        self.distances_computed = 0
+        self._build()
+
+    def _build(self) -> None:
+        """
+        method that builds tree by splitting points in half along axis with larger spread until leaves are small
+        enough, nodes are stored in flat arrays in order of creation and children of leaves are -1
+        """
+        lows, highs, axes, split_values, children, leaves = [], [], [], [], [], []
+        node_indexes = [np.arange(len(self.points))]
+        node = 0
+        while node < len(node_indexes):
+            indexes = node_indexes[node]
+            node_points = self.points[indexes]
+            lows.append(node_points.min(axis=0))
+            highs.append(node_points.max(axis=0))
+            if len(indexes) <= self.leaf_size:
+                axes.append(0)
+                split_values.append(0.0)
+                children.append((-1, -1))
+                leaves.append(np.pad(indexes, (0, self.leaf_size - len(indexes)), constant_values=-1))
+            else:
+                axis = int(np.argmax(highs[-1] - lows[-1]))
+                order = indexes[np.argsort(node_points[:, axis], kind="stable")]
+                half = len(order) // 2
+                axes.append(axis)
+                split_values.append(self.points[order[half], axis])
+                children.append((len(node_indexes), len(node_indexes) + 1))
+                leaves.append(np.full(self.leaf_size, -1))
+                node_indexes.extend([order[:half], order[half:]])
+            node += 1
+        self.lows = np.array(lows)
+        self.highs = np.array(highs)
+        self.axes = np.array(axes)
+        self.split_values = np.array(split_values)
+        self.children = np.array(children, dtype=np.int64)
+        self.leaf_indexes = np.array(leaves, dtype=np.int64)
+
+    def _box_distances(self, queries: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """
+        method that calculates squared distance from every query to box of its paired node, no point in node can be
+        closer
+        :param queries: (m, 2) array of query points
+        :param nodes: (m,) array of nodes paired with queries
+        :return: (m,) squared distances truncated to int
+        """
+        outside = np.maximum(np.maximum(self.lows[nodes] - queries, queries - self.highs[nodes]), 0)
+        return (outside ** 2).sum(axis=1).astype(np.int64)
+
+    def _leaf_keys(self, queries: np.ndarray, leaves: np.ndarray) -> np.ndarray:
+        """
+        method that calculates squared distances from every query to points of its paired leaf and encodes them as
+        squared distance * k + index, so minimal key is the closest point and on tie the one with lower index
+        :param queries: (m, 2) array of query points
+        :param leaves: (m,) array of leaf nodes paired with queries
+        :return: (m,) minimal key of every pair
+        """
+        indexes = self.leaf_indexes[leaves]
+        self.distances_computed += int(np.count_nonzero(indexes >= 0))
+        differences = self.points[indexes] - queries[:, np.newaxis, :]
+        keys = (differences ** 2).sum(axis=2).astype(np.int64) * len(self.points) + indexes
+        keys[indexes < 0] = np.iinfo(np.int64).max
+        return keys.min(axis=1)
+
+    def _descend(self, queries: np.ndarray) -> np.ndarray:
+        """
+        method that finds leaf for every query by following split values from root
+        :param queries: (n, 2) array of query points
+        :return: (n,) leaf node of every query
+        """
+        nodes = np.zeros(len(queries), dtype=np.int64)
+        internal = np.flatnonzero(self.children[nodes, 0] >= 0)
+        while len(internal) > 0:
+            current = nodes[internal]
+            right = queries[internal, self.axes[current]] >= self.split_values[current]
+            nodes[internal] = self.children[current, right.astype(np.int64)]
+            internal = internal[self.children[nodes[internal], 0] >= 0]
+        return nodes
+
+    def query(self, queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        method that finds the closest tree point for every query
+        :param queries: (n, 2) array of query points
+        :return: (n,) index of the closest point and (n,) squared distance to it
+        """
+        queries = np.asarray(queries, dtype=np.float64)
+        k = len(self.points)
+        best = self._leaf_keys(queries, self._descend(queries))
+        pair_queries = np.arange(len(queries))
+        pair_nodes = np.zeros(len(queries), dtype=np.int64)
+        while len(pair_queries) > 0:
+            keep = self._box_distances(queries[pair_queries], pair_nodes) * k <= best[pair_queries]
+            pair_queries, pair_nodes = pair_queries[keep], pair_nodes[keep]
+            leaf = self.children[pair_nodes, 0] < 0
+            leaf_queries = pair_queries[leaf]
+            np.minimum.at(best, leaf_queries, self._leaf_keys(queries[leaf_queries], pair_nodes[leaf]))
+            pair_queries = np.repeat(pair_queries[~leaf], 2)
+            pair_nodes = self.children[pair_nodes[~leaf]].ravel()
+        return best % k, best // k
+
+
+class GridIndex:
+    """
+    class that implements bucketed uniform grid over 2-d points whose positions can change, point is removed before it
+    moves and inserted again after. Nearest other point is found by searching rings of cells around point until ring is
+    farther than the closest point found so far. Coordinate arrays are shared with owner of the grid
+    """
+    cells: dict
+    distances_computed: int
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, slots: np.ndarray,
+                 points_per_cell: float = GRID_POINTS_PER_CELL) -> None:
+        """
+        :param x: x coordinates of all slots, array is read when slot is inserted or searched
+        :param y: y coordinates of all slots
+        :param slots: slots that are inserted into grid
+        :param points_per_cell: average number of points in one cell, it sets size of cells
+        """
+        self.x = x
+        self.y = y
+        self.points_per_cell = points_per_cell
+        self.distances_computed = 0
+        self.build(slots)
+
+    def build(self, slots: np.ndarray) -> None:
+        """
+        method that creates cells again for given slots, cell size is set so that occupied cells hold points_per_cell
+        points on average. Points are usually in dense groups, so size is first calculated from whole bounding box and
+        then refined few times from area of cells that are really occupied. It is called again when number of points
+        drops and cells become too sparse
+        :param slots: slots that are inserted into grid
+        """
+        x, y = self.x[slots], self.y[slots]
+        self.origin_x, self.origin_y = float(x.min()), float(y.min())
+        width = max(float(x.max()) - self.origin_x, float(y.max()) - self.origin_y, 1.0)
+        self.cell_size = max(width * math.sqrt(self.points_per_cell / len(slots)), 1.0)
+        for _ in range(GRID_REFINEMENTS):
+            cells = np.unique(np.stack([(x - self.origin_x) // self.cell_size, (y - self.origin_y) // self.cell_size]),
+                              axis=1)
+            self.cell_size = max(self.cell_size * math.sqrt(self.points_per_cell * cells.shape[1] / len(slots)), 1.0)
+        self.max_ring = int(width / self.cell_size) + 1
+        self.size = len(slots)
+        self.cells = {}
+        for slot in slots.tolist():
+            self.insert(slot)
+
+    def _cell(self, slot: int) -> tuple[int, int]:
+        """
+        method that returns cell of slot
+        :param slot: slot of point
+        :return: column and row of cell
+        """
+        column = int((self.x[slot] - self.origin_x) // self.cell_size)
+        return column, int((self.y[slot] - self.origin_y) // self.cell_size)
+
+    def insert(self, slot: int) -> None:
+        """
+        method that adds slot to cell of its current position
+        :param slot: slot of point
+        """
+        self.cells.setdefault(self._cell(slot), []).append(slot)
+
+    def remove(self, slot: int) -> None:
+        """
+        method that removes slot from cell of its current position, it has to be called before point moves
+        :param slot: slot of point
+        """
+        cell = self._cell(slot)
+        self.cells[cell].remove(slot)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def _ring(self, column: int, row: int, ring: int) -> list:
+        """
+        method that returns all slots in cells whose chebyshev distance from given cell is ring
+        :param column: column of center cell
+        :param row: row of center cell
+        :param ring: distance of cells in cells
+        :return: slots in ring
+        """
+        if ring == 0:
+            return list(self.cells.get((column, row), ()))
+        slots = []
+        for i in range(-ring, ring + 1):
+            for cell in ((column + i, row - ring), (column + i, row + ring)):
+                slots.extend(self.cells.get(cell, ()))
+        for j in range(-ring + 1, ring):
+            for cell in ((column - ring, row + j), (column + ring, row + j)):
+                slots.extend(self.cells.get(cell, ()))
+        return slots
+
+    def nearest(self, slot: int) -> tuple[int, float]:
+        """
+        method that finds the closest other point of slot, distances are float32 like distances of centroid linkage
+        and on tie slot with lower index wins. Rings are searched while they can contain closer point
+        :param slot: slot of point
+        :return: the closest other slot and distance to it, (-1, inf) when slot is alone in grid
+        """
+        column, row = self._cell(slot)
+        best_slot, best_distance = -1, np.inf
+        for ring in range(self.max_ring + 1):
+            candidates = np.array(self._ring(column, row, ring), dtype=np.int64)
+            candidates = candidates[candidates != slot]
+            if len(candidates) > 0:
+                self.distances_computed += len(candidates)
+                difference_x = self.x[candidates] - self.x[slot]
+                difference_y = self.y[candidates] - self.y[slot]
+                distances = np.sqrt(difference_x * difference_x + difference_y * difference_y).astype(np.float32)
+                closest = np.lexsort((candidates, distances))[0]
+                if (distances[closest], candidates[closest]) < (best_distance, best_slot):
+                    best_slot, best_distance = int(candidates[closest]), float(distances[closest])
+            if best_distance < ring * self.cell_size:
+                break
+        return best_slot, best_distance
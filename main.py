@@ -1,10 +1,26 @@
 import argparse
+from typing import List
+
+import numpy as np
 
 from algorithms.agglomerative_clustering import AgglomerativeClustering
+from algorithms.coreset_k_means import CoresetKMeans
 from algorithms.divisive_clustering import DivisiveClustering
 from algorithms.k_means import KMeans
-from helpers.consts import NUM_OF_POINTS
+from algorithms.k_means_model import KMeansModel
+from algorithms.mini_batch_k_means import MiniBatchKMeans
+from helpers.consts import NUM_OF_POINTS, ENGINES, NUM_OF_SEED_POINTS, MINI_BATCH_SIZE, MINI_BATCH_PASSES, \
+    INIT_STRATEGIES, K_MEANS_ITERATIONS, DIVISIVE_ITERATIONS, TOLERANCE, MAX_ITERATIONS, PLOT_MODES, PLOT_PATH, \
+    INPUT_DTYPES, SILHOUETTE_SAMPLE, CACHE_DIRECTORY, CACHE_MAX_BYTES, CF_THRESHOLD, \
+    CORESET_SIZE
+from helpers.evaluation import silhouette
 from helpers.generator import Generator
+from helpers.measurements import as_points, integer_points
+from helpers.plotting import plot_clusters
+from helpers.point_io import open_points, write_array
+from helpers.profiling import Profiler, NULL_PROFILER
+from helpers.result_cache import ResultCache
+from helpers.result import ClusteringResult
 
 
 def main() -> None:
@@ -15,26 +31,295 @@ def main() -> None:
     ap.add_argument("-a", "--algorithm", required=True,
                     help="which algorithm to use (centroid k-means = c, medoid k-means = m, divisive = d)")
     ap.add_argument("-k", "--clusters", required=True, help="number of clusters (0 <x> points generated")
+    ap.add_argument("-e", "--engine", default="python",
+                    help=f"engine used by k-means and agglomerative ({', '.join(ENGINES)})")
+    ap.add_argument("-n", "--points", type=int, default=NUM_OF_POINTS, help="number of generated points")
+    ap.add_argument("--seeds", type=int, default=NUM_OF_SEED_POINTS,
+                    help="number of random points that rest of the points is generated around")
+    ap.add_argument("--init", default="random",
+                    help=f"how initial centers of k-means and divisive are chosen ({', '.join(INIT_STRATEGIES)})")
+    ap.add_argument("-r", "--restarts", type=int,
+                    help=f"number of restarts (k-means default {K_MEANS_ITERATIONS}, divisive {DIVISIVE_ITERATIONS})")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE,
+                    help="k-means and divisive stop when no center moves more than this distance")
+    ap.add_argument("--max-iterations", type=int, default=MAX_ITERATIONS,
+                    help="maximal number of iterations of one k-means restart or divisive split")
+    ap.add_argument("--index", action="store_true",
+                    help="use spatial index for closest center (k-means, divisive) and closest cluster (agglomerative)")
+    ap.add_argument("-w", "--workers", type=int, default=1,
+                    help="number of processes that run k-means and divisive restarts in parallel")
+    ap.add_argument("--bisecting", action="store_true",
+                    help="divisive only, always split cluster with the largest SSE, workers split clusters in parallel")
+    ap.add_argument("--bulk", action="store_true", help="generate points in vectorized batches (for large -n)")
+    ap.add_argument("-d", "--dimensions", type=int,
+                    help="generate float32 points with this number of dimensions instead of 2-d integer points, with "
+                         "raw binary --input it is number of coordinates of every point (default 2)")
+    ap.add_argument("--mini-batch", action="store_true",
+                    help="stream points from --input with mini-batch centroid k-means and write labels to --output")
+    ap.add_argument("-i", "--input",
+                    help="csv, .npy or raw binary (x, y pairs or --dimensions coordinates) file with points, binary "
+                         "files are memory mapped and used instead of generated points, float files stay float32")
+    ap.add_argument("--dtype", default="int32",
+                    help=f"data type of csv and raw binary input ({', '.join(INPUT_DTYPES)})")
+    ap.add_argument("-o", "--output",
+                    help="file where labels are written (csv/txt as text, .npy, otherwise raw int32)")
+    ap.add_argument("--centers", help="file where centers are written (csv/txt as text, .npy, otherwise raw float64)")
+    ap.add_argument("--batch-size", type=int, default=MINI_BATCH_SIZE, help="points processed at once in mini-batch")
+    ap.add_argument("--passes", type=int, default=MINI_BATCH_PASSES, help="number of mini-batch passes over input")
+    ap.add_argument("--profile", help="json file where time of algorithm phases and counters are written")
+    ap.add_argument("--plot", default="show",
+                    help=f"show plot of clusters, save it to --plot-path or turn it off ({', '.join(PLOT_MODES)})")
+    ap.add_argument("--plot-path", default=PLOT_PATH, help="png file where plot is saved with --plot save")
+    ap.add_argument("--silhouette", type=int, nargs="?", const=SILHOUETTE_SAMPLE,
+                    help=f"print silhouette score of sampled points (default sample {SILHOUETTE_SAMPLE})")
+    ap.add_argument("--linkage", help="agglomerative only, .npy file where whole merge tree is written")
+    ap.add_argument("--cut", type=int, nargs="+",
+                    help="agglomerative only, also print success rate and inertia for these numbers of clusters")
+    ap.add_argument("--cf", type=float, nargs="?", const=CF_THRESHOLD,
+                    help=f"agglomerative only, merge subclusters of cf-tree with this radius (default {CF_THRESHOLD})")
+    ap.add_argument("--coreset", type=int, nargs="?", const=CORESET_SIZE,
+                    help=f"k-means only, run restarts on weighted coreset of this size (default {CORESET_SIZE})")
+    ap.add_argument("--cache", nargs="?", const=CACHE_DIRECTORY,
+                    help=f"directory where results are cached by hash of points and arguments ({CACHE_DIRECTORY})")
+    ap.add_argument("--cache-size", type=int, default=CACHE_MAX_BYTES // 2 ** 20,
+                    help="size of cache in MiB, the least recently used results are removed above it")
+    ap.add_argument("--model",
+                    help="centroid k-means only, .npz file where model for predict and partial_fit is written")
+    ap.add_argument("--warm-start", action="store_true",
+                    help="k-means only, start first restart from centers of cached run with the closest k")
     args = vars(ap.parse_args())
+    profiler = Profiler() if args["profile"] else NULL_PROFILER
     if args["algorithm"] not in ['c', 'm', 'd', 'a']:
         print("Select valid argument -a (centroid k-means = c, medoid k-means = m, divisive = d)")
         return
+    if args["plot"] not in PLOT_MODES:
+        print(f"Select valid argument --plot ({', '.join(PLOT_MODES)})")
+        return
+    if args["dtype"] not in INPUT_DTYPES:
+        print(f"Select valid argument --dtype ({', '.join(INPUT_DTYPES)})")
+        return
+    if args["engine"] not in ENGINES:
+        print(f"Select valid argument -e ({', '.join(ENGINES)})")
+        return
+    if args["engine"] == "elkan" and args["algorithm"] != "c":
+        print("Engine elkan can be used only with centroid k-means (-a c)")
+        return
     try:
         int(args['clusters'])
     except ValueError:
         print("Argument -k must be a number")
         return
-    if int(args['clusters']) < 1 or int(args['clusters']) > NUM_OF_POINTS:
-        print(f"Argument -k must be 0<k>{NUM_OF_POINTS}")
+    if args["dimensions"] is not None and args["dimensions"] < 1:
+        print("Argument --dimensions must be positive")
+        return
+    if args["mini_batch"]:
+        if args["algorithm"] != "c" or not args["input"] or not args["output"]:
+            print("Mini-batch mode needs -a c, --input and --output")
+            return
+        if int(args["clusters"]) < 1 or args["batch_size"] < 1 or args["passes"] < 0:
+            print("Arguments -k and --batch-size must be positive and --passes can not be negative")
+            return
+        clustering = MiniBatchKMeans(args["input"], int(args["clusters"]), args["output"], args["batch_size"],
+                                     args["passes"], profiler, args["dtype"], args["dimensions"] or 2)
+        result = clustering.run(args["plot"], args["plot_path"])
+        _save_result(result, None, args["centers"])
+        _save_profile(profiler, args["profile"])
+        return
+    if args["init"] not in INIT_STRATEGIES:
+        print(f"Select valid argument --init ({', '.join(INIT_STRATEGIES)})")
+        return
+    if args["restarts"] is not None and args["restarts"] < 1:
+        print("Argument -r must be positive")
+        return
+    if args["tolerance"] < 0 or args["max_iterations"] < 1:
+        print("Argument --tolerance can not be negative and --max-iterations must be positive")
+        return
+    if args["index"] and (args["algorithm"] == "m" or args["engine"] == "elkan" or
+                          (args["algorithm"] == "a" and args["engine"] != "numpy")):
+        print("Spatial index can be used with -a c (python or numpy engine), -a d and -a a with numpy engine")
+        return
+    if args["bisecting"] and args["algorithm"] != "d":
+        print("Bisecting mode can be used only with divisive clustering (-a d)")
+        return
+    if args["workers"] < 1:
+        print("Argument -w must be positive")
+        return
+    if args["silhouette"] is not None and args["silhouette"] < 1:
+        print("Argument --silhouette must be positive")
+        return
+
+    if args["input"]:
+        try:
+            created_points = open_points(args["input"], np.dtype(args["dtype"]), args["dimensions"] or 2)
+        except (OSError, ValueError) as error:
+            print(f"Input file can not be opened: {error}")
+            return
+    else:
+        if args["seeds"] < 1 or args["seeds"] > args["points"]:
+            print("Argument --seeds must be 0<seeds>=points")
+            return
+        generator = Generator(args["points"], args["seeds"])
+        if args["dimensions"] is not None:
+            created_points = generator.generate_float_array(args["dimensions"])
+        elif args["bulk"]:
+            created_points = generator.generate_array()
+        else:
+            created_points = generator.generate_points()
+    if int(args['clusters']) < 1 or int(args['clusters']) > len(created_points):
+        print(f"Argument -k must be 0<k>{len(created_points)}")
+        return
+    if (args["linkage"] or args["cut"]) and args["algorithm"] != "a":
+        print("Arguments --linkage and --cut can be used only with agglomerative clustering (-a a)")
+        return
+    if args["cut"] and not all(0 < k <= len(created_points) for k in args["cut"]):
+        print(f"Argument --cut must be 0<k>{len(created_points)}")
+        return
+    if args["cf"] is not None and (args["algorithm"] != "a" or args["cf"] < 0):
+        print("Argument --cf can be used only with agglomerative clustering (-a a) and can not be negative")
+        return
+    if args["coreset"] is not None and (args["algorithm"] not in ['c', 'm'] or args["coreset"] < 1):
+        print("Argument --coreset can be used only with k-means (-a c or -a m) and must be positive")
+        return
+    if args["model"] and args["algorithm"] != "c":
+        print("Argument --model can be used only with centroid k-means (-a c)")
+        return
+    if args["warm_start"] and (not args["cache"] or args["algorithm"] not in ['c', 'm']):
+        print("Argument --warm-start needs --cache and k-means (-a c or -a m)")
+        return
+    if args["cache_size"] < 0:
+        print("Argument --cache-size can not be negative")
         return
+    points = as_points(created_points)
+    if args["index"] and (points.shape[1] != 2 or not integer_points(points)):
+        print(f"Spatial index can be used only with 2-d integer points, points have {points.shape[1]} dimensions "
+              f"of {points.dtype}")
+        return
+
+    k = int(args["clusters"])
+    cache = ResultCache(args["cache"], args["cache_size"] * 2 ** 20) if args["cache"] else None
+    result = None
+    if cache is not None:
+        points_key = ResultCache.points_key(points)
+        parameters_key = ResultCache.parameters_key(_cache_parameters(args))
+        if not args["cut"] and not args["linkage"] and not args["model"]:
+            result = cache.get(points_key, parameters_key, k)
+    if result is not None:
+        print(f"Result with {k} clusters loaded from cache {args['cache']}")
+        print(f"Cluster success rate {result.success_rate} %")
+        plot_clusters(points, result.labels, args["plot"], args["plot_path"])
+    else:
+        warm_start = None
+        if args["warm_start"]:
+            seed = cache.nearest(points_key, parameters_key, k)
+            if seed is not None:
+                print(f"Warm start from cached result with {len(seed.centers)} clusters")
+                warm_start = seed.centers
+        clustering = _create_clustering(args, created_points, profiler, warm_start)
+        try:
+            result = clustering.run(args["plot"], args["plot_path"])
+        except ValueError as error:
+            if args["cf"] is None:
+                raise
+            print(f"Clusters can not be created from cf-tree: {error} (use smaller --cf)")
+            return
+        if cache is not None and warm_start is None:
+            cache.put(points_key, parameters_key, k, result)
+        if args["algorithm"] == "a":
+            _cut_dendrogram(clustering, args["cut"] or [], args["linkage"])
+        if args["model"]:
+            KMeansModel.from_k_means(clustering).save(args["model"])
+            print(f"Model with {len(result.centers)} centers written to {args['model']}")
+    if args["silhouette"] is not None:
+        score = silhouette(points, result.labels, len(result.centers), args["silhouette"])
+        print(f"Silhouette score {score}")
+    _save_result(result, args["output"], args["centers"])
+    _save_profile(profiler, args["profile"])
 
-    created_points = Generator().generate_points()
+
+def _create_clustering(args: dict, created_points: List[List[int]] or np.ndarray, profiler: Profiler,
+                       warm_start: np.ndarray or None) \
+        -> KMeans or CoresetKMeans or AgglomerativeClustering or DivisiveClustering:
+    """
+    function that creates clustering algorithm selected by arguments
+    :param args: parsed arguments
+    :param created_points: generated or loaded points
+    :param profiler: profiler passed to algorithm
+    :param warm_start: centers of cached run for k-means or None
+    :return: algorithm ready to run
+    """
+    if args["coreset"] is not None:
+        return CoresetKMeans(created_points, int(args["clusters"]), args["algorithm"], args["engine"], args["workers"],
+                             args["init"], args["restarts"] or K_MEANS_ITERATIONS, args["tolerance"],
+                             args["max_iterations"], args["index"], profiler, warm_start, args["coreset"])
     if args['algorithm'] == 'c' or args['algorithm'] == 'm':
-        KMeans(created_points, int(args["clusters"]), args["algorithm"]).run()
+        return KMeans(created_points, int(args["clusters"]), args["algorithm"], args["engine"], args["workers"],
+                      args["init"], args["restarts"] or K_MEANS_ITERATIONS, args["tolerance"], args["max_iterations"],
+                      args["index"], profiler, warm_start)
     elif args['algorithm'] == 'a':
-        AgglomerativeClustering(created_points, int(args["clusters"]), args["algorithm"]).run()
-    else:
-        DivisiveClustering(created_points, int(args["clusters"]), args["algorithm"]).run()
+        return AgglomerativeClustering(created_points, int(args["clusters"]), args["algorithm"], args["engine"],
+                                       args["index"], profiler, args["cf"])
+    return DivisiveClustering(created_points, int(args["clusters"]), args["algorithm"], args["workers"], args["init"],
+                              args["restarts"] or DIVISIVE_ITERATIONS, args["tolerance"], args["max_iterations"],
+                              args["index"], profiler, args["bisecting"])
+
+
+def _cache_parameters(args: dict) -> dict:
+    """
+    function that selects arguments that change result of algorithm, number of workers and output arguments do not
+    change it and k is part of cache key on its own
+    :param args: parsed arguments
+    :return: parameters hashed into cache key
+    """
+    restarts = args["restarts"] or (DIVISIVE_ITERATIONS if args["algorithm"] == "d" else K_MEANS_ITERATIONS)
+    return {"algorithm": args["algorithm"], "engine": args["engine"], "init": args["init"], "restarts": restarts,
+            "tolerance": args["tolerance"], "max_iterations": args["max_iterations"], "index": args["index"],
+            "bisecting": args["bisecting"], "cf": args["cf"],
+            "coreset": args["coreset"]}
+
+
+def _cut_dendrogram(clustering: AgglomerativeClustering, ks: List[int], linkage_path: str or None) -> None:
+    """
+    function that prints clusters cut from merge tree of agglomerative clustering for every k and saves the tree when
+    it was requested
+    :param clustering: fitted agglomerative clustering
+    :param ks: numbers of clusters from --cut argument
+    :param linkage_path: file from --linkage argument
+    """
+    for k in ks:
+        if k > clustering.dendrogram.num_of_points:
+            print(f"{k} clusters: merge tree has only {clustering.dendrogram.num_of_points} leaves")
+            continue
+        result = clustering.cut(k)
+        print(f"{k} clusters: success rate {result.success_rate} %, inertia {result.inertia}")
+    if linkage_path:
+        clustering.dendrogram.save(linkage_path)
+        print(f"Merge tree of {clustering.dendrogram.num_of_points} leaves written to {linkage_path}")
+
+
+def _save_result(result: ClusteringResult, labels_path: str or None, centers_path: str or None) -> None:
+    """
+    function that writes labels (as int32) and centers of result when output files were requested
+    :param result: result of algorithm
+    :param labels_path: file from --output argument
+    :param centers_path: file from --centers argument
+    """
+    if labels_path:
+        write_array(labels_path, result.labels.astype(np.int32))
+        print(f"Labels of {len(result.labels)} points written to {labels_path}")
+    if centers_path:
+        write_array(centers_path, result.centers.astype(np.float64))
+        print(f"{len(result.centers)} centers written to {centers_path}")
+
+
+def _save_profile(profiler: Profiler, path: str or None) -> None:
+    """
+    function that writes profiler report when profiling was requested
+    :param profiler: profiler used by algorithm
+    :param path: json file from --profile argument
+    """
+    if path:
+        profiler.save(path)
+        print(f"Profile written to {path}")
 
 
 if __name__ == '__main__':
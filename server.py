@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import sys
+
+from helpers.cluster_server import ClusterServer
+from helpers.consts import SERVER_HOST, SERVER_PORT
+
+
+def main() -> int:
+    """
+    main function of clustering worker, it keeps datasets in memory and runs cluster jobs sent by helpers.cluster_server
+    request function (or any client that sends json lines) until shutdown request
+    :return: exit code
+    """
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-s", "--socket", help="path of unix socket, localhost port is used when it is not given")
+    ap.add_argument("--host", default=SERVER_HOST, help="host of tcp socket")
+    ap.add_argument("-p", "--port", type=int, default=SERVER_PORT, help="port of tcp socket")
+    ap.add_argument("-w", "--workers", type=int, default=1, help="number of processes, jobs that run at once")
+    args = vars(ap.parse_args())
+    if args["workers"] < 1:
+        print("Argument -w must be positive")
+        return 2
+    try:
+        asyncio.run(ClusterServer(args["workers"]).serve(args["socket"], args["host"], args["port"]))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.generator import Generator  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def points() -> np.ndarray:
+    """
+    fixture with small generated dataset of 2-d integer points, it is shared by all tests and must not be modified
+    :return: (1500, 2) int32 array of points
+    """
+    return Generator(1500, 20).generate_array()
+
+
+@pytest.fixture(scope="session")
+def float_points() -> np.ndarray:
+    """
+    fixture with small generated dataset of 8-d float points
+    :return: (600, 8) float32 array of points
+    """
+    return Generator(600, 10).generate_float_array(8)
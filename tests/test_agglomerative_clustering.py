@@ -0,0 +1,23 @@
+import numpy as np
+
+from algorithms.agglomerative_clustering import AgglomerativeClustering
+
+
+def test_numpy_engine_merges_like_python(float_points: np.ndarray) -> None:
+    """
+    test that heap based numpy engine merges the same closest clusters as python engine
+    """
+    python = AgglomerativeClustering(float_points[:150], 6, "a", "python").fit()
+    vectorized = AgglomerativeClustering(float_points[:150], 6, "a", "numpy").fit()
+    np.testing.assert_array_equal(vectorized.labels, python.labels)
+    np.testing.assert_allclose(vectorized.centers, python.centers)
+
+
+def test_grid_index_does_not_change_result(points: np.ndarray) -> None:
+    """
+    test that merges found with grid index build the same merge tree as merges found by scanning all clusters
+    """
+    plain = AgglomerativeClustering(points[:500], 10, "a", "numpy").fit()
+    indexed = AgglomerativeClustering(points[:500], 10, "a", "numpy", True).fit()
+    np.testing.assert_array_equal(indexed.labels, plain.labels)
+    np.testing.assert_array_equal(indexed.centers, plain.centers)
@@ -0,0 +1,49 @@
+from helpers.benchmark import run_case, compare_results, benchmark_cases, save_results, load_results
+
+
+def _result(**changes) -> dict:
+    """
+    helper function that creates benchmark result of one configuration
+    :param changes: values that differ from default result
+    :return: result of configuration
+    """
+    result = {"algorithm": "c", "engine": "numpy", "k": 5, "points": 100, "seed": "1", "time_min": 1.0,
+              "peak_memory": 1000, "iterations": 10, "distances_computed": 500}
+    result.update(changes)
+    return result
+
+
+def test_compare_reports_only_regressions() -> None:
+    """
+    test that time and memory regress only above threshold, deterministic counters regress on any growth and
+    configurations missing in baseline are skipped
+    """
+    baseline = {"results": [_result(), _result(engine="elkan")]}
+    assert compare_results(baseline, {"results": [_result(time_min=1.09, peak_memory=900)]}, 0.1) == []
+    assert compare_results(baseline, {"results": [_result(k=7, time_min=5.0)]}, 0.1) == []
+    regressions = compare_results(baseline, {"results": [_result(time_min=1.2), _result(engine="elkan", iterations=11),
+                                                         _result(engine="elkan", seed="2", iterations=20)]}, 0.1)
+    assert len(regressions) == 2
+    assert "time_min 1.0 -> 1.2" in regressions[0] and "iterations 10 -> 11" in regressions[1]
+
+
+def test_run_case_measures_small_dataset(tmp_path) -> None:
+    """
+    test that configuration with fewer points than seed points is generated, fitted repeatedly and survives json round
+    trip
+    """
+    result = run_case("c", "numpy", 3, 12, "7", 2)
+    assert result["points"] == 12 and len(result["times"]) == 2
+    assert result["iterations"] > 0 and result["peak_memory"] > 0
+    assert "assignment" in result["phases"]
+    save_results(str(tmp_path / "benchmark.json"), {"results": [result]})
+    assert compare_results(load_results(str(tmp_path / "benchmark.json")), {"results": [result]}, 0.0) == []
+
+
+def test_cases_skip_invalid_combinations() -> None:
+    """
+    test that sweep skips elkan outside centroid k-means, runs divisive once per size and drops k larger than size
+    """
+    cases = list(benchmark_cases(["c", "m", "d"], ["numpy", "elkan"], [2, 50], [10], ["1"]))
+    assert cases == [("c", "numpy", 2, 10, "1"), ("c", "elkan", 2, 10, "1"), ("m", "numpy", 2, 10, "1"),
+                     ("d", "python", 2, 10, "1")]
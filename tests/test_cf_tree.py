@@ -0,0 +1,63 @@
+import numpy as np
+
+from algorithms.agglomerative_clustering import AgglomerativeClustering
+from algorithms.cf_tree import CFTree, CFNode
+
+
+def _check_node(node: CFNode, branching: int) -> None:
+    """
+    helper function that checks that node has at most branching entries and every entry of inner node is summary of
+    its child
+    :param node: node of tree
+    :param branching: maximal number of entries of node
+    """
+    assert 0 < node.size <= branching
+    if node.leaf:
+        return
+    assert len(node.children) == node.size
+    for index, child in enumerate(node.children):
+        count, sums, squares = child.summary()
+        assert node.counts[index] == count
+        np.testing.assert_allclose(node.sums[index], sums)
+        np.testing.assert_allclose(node.squares[index], squares)
+        _check_node(child, branching)
+
+
+def test_leaf_subclusters_summarize_all_points(points: np.ndarray) -> None:
+    """
+    test that clustering features of leaves add up to all points, radius of every subcluster is within threshold and
+    nodes never keep more than branching entries
+    """
+    tree = CFTree(threshold=60, branching=5)
+    tree.insert_points(points, batch_size=100)
+    counts, sums, squares = tree.leaf_entries()
+    assert tree.num_of_points == counts.sum() == len(points)
+    np.testing.assert_allclose(sums.sum(axis=0), points.astype(np.float64).sum(axis=0))
+    np.testing.assert_allclose(squares.sum(), float((points.astype(np.float64) ** 2).sum()))
+    means = sums / counts[:, np.newaxis]
+    radii = np.sqrt(np.maximum(squares / counts - (means ** 2).sum(axis=1), 0))
+    assert np.all(radii <= 60 + 1e-6) and len(counts) < len(points)
+    assert not tree.root.leaf
+    _check_node(tree.root, 5)
+
+
+def test_zero_threshold_merges_like_plain_agglomerative(float_points: np.ndarray) -> None:
+    """
+    test that with threshold 0 every point is its own subcluster, so clustering equals agglomerative without cf-tree
+    """
+    points = float_points[:200]
+    plain = AgglomerativeClustering(points, 7, "a", "numpy").fit()
+    streamed = AgglomerativeClustering(points, 7, "a", "numpy", cf_threshold=0.0).fit()
+    np.testing.assert_array_equal(streamed.labels, plain.labels)
+    np.testing.assert_allclose(streamed.centers, plain.centers)
+
+
+def test_subclusters_are_merged_to_k_clusters(points: np.ndarray) -> None:
+    """
+    test that agglomerative clustering over subclusters labels every point with one of k clusters
+    """
+    clustering = AgglomerativeClustering(points, 9, "a", "numpy", cf_threshold=80.0)
+    result = clustering.fit()
+    assert np.array_equal(np.unique(result.labels), np.arange(9))
+    assert len(result.centers) == 9
+    assert clustering.cut(3).labels.max() == 2
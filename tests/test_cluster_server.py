@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from algorithms.k_means import KMeans
+from helpers.cluster_server import ClusterServer
+from helpers.generator import Generator
+
+
+async def _start(tmp_path) -> tuple[ClusterServer, asyncio.Task, str]:
+    """
+    helper function that starts server with one worker on unix socket in current event loop
+    :param tmp_path: directory of socket
+    :return: server, task that serves and path of socket
+    """
+    server = ClusterServer(1)
+    path = str(tmp_path / "cluster.sock")
+    serving = asyncio.create_task(server.serve(path))
+    while not os.path.exists(path):
+        await asyncio.sleep(0.05)
+    return server, serving, path
+
+
+async def _stop(server: ClusterServer, serving: asyncio.Task) -> None:
+    """
+    helper function that shuts server down and waits until it frees its datasets
+    :param server: running server
+    :param serving: task that serves
+    """
+    await server.handle({"op": "shutdown"})
+    await serving
+
+
+def test_load_cluster_and_drop(tmp_path) -> None:
+    """
+    test that generated dataset is clustered like in main process, requests on socket are answered in order, invalid
+    requests get error response and dropped dataset is freed
+    """
+    async def scenario() -> list:
+        server, serving, path = await _start(tmp_path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        for message in ({"op": "load", "name": "g", "points": 1500, "seeds": 20},
+                        {"op": "cluster", "dataset": "g", "algorithm": "c", "k": 6, "engine": "numpy"},
+                        {"op": "datasets"}, [], {"op": "cluster", "dataset": "g", "k": 0}, {"op": "unknown"}):
+            writer.write(json.dumps(message).encode() + b"\n")
+        writer.write(b"not json\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(7)]
+        block = server.datasets["g"][0].name
+        responses.append(await server.handle({"op": "drop", "name": "g"}))
+        responses.append(await server.handle({"op": "status"}))
+        writer.close()
+        await _stop(server, serving)
+        return responses + [block]
+
+    responses = asyncio.run(scenario())
+    expected = KMeans(Generator(1500, 20).generate_array(), 6, "c", "numpy").fit()
+    assert responses[0] == {"ok": True, "dataset": "g", "points": 1500, "dimensions": 2}
+    np.testing.assert_array_equal(responses[1]["labels"], expected.labels)
+    np.testing.assert_array_equal(responses[1]["centers"], expected.centers)
+    assert responses[2] == {"ok": True, "datasets": {"g": 1500}}
+    assert [response["ok"] for response in responses[3:7]] == [False] * 4
+    assert responses[7] == {"ok": True} and responses[8]["jobs_done"] == 1
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=responses[9])
+
+
+def test_queued_job_does_not_use_dropped_dataset(tmp_path) -> None:
+    """
+    test that job which waits for slot looks dataset up only when it gets slot, so dataset dropped meanwhile is
+    reported as unknown instead of failing in worker
+    """
+    async def scenario() -> dict:
+        server, serving, _ = await _start(tmp_path)
+        await server.handle({"op": "load", "name": "g", "points": 300})
+        await server.slots.acquire()
+        queued = asyncio.create_task(server.handle({"op": "cluster", "dataset": "g", "k": 3}))
+        await asyncio.sleep(0.05)
+        await server.handle({"op": "drop", "name": "g"})
+        server.slots.release()
+        response = await queued
+        await _stop(server, serving)
+        return response
+
+    assert asyncio.run(scenario()) == {"ok": False, "error": "ValueError: unknown dataset g"}
+
+
+def test_reloaded_dataset_is_freed_after_running_job(tmp_path) -> None:
+    """
+    test that dataset reloaded while job runs on it stays in shared memory until job finishes and is freed then
+    """
+    async def scenario() -> tuple[dict, str, bool, ClusterServer]:
+        server, serving, _ = await _start(tmp_path)
+        await server.handle({"op": "load", "name": "g", "points": 1500})
+        block = server.datasets["g"][0].name
+        running = asyncio.create_task(server.handle({"op": "cluster", "dataset": "g", "k": 8, "restarts": 2,
+                                                     "labels": False}))
+        while not server.block_jobs:
+            await asyncio.sleep(0.01)
+        await server.handle({"op": "load", "name": "g", "points": 500})
+        retired = block in server.retired_blocks
+        response = await running
+        await _stop(server, serving)
+        return response, block, retired, server
+
+    response, block, retired, server = asyncio.run(scenario())
+    assert response["ok"] and len(response["centers"]) == 8
+    assert retired and server.retired_blocks == {} and server.block_jobs == {}
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=block)
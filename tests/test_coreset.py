@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from algorithms.coreset_k_means import CoresetKMeans
+from helpers.coreset import lightweight_coreset
+from helpers.evaluation import inertia
+from helpers.measurements import nearest_centers
+
+
+def test_coreset_samples_by_distance_to_mean(float_points: np.ndarray) -> None:
+    """
+    test that coreset samples points with mixture of uniform and distance to mean probabilities and weights them by
+    inverse of probability
+    """
+    squared = ((float_points.astype(np.float64) - float_points.mean(axis=0, dtype=np.float64)) ** 2).sum(axis=1)
+    probabilities = 0.5 / len(float_points) + 0.5 * squared / squared.sum()
+    sampled = np.random.default_rng(7).choice(len(float_points), 200, p=probabilities / probabilities.sum())
+    expected_indexes, counts = np.unique(sampled, return_counts=True)
+
+    indexes, weights = lightweight_coreset(float_points, 200, "7", memory_budget=512)
+    np.testing.assert_array_equal(indexes, expected_indexes)
+    np.testing.assert_allclose(weights, counts / (200 * probabilities[indexes]))
+
+
+def test_weighted_coreset_estimates_points(points: np.ndarray) -> None:
+    """
+    test that weights of coreset add up to about number of points and weighted cost of centers is close to their cost
+    on all points, coreset of at least n points is all points with weight 1
+    """
+    indexes, weights = lightweight_coreset(points, 600)
+    assert weights.sum() == pytest.approx(len(points), rel=0.1)
+    centers = points[::100].astype(np.float64)
+    labels = nearest_centers(points, centers)[0]
+    assert inertia(points[indexes], labels[indexes], centers, weights) == \
+        pytest.approx(inertia(points, labels, centers), rel=0.15)
+    all_indexes, all_weights = lightweight_coreset(points, len(points))
+    np.testing.assert_array_equal(all_indexes, np.arange(len(points)))
+    np.testing.assert_array_equal(all_weights, np.ones(len(points)))
+
+
+def test_cost_ratio_compares_coreset_with_all_points(points: np.ndarray) -> None:
+    """
+    test that coreset k-means labels all points by the closest final center and cost ratio is weighted coreset
+    inertia divided by inertia of all points
+    """
+    clustering = CoresetKMeans(points, 6, "c", "numpy", restarts=3, coreset_size=500)
+    result = clustering.fit()
+    np.testing.assert_array_equal(result.labels, nearest_centers(points, result.centers)[0])
+    assert result.inertia == pytest.approx(inertia(points, result.labels, result.centers))
+    assert clustering.cost_ratio == pytest.approx(clustering.k_means.result.inertia / result.inertia)
+    assert clustering.cost_ratio == pytest.approx(1.0, abs=0.3)
@@ -0,0 +1,69 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from algorithms.agglomerative_clustering import AgglomerativeClustering
+from algorithms.dendrogram import Dendrogram
+
+
+def _centroid_linkage(points: np.ndarray, k: int) -> np.ndarray:
+    """
+    helper function that clusters points directly by merging the two clusters with the closest centroids until k
+    clusters are left, clusters are numbered in order of their first point like Dendrogram.cut does
+    :param points: (n, d) array of points
+    :param k: number of clusters
+    :return: cluster index for every point
+    """
+    clusters: List[List[int]] = [[index] for index in range(len(points))]
+    while len(clusters) > k:
+        centers = np.array([points[cluster].astype(np.float64).mean(axis=0) for cluster in clusters])
+        squared = ((centers[:, np.newaxis] - centers[np.newaxis]) ** 2).sum(axis=2)
+        squared[np.diag_indices(len(clusters))] = np.inf
+        a, b = sorted(np.unravel_index(np.argmin(squared), squared.shape))
+        clusters[a] += clusters.pop(b)
+    labels = np.empty(len(points), dtype=np.int64)
+    for label, cluster in enumerate(sorted(clusters, key=min)):
+        labels[cluster] = label
+    return labels
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_cut_matches_direct_clustering(float_points: np.ndarray, engine: str) -> None:
+    """
+    test that clusters cut from merge tree at any k are the clusters that direct centroid linkage creates at k
+    """
+    points = float_points[:80]
+    clustering = AgglomerativeClustering(points, 2, "a", engine)
+    clustering.fit()
+    for k in (1, 2, 5, 12, 40, 80):
+        np.testing.assert_array_equal(clustering.cut(k).labels, _centroid_linkage(points, k))
+
+
+def test_cut_matches_fit_at_k(points: np.ndarray) -> None:
+    """
+    test that cut of tree fitted for other k gives the same result as fit at k
+    """
+    clustering = AgglomerativeClustering(points[:400], 3, "a", "numpy")
+    clustering.fit()
+    for k in (3, 8, 20):
+        direct = AgglomerativeClustering(points[:400], k, "a", "numpy").fit()
+        cut = clustering.cut(k)
+        np.testing.assert_array_equal(cut.labels, direct.labels)
+        np.testing.assert_array_equal(cut.centers, direct.centers)
+
+
+def test_cut_numbers_clusters_by_first_point(tmp_path) -> None:
+    """
+    test that cut of saved tree keeps unmerged points as single clusters, numbers clusters in order of their first
+    point and rejects k outside of 1 to n
+    """
+    dendrogram = Dendrogram(np.array([[3, 4, 1.0, 2], [1, 5, 2.0, 3], [0, 2, 3.0, 2], [6, 7, 4.0, 5]]))
+    dendrogram.save(str(tmp_path / "tree.npy"))
+    dendrogram = Dendrogram.load(str(tmp_path / "tree.npy"))
+    np.testing.assert_array_equal(dendrogram.cut(5), [0, 1, 2, 3, 4])
+    np.testing.assert_array_equal(dendrogram.cut(3), [0, 1, 2, 1, 1])
+    np.testing.assert_array_equal(dendrogram.cut(2), [0, 1, 0, 1, 1])
+    np.testing.assert_array_equal(dendrogram.cut(1), [0, 0, 0, 0, 0])
+    with pytest.raises(ValueError):
+        dendrogram.cut(6)
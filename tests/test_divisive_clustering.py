@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from algorithms.divisive_clustering import DivisiveClustering, _cluster_sse
+
+
+@pytest.mark.parametrize("bisecting", [False, True])
+def test_workers_do_not_change_result(points: np.ndarray, bisecting: bool) -> None:
+    """
+    test that divisive restarts (or bisecting splits) run in worker processes give the same clusters as serial run
+    """
+    serial = DivisiveClustering(points, 7, "d", restarts=3, bisecting=bisecting).fit()
+    parallel = DivisiveClustering(points, 7, "d", workers=2, restarts=3, bisecting=bisecting).fit()
+    np.testing.assert_array_equal(parallel.labels, serial.labels)
+    np.testing.assert_array_equal(parallel.centers, serial.centers)
+    assert parallel.distances_computed == serial.distances_computed
+
+
+def test_spatial_index_does_not_change_result(points: np.ndarray) -> None:
+    """
+    test that splits assigned with kd-tree give the same clusters as splits assigned with all distances
+    """
+    plain = DivisiveClustering(points, 7, "d", restarts=2).fit()
+    indexed = DivisiveClustering(points, 7, "d", restarts=2, spatial_index=True).fit()
+    np.testing.assert_array_equal(indexed.labels, plain.labels)
+    np.testing.assert_array_equal(indexed.centers, plain.centers)
+
+
+def test_bisecting_splits_clusters_with_the_largest_sse(float_points: np.ndarray) -> None:
+    """
+    test that bisecting mode creates k non empty clusters and blocked SSE of clusters equals direct calculation
+    """
+    result = DivisiveClustering(float_points, 6, "d", restarts=2, bisecting=True).fit()
+    assert np.array_equal(np.unique(result.labels), np.arange(6))
+    expected = [((float_points[result.labels == label] - float_points[result.labels == label].mean(axis=0)) ** 2).sum()
+                for label in range(6)]
+    np.testing.assert_allclose(_cluster_sse(float_points, result.labels, 6, memory_budget=512), expected, rtol=1e-5)
+    assert result.inertia == pytest.approx(sum(expected), rel=1e-5)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from algorithms.k_means import KMeans
+from helpers.evaluation import centroids, medoids, success_rate, inertia, size_balance, silhouette
+from helpers.measurements import squared_distances
+
+
+def _silhouette(points: np.ndarray, labels: np.ndarray) -> float:
+    """
+    helper function that calculates silhouette of all points directly from full distance matrix
+    :param points: (n, d) array of points
+    :param labels: (n,) index of cluster for every point
+    :return: average silhouette
+    """
+    distances = np.sqrt(squared_distances(points, points))
+    scores = []
+    for index, label in enumerate(labels):
+        own = labels == label
+        if own.sum() == 1:
+            scores.append(0.0)
+            continue
+        a = distances[index, own].sum() / (own.sum() - 1)
+        b = min(distances[index, labels == other].mean() for other in np.unique(labels) if other != label)
+        scores.append((b - a) / max(a, b))
+    return float(np.mean(scores))
+
+
+def test_measures_match_direct_calculation(float_points: np.ndarray) -> None:
+    """
+    test that blocked centroids, inertia, success rate and size balance equal their direct definitions
+    """
+    labels = np.arange(len(float_points)) % 4
+    centers = centroids(float_points, labels, 4)
+    expected = np.array([float_points[labels == label].astype(np.float64).mean(axis=0) for label in range(4)])
+    np.testing.assert_allclose(centers, expected)
+    differences = float_points - centers[labels]
+    assert inertia(float_points, labels, centers) == pytest.approx(float((differences ** 2).sum()))
+    average = np.array([np.sqrt((differences[labels == label] ** 2).sum(axis=1)).mean() for label in range(4)])
+    assert success_rate(float_points, labels, centers) == np.count_nonzero(average <= 500) / 4 * 100
+    assert size_balance(labels, 4) == pytest.approx(0.25 ** 4)
+
+
+def test_sampled_silhouette_matches_brute_force(float_points: np.ndarray) -> None:
+    """
+    test that silhouette of all points calculated in small blocks equals direct calculation, single point clusters
+    included
+    """
+    points = float_points[:120]
+    labels = np.arange(len(points)) % 5
+    labels[7] = 5
+    assert silhouette(points, labels, 6, 1000, memory_budget=4096) == pytest.approx(_silhouette(points, labels))
+
+
+def test_medoids_are_points_with_the_smallest_summed_distance(float_points: np.ndarray) -> None:
+    """
+    test that medoid of every cluster is its point with the smallest summed distance to other points of cluster
+    """
+    labels = np.arange(len(float_points)) % 3
+    for label, medoid in enumerate(medoids(float_points, labels, 3)):
+        cluster = float_points[labels == label]
+        summed = np.sqrt(squared_distances(cluster, cluster)).sum(axis=1)
+        np.testing.assert_array_equal(medoid, cluster[np.argmin(summed)])
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_medoid_labels_match_nearest_reported_medoid(points: np.ndarray, engine: str) -> None:
+    """
+    test that every reported medoid is a point of dataset and every point is labeled with its nearest medoid
+    """
+    result = KMeans(points[:600], 10, "m", engine, restarts=3).fit()
+    squared = squared_distances(points[:600], result.centers)
+    assert np.all(squared[np.arange(len(squared)), result.labels] == squared.min(axis=1))
+    assert all(np.any(np.all(points[:600] == center, axis=1)) for center in result.centers)
@@ -0,0 +1,47 @@
+import numpy as np
+
+from helpers.generator import Generator
+
+
+def test_bulk_points_are_unique_and_inside_bounds() -> None:
+    """
+    test that bulk mode creates required number of unique points inside coordinate bounds, in small batches as well
+    """
+    for batch_size in [7, 1000]:
+        points = Generator(3000, 20, -500, 500).generate_array(batch_size)
+        assert points.shape == (3000, 2) and points.dtype == np.int32
+        assert len(np.unique(points, axis=0)) == 3000
+        assert points.min() >= -500 and points.max() <= 500
+
+
+def test_bulk_points_are_reproducible_by_seed() -> None:
+    """
+    test that same seed gives same points and different seed gives different ones
+    """
+    np.testing.assert_array_equal(Generator(500, 20, seed="7").generate_array(),
+                                  Generator(500, 20, seed="7").generate_array())
+    assert not np.array_equal(Generator(500, 20, seed="7").generate_array(),
+                              Generator(500, 20, seed="8").generate_array())
+
+
+def test_bitmap_takes_only_new_points() -> None:
+    """
+    test that bitmap filter drops points outside of bounds, duplicates inside batch and already created points and
+    keeps order of first occurrences
+    """
+    generator = Generator(10, 1, 0, 9)
+    bitmap = np.zeros(13, dtype=np.uint8)
+    first = generator._take_new_points(np.array([[1, 2], [3, 4], [1, 2], [10, 0]]), bitmap, 10)
+    np.testing.assert_array_equal(first, [[1, 2], [3, 4]])
+    second = generator._take_new_points(np.array([[3, 4], [9, 9], [0, 0], [5, 5]]), bitmap, 2)
+    np.testing.assert_array_equal(second, [[9, 9], [0, 0]])
+    assert np.unpackbits(bitmap, bitorder="little").sum() == 4
+
+
+def test_float_points_are_inside_bounds() -> None:
+    """
+    test that float bulk mode creates required number of float32 points inside coordinate bounds
+    """
+    points = Generator(2000, 10, -1000, 1000).generate_float_array(6, batch_size=64)
+    assert points.shape == (2000, 6) and points.dtype == np.float32
+    assert points.min() >= -1000 and points.max() <= 1000
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from algorithms.k_means import KMeans
+from helpers.measurements import nearest_centers, squared_distance
+
+
+@pytest.mark.parametrize("init", ["random", "k-means++"])
+def test_numpy_engine_gives_the_same_clustering_as_python(points: np.ndarray, init: str) -> None:
+    """
+    test that numpy engine of centroid k-means finds the same labels and centers as python loops
+    """
+    python = KMeans(points, 8, "c", "python", init=init, restarts=3).fit()
+    vectorized = KMeans(points, 8, "c", "numpy", init=init, restarts=3).fit()
+    np.testing.assert_array_equal(vectorized.labels, python.labels)
+    np.testing.assert_array_equal(vectorized.centers, python.centers)
+    assert vectorized.inertia == python.inertia
+
+
+@pytest.mark.parametrize("init", ["random", "k-means++"])
+def test_elkan_engine_gives_the_same_clustering_as_numpy(points: np.ndarray, init: str) -> None:
+    """
+    test that elkan engine skips only distances that can not change result of numpy engine
+    """
+    vectorized = KMeans(points, 8, "c", "numpy", init=init, restarts=3).fit()
+    elkan = KMeans(points, 8, "c", "elkan", init=init, restarts=3).fit()
+    np.testing.assert_array_equal(elkan.labels, vectorized.labels)
+    np.testing.assert_array_equal(elkan.centers, vectorized.centers)
+    assert elkan.inertia == vectorized.inertia
+
+
+def test_elkan_engine_breaks_ties_by_index() -> None:
+    """
+    test that on small integer grids, where many points are at the same distance from two centers, elkan engine
+    selects center with lower index like argmin of python and numpy engines
+    """
+    for seed in range(20):
+        grid = np.unique(np.random.default_rng(seed).integers(0, 12, size=(40, 2)), axis=0).astype(np.int32)
+        results = [KMeans(grid, 4, "c", engine, restarts=2).fit() for engine in ("python", "numpy", "elkan")]
+        for result in results[1:]:
+            np.testing.assert_array_equal(result.labels, results[0].labels)
+            np.testing.assert_array_equal(result.centers, results[0].centers)
+
+
+def test_vectorized_assignment_matches_python_loop(points: np.ndarray) -> None:
+    """
+    test that blocked numpy assignment selects the same closest center as python loop, ties included
+    """
+    centers = points[::150].astype(np.float64)
+    labels = nearest_centers(points, centers, memory_budget=4096)[0]
+    expected = []
+    for point in points.tolist():
+        distances = [squared_distance(point, center) for center in centers.tolist()]
+        expected.append(distances.index(min(distances)))
+    np.testing.assert_array_equal(labels, expected)
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+@pytest.mark.parametrize("cluster_center, engine", [("c", "numpy"), ("c", "elkan"), ("m", "numpy")])
+def test_workers_do_not_change_result(points: np.ndarray, cluster_center: str, engine: str, workers: int) -> None:
+    """
+    test that restarts run in worker processes give the same result and counters as restarts run serially
+    """
+    serial = KMeans(points, 6, cluster_center, engine, restarts=4).fit()
+    parallel = KMeans(points, 6, cluster_center, engine, workers=workers, restarts=4).fit()
+    np.testing.assert_array_equal(parallel.labels, serial.labels)
+    np.testing.assert_array_equal(parallel.centers, serial.centers)
+    assert parallel.distances_computed == serial.distances_computed
+
+
+def test_spatial_index_does_not_change_result(points: np.ndarray) -> None:
+    """
+    test that closest centers found in kd-tree give the same clustering as all distances
+    """
+    for engine in ("python", "numpy"):
+        plain = KMeans(points, 8, "c", engine, restarts=3).fit()
+        indexed = KMeans(points, 8, "c", engine, restarts=3, spatial_index=True).fit()
+        np.testing.assert_array_equal(indexed.labels, plain.labels)
+        np.testing.assert_array_equal(indexed.centers, plain.centers)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from algorithms.k_means import KMeans
+from algorithms.k_means_model import KMeansModel
+from helpers.measurements import nearest_centers
+
+
+def test_save_load_predict_round_trip(points: np.ndarray, tmp_path) -> None:
+    """
+    test that loaded model has the same state, predicts the same labels as model it was saved from and keeps learning
+    the same way
+    """
+    k_means = KMeans(points, 5, "c", "numpy", restarts=3)
+    k_means.fit()
+    model = KMeansModel.from_k_means(k_means, reservoir_size=500)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = KMeansModel.load(path)
+
+    np.testing.assert_array_equal(loaded.centers, model.centers)
+    np.testing.assert_array_equal(loaded.counts, model.counts)
+    np.testing.assert_array_equal(loaded.reservoir, model.reservoir)
+    assert loaded.reservoir.dtype == model.reservoir.dtype
+    assert (loaded.num_of_seen, loaded.reference_cost) == (model.num_of_seen, model.reference_cost)
+    np.testing.assert_array_equal(loaded.predict(points), model.predict(points))
+    np.testing.assert_array_equal(loaded.predict(points), nearest_centers(points, k_means.result.centers)[0])
+
+    batch = points[::7] + 40
+    assert loaded.partial_fit(batch) == model.partial_fit(batch)
+    np.testing.assert_array_equal(loaded.centers, model.centers)
+    np.testing.assert_array_equal(loaded.reservoir, model.reservoir)
+
+
+def test_medoid_model_is_rejected(points: np.ndarray) -> None:
+    """
+    test that model of medoid k-means can not be created, its centers would stop being data points after partial_fit
+    """
+    k_means = KMeans(points[:300], 4, "m", "numpy", restarts=1)
+    k_means.fit()
+    with pytest.raises(ValueError):
+        KMeansModel.from_k_means(k_means)
+
+
+def test_drift_fits_model_again(points: np.ndarray) -> None:
+    """
+    test that points near centers only move centers and shifted points make model fit k-means again on reservoir
+    """
+    k_means = KMeans(points, 5, "c", "numpy", restarts=2)
+    k_means.fit()
+    model = KMeansModel.from_k_means(k_means, reservoir_size=800)
+    assert not model.partial_fit(points[:1000])
+    assert model.drift < model.drift_threshold and model.num_of_seen == len(points) + 1000
+
+    assert model.partial_fit(points[:1000] * 3)
+    assert model.refits == 1 and model.drift == 0.0 and len(model.reservoir) == 800
+    assert model.counts.sum() == pytest.approx(model.num_of_seen, abs=len(model.centers))
@@ -0,0 +1,32 @@
+import numpy as np
+
+from algorithms.k_medoids import KMedoids
+from helpers.measurements import medoid_calculation, squared_distances
+
+
+def test_no_single_swap_lowers_deviation(float_points: np.ndarray) -> None:
+    """
+    test that PAM engine stops in swap optimum, replacing any medoid by any other point does not lower sum of
+    distances, and that labels are nearest medoids
+    """
+    points = float_points[:60]
+    engine = KMedoids(points)
+    labels, medoids = engine.run([0, 1, 2, 3])
+    deviation = engine.distances[:, medoids].min(axis=1).sum()
+    for position in range(len(medoids)):
+        for candidate in np.setdiff1d(np.arange(len(points)), medoids):
+            swapped = medoids.copy()
+            swapped[position] = candidate
+            assert engine.distances[:, swapped].min(axis=1).sum() >= deviation - 1e-3
+    np.testing.assert_array_equal(labels, np.argmin(engine.distances[:, medoids], axis=1))
+
+
+def test_medoid_minimises_summed_distance(float_points: np.ndarray) -> None:
+    """
+    test that medoid is the point with the smallest (weighted) sum of distances to all points of cluster
+    """
+    weights = np.linspace(0.5, 2, len(float_points))
+    distances = np.sqrt(squared_distances(float_points, float_points))
+    assert medoid_calculation(float_points.tolist()) == tuple(float_points[np.argmin(distances.sum(axis=1))])
+    assert medoid_calculation(float_points.tolist(), weights.tolist()) == \
+        tuple(float_points[np.argmin(distances @ weights)])
@@ -0,0 +1,33 @@
+import numpy as np
+
+from algorithms.mini_batch_k_means import MiniBatchKMeans
+from helpers.measurements import nearest_centers
+
+
+def test_streamed_labels_are_nearest_centers(points: np.ndarray, tmp_path) -> None:
+    """
+    test that mini-batch k-means streams raw binary file in batches, writes label of nearest final center for every
+    point and reports inertia of written labels
+    """
+    input_path = str(tmp_path / "points.bin")
+    output_path = str(tmp_path / "labels.bin")
+    points.tofile(input_path)
+    result = MiniBatchKMeans(input_path, 6, output_path, batch_size=256, passes=2).run("off")
+
+    labels = np.fromfile(output_path, dtype=np.int32)
+    expected_labels, closest = nearest_centers(points, result.centers)
+    np.testing.assert_array_equal(labels, expected_labels)
+    assert result.labels is None and result.iterations == 2
+    assert np.isclose(result.inertia, closest.sum(), rtol=1e-6)
+
+
+def test_plot_is_saved_from_first_batch(float_points: np.ndarray, tmp_path) -> None:
+    """
+    test that run keeps plot arguments of other algorithms and saves plot of streamed .npy file
+    """
+    input_path = str(tmp_path / "points.npy")
+    np.save(input_path, float_points)
+    plot_path = tmp_path / "clusters.png"
+    MiniBatchKMeans(input_path, 4, str(tmp_path / "labels.csv"), batch_size=100, passes=1).run("save", str(plot_path))
+    assert plot_path.stat().st_size > 0
+    assert len(np.loadtxt(tmp_path / "labels.csv", dtype=np.int32)) == len(float_points)
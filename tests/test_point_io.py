@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from algorithms.k_means import KMeans
+from helpers.point_io import open_points, read_point_chunks, write_array, write_labels
+
+
+def test_binary_files_are_memory_mapped(float_points: np.ndarray, tmp_path) -> None:
+    """
+    test that .npy and raw binary files are opened as read only mapped arrays with the same points
+    """
+    np.save(tmp_path / "points.npy", float_points)
+    float_points.tofile(tmp_path / "points.f32")
+    for points in (open_points(str(tmp_path / "points.npy")),
+                   open_points(str(tmp_path / "points.f32"), np.float32, float_points.shape[1])):
+        assert isinstance(points, np.memmap) and not points.flags.writeable
+        np.testing.assert_array_equal(points, float_points)
+
+
+def test_wrong_shape_is_rejected(points: np.ndarray, tmp_path) -> None:
+    """
+    test that raw binary file which does not split to points and .npy file which is not (n, d) are rejected
+    """
+    points[:5].tofile(tmp_path / "points.bin")
+    np.save(tmp_path / "values.npy", points[:, 0])
+    with pytest.raises(ValueError):
+        open_points(str(tmp_path / "points.bin"), np.int32, 3)
+    with pytest.raises(ValueError):
+        open_points(str(tmp_path / "values.npy"))
+
+
+@pytest.mark.parametrize("name", ["points.csv", "points.npy", "points.bin"])
+def test_chunks_cover_whole_file(points: np.ndarray, tmp_path, name: str) -> None:
+    """
+    test that chunks of csv, .npy and raw binary file are at most chunk size and together give all points
+    """
+    path = str(tmp_path / name)
+    write_array(path, points)
+    chunks = list(read_point_chunks(path, 400))
+    assert [len(chunk) for chunk in chunks] == [400, 400, 400, 300]
+    np.testing.assert_array_equal(np.concatenate(chunks), points)
+    np.testing.assert_array_equal(open_points(path), points)
+
+
+@pytest.mark.parametrize("name", ["labels.txt", "labels.bin"])
+def test_labels_are_written_in_chunks(tmp_path, name: str) -> None:
+    """
+    test that labels written chunk by chunk can be read back in order
+    """
+    path = tmp_path / name
+    assert write_labels(str(path), (np.arange(start, start + 3) for start in range(0, 9, 3))) == 9
+    labels = np.loadtxt(path, dtype=np.int32) if name.endswith(".txt") else np.fromfile(path, dtype=np.int32)
+    np.testing.assert_array_equal(labels, np.arange(9))
+
+
+def test_mapped_points_give_the_same_clustering(points: np.ndarray, tmp_path) -> None:
+    """
+    test that k-means reads mapped points directly and finds the same clusters as with points in memory
+    """
+    np.save(tmp_path / "points.npy", points)
+    mapped = KMeans(open_points(str(tmp_path / "points.npy")), 6, "c", "numpy", workers=2, restarts=2).fit()
+    in_memory = KMeans(points, 6, "c", "numpy", restarts=2).fit()
+    np.testing.assert_array_equal(mapped.labels, in_memory.labels)
+    np.testing.assert_array_equal(mapped.centers, in_memory.centers)
@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pytest
+
+from algorithms.k_means import KMeans
+from helpers.profiling import Profiler, NULL_PROFILER
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_report_has_phases_counters_and_iterations(points: np.ndarray, workers: int) -> None:
+    """
+    test that k-means fills phases, counters equal to result and calls callback for every iteration, reports of worker
+    processes are merged as well
+    """
+    iterations = []
+    profiler = Profiler([iterations.append])
+    result = KMeans(points, 6, "c", "numpy", workers=workers, restarts=3, profiler=profiler).fit()
+    report = profiler.report()
+    assert {"seeding", "assignment", "update"} <= set(report["phases"])
+    assert report["phases"]["seeding"]["calls"] == 3
+    assert report["counters"]["restarts"] == 3
+    assert report["counters"]["iterations"] == result.iterations
+    assert report["counters"]["distances"] == result.distances_computed
+    if workers == 1:
+        assert len(iterations) == result.iterations
+        assert all(info["algorithm"] == "k-means" for info in iterations)
+
+
+def test_merge_and_save(tmp_path) -> None:
+    """
+    test that merged report adds seconds, calls and counters and that saved report is json of report
+    """
+    profiler = Profiler()
+    with profiler.phase("update"):
+        pass
+    profiler.count("iterations", 2)
+    profiler.merge({"phases": {"update": {"seconds": 1.0, "calls": 2}}, "counters": {"iterations": 3, "swaps": 1}})
+    report = profiler.report()
+    assert report["phases"]["update"]["calls"] == 3 and report["phases"]["update"]["seconds"] >= 1.0
+    assert report["counters"] == {"iterations": 5, "swaps": 1}
+    profiler.save(str(tmp_path / "profile.json"))
+    assert json.loads((tmp_path / "profile.json").read_text()) == report
+
+
+def test_null_profiler_collects_nothing() -> None:
+    """
+    test that disabled profiler does not collect anything
+    """
+    with NULL_PROFILER.phase("update"):
+        NULL_PROFILER.count("iterations")
+    NULL_PROFILER.iteration(iteration=1)
+    assert NULL_PROFILER.report() == {"phases": {}, "counters": {}}
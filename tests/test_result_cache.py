@@ -0,0 +1,76 @@
+import os
+import random
+
+import numpy as np
+
+from algorithms.k_means import KMeans
+from helpers.initialization import warm_start_indexes
+from helpers.measurements import nearest_centers
+from helpers.result import ClusteringResult
+from helpers.result_cache import ResultCache
+
+
+def _result(k: int) -> ClusteringResult:
+    """
+    helper function that creates small result with k clusters
+    :param k: number of clusters
+    :return: result of 100 points
+    """
+    labels = np.arange(100) % k
+    return ClusteringResult(labels, np.arange(2 * k, dtype=np.float64).reshape(k, 2), 1.5, 50.0, 0.1, 3, 400)
+
+
+def test_get_returns_stored_result(tmp_path) -> None:
+    """
+    test that stored result is read back and other k or parameters are misses
+    """
+    cache = ResultCache(str(tmp_path))
+    cache.put("points", "parameters", 4, _result(4))
+    stored = cache.get("points", "parameters", 4)
+    np.testing.assert_array_equal(stored.labels, _result(4).labels)
+    np.testing.assert_array_equal(stored.centers, _result(4).centers)
+    assert (stored.inertia, stored.iterations, stored.distances_computed) == (1.5, 3, 400)
+    assert cache.get("points", "parameters", 5) is None
+    assert cache.get("points", "other", 4) is None
+    assert cache.nearest("points", "parameters", 7).centers.shape == (4, 2)
+
+
+def test_least_recently_used_result_is_evicted(tmp_path) -> None:
+    """
+    test that when directory grows over its size the least recently used result is removed, reading result counts
+    as using it
+    """
+    cache = ResultCache(str(tmp_path))
+    cache.put("points", "parameters", 2, _result(2))
+    cache.put("points", "parameters", 3, _result(3))
+    size = max(os.path.getsize(os.path.join(tmp_path, name)) for name in os.listdir(tmp_path))
+    for k, used in ((2, 1_000_000_000), (3, 2_000_000_000)):
+        os.utime(cache._path("points", "parameters", k), ns=(used, used))
+    assert cache.get("points", "parameters", 2) is not None
+
+    cache.max_bytes = 2 * size + size // 2
+    cache.put("points", "parameters", 4, _result(4))
+    assert cache.get("points", "parameters", 3) is None
+    assert cache.get("points", "parameters", 2) is not None
+    assert cache.get("points", "parameters", 4) is not None
+
+
+def test_points_key_depends_on_values_and_type(points: np.ndarray) -> None:
+    """
+    test that list and array of the same points share key and float points of the same values do not
+    """
+    assert ResultCache.points_key(points.tolist()) == ResultCache.points_key(points)
+    assert ResultCache.points_key(points.astype(np.float32)) != ResultCache.points_key(points)
+    assert ResultCache.points_key(points[:-1]) != ResultCache.points_key(points)
+
+
+def test_warm_start_seeds_first_restart_from_cached_centers(points: np.ndarray) -> None:
+    """
+    test that cached centers of other k become initial centers of the first restart, every seed is point closest to
+    cached center and missing centers are added
+    """
+    cached = KMeans(points, 6, "c", "numpy").fit()
+    seeds = warm_start_indexes(points, cached.centers, 8, random.Random(1))
+    assert len(set(seeds)) == 8
+    np.testing.assert_array_equal(seeds[:6], nearest_centers(cached.centers, points)[0])
+    assert KMeans(points, 8, "c", "numpy", warm_start=cached.centers).fit().centers.shape == (8, 2)
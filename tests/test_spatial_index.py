@@ -0,0 +1,16 @@
+import numpy as np
+
+from helpers.measurements import squared_distances
+from helpers.spatial_index import KDTree
+
+
+def test_kd_tree_finds_the_same_closest_point_as_argmin(points: np.ndarray) -> None:
+    """
+    test that kd-tree query returns index and squared distance of the closest point, ties go to lower index like argmin
+    """
+    centers = np.concatenate([points[::40], points[::40]])
+    for leaf_size in (1, 4, 16):
+        labels, closest = KDTree(centers, leaf_size).query(points)
+        squared = squared_distances(points, centers)
+        np.testing.assert_array_equal(labels, np.argmin(squared, axis=1))
+        np.testing.assert_array_equal(closest, squared.min(axis=1))